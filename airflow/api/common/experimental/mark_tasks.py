@@ -22,12 +22,14 @@ import datetime
 from typing import Iterable
 
 from sqlalchemy import or_
+from sqlalchemy.orm.attributes import set_committed_value
 
 from airflow.jobs import BackfillJob
 from airflow.models import BaseOperator, DagRun, TaskInstance
 from airflow.operators.subdag_operator import SubDagOperator
 from airflow.utils import timezone
 from airflow.utils.db import provide_session
+from airflow.utils.helpers import query_chunks
 from airflow.utils.state import State
 
 
@@ -110,22 +112,27 @@ def set_state(
 
     sub_dag_run_ids = get_subdag_runs(dag, session, state, task_ids, commit, confirmed_dates)
 
-    # now look for the task instances that are affected
-
-    qry_dag = get_all_dag_task_query(dag, session, state, task_ids, confirmed_dates)
-
-    if commit:
-        tis_altered = qry_dag.with_for_update().all()
-        if sub_dag_run_ids:
-            qry_sub_dag = all_subdag_tasks_query(sub_dag_run_ids, session, state, confirmed_dates)
-            tis_altered += qry_sub_dag.with_for_update().all()
-        for task_instance in tis_altered:
-            task_instance.state = state
-    else:
-        tis_altered = qry_dag.all()
-        if sub_dag_run_ids:
-            qry_sub_dag = all_subdag_tasks_query(sub_dag_run_ids, session, state, confirmed_dates)
-            tis_altered += qry_sub_dag.all()
+    # now look for the task instances that are affected, a chunk of task ids
+    # at a time to keep the queries within the parameter limits of the database
+    queries = [
+        get_all_dag_task_query(dag, session, state, task_ids_chunk, confirmed_dates)
+        for task_ids_chunk in query_chunks(task_ids)
+    ]
+    if sub_dag_run_ids:
+        queries.append(all_subdag_tasks_query(sub_dag_run_ids, session, state, confirmed_dates))
+
+    tis_altered = []
+    for query in queries:
+        if commit:
+            tis_chunk = query.with_for_update().all()
+            # The rows are locked, update them all in a single statement
+            # rather than flushing every task instance on its own
+            query.update({TaskInstance.state: state}, synchronize_session=False)
+            for task_instance in tis_chunk:
+                set_committed_value(task_instance, 'state', state)
+        else:
+            tis_chunk = query.all()
+        tis_altered += tis_chunk
 
     return tis_altered
 
@@ -228,15 +235,15 @@ def verify_dag_run_integrity(dag, dates):
 
 
 def find_task_relatives(tasks, downstream, upstream):
-    """Yield task ids and optionally ancestor and descendant ids."""
+    """Return the set of task ids and optionally ancestor and descendant ids."""
+    task_ids = set()
     for task in tasks:
-        yield task.task_id
+        task_ids.add(task.task_id)
         if downstream:
-            for relative in task.get_flat_relatives(upstream=False):
-                yield relative.task_id
+            task_ids.update(task.get_flat_relative_ids(upstream=False))
         if upstream:
-            for relative in task.get_flat_relatives(upstream=True):
-                yield relative.task_id
+            task_ids.update(task.get_flat_relative_ids(upstream=True))
+    return task_ids
 
 
 def get_execution_dates(dag, execution_date, future, past):
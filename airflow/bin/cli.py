@@ -942,6 +942,9 @@ def webserver(args):
         if ssl_cert:
             run_args += ['--certfile', ssl_cert, '--keyfile', ssl_key]
 
+        if conf.getboolean('webserver', 'preload_dagbag'):
+            run_args += ['--preload']
+
         webserver_module = 'www_rbac' if settings.RBAC else 'www'
         run_args += ["airflow." + webserver_module + ".app:cached_app()"]
 
@@ -1040,6 +1043,39 @@ def scheduler(args):
         job.run()
 
 
+@cli_utils.action_logging
+def sensor_service(args):
+    print(settings.HEADER)
+    job = jobs.SensorServiceJob(num_runs=args.num_runs)
+
+    if args.daemon:
+        pid, stdout, stderr, log_file = setup_locations("sensor_service",
+                                                        args.pid,
+                                                        args.stdout,
+                                                        args.stderr,
+                                                        args.log_file)
+        handle = setup_logging(log_file)
+        stdout = open(stdout, 'w+')
+        stderr = open(stderr, 'w+')
+
+        ctx = daemon.DaemonContext(
+            pidfile=TimeoutPIDLockFile(pid, -1),
+            files_preserve=[handle],
+            stdout=stdout,
+            stderr=stderr,
+        )
+        with ctx:
+            job.run()
+
+        stdout.close()
+        stderr.close()
+    else:
+        signal.signal(signal.SIGINT, sigint_handler)
+        signal.signal(signal.SIGTERM, sigint_handler)
+        signal.signal(signal.SIGQUIT, sigquit_handler)
+        job.run()
+
+
 @cli_utils.action_logging
 def serve_logs(args):
     print("Starting flask")
@@ -2196,6 +2232,11 @@ class CLIFactory(object):
             'args': ('dag_id_opt', 'subdir', 'run_duration', 'num_runs',
                      'do_pickle', 'pid', 'daemon', 'stdout', 'stderr',
                      'log_file'),
+        }, {
+            'func': sensor_service,
+            'help': "Start a sensor service instance, which pokes the sensors "
+                    "handed over to it",
+            'args': ('num_runs', 'pid', 'daemon', 'stdout', 'stderr', 'log_file'),
         }, {
             'func': worker,
             'help': "Start a Celery worker node",
@@ -43,6 +43,7 @@ class GoogleCloudStorageObjectSensor(BaseSensorOperator):
     :type delegate_to: str
     """
     template_fields = ('bucket', 'object')
+    poke_context_fields = ('bucket', 'object', 'google_cloud_conn_id', 'delegate_to')
     ui_color = '#f0eee4'
 
     @apply_defaults
@@ -142,6 +143,7 @@ class GoogleCloudStoragePrefixSensor(BaseSensorOperator):
     :type delegate_to: str
     """
     template_fields = ('bucket', 'prefix')
+    poke_context_fields = ('bucket', 'prefix', 'google_cloud_conn_id', 'delegate_to')
     ui_color = '#f0eee4'
 
     @apply_defaults
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+XCom backend keeping large values out of the metadata database
+"""
+import json
+import os
+import pickle
+import tempfile
+import uuid
+
+from six.moves.urllib.parse import quote
+
+from airflow.configuration import conf
+from airflow.models.xcom import BaseXCom, MAX_XCOM_SIZE
+
+REFERENCE_KEY = '__airflow_xcom_file__'
+
+
+class XComFileReference(object):
+    """
+    Lazy handle on an XCom value stored in a file by :class:`FileXComBackend`.
+    Nothing is read until the value is requested, and the raw serialized
+    value can be streamed with :meth:`open` or :meth:`iter_chunks`.
+    """
+
+    def __init__(self, path, size, pickled):
+        self.path = path
+        self.size = size
+        self.pickled = pickled
+        self._value = None
+        self._loaded = False
+
+    def open(self):
+        """Returns a binary file object for the serialized value."""
+        return open(FileXComBackend.get_full_path(self.path), 'rb')
+
+    def iter_chunks(self, chunk_size=1024 * 1024):
+        """Yields the serialized value ``chunk_size`` bytes at a time."""
+        with self.open() as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    @property
+    def value(self):
+        """The deserialized value, read from the file on first access."""
+        if not self._loaded:
+            with self.open() as f:
+                if self.pickled:
+                    self._value = pickle.load(f)
+                else:
+                    self._value = json.loads(f.read().decode('UTF-8'))
+            self._loaded = True
+        return self._value
+
+    def __repr__(self):
+        return '<XComFileReference {path} ({size} bytes)>'.format(path=self.path, size=self.size)
+
+
+class FileXComBackend(BaseXCom):
+    """
+    Stores XCom values whose serialized size exceeds
+    ``[core] xcom_file_backend_threshold`` bytes as files below
+    ``[core] xcom_file_backend_path`` and keeps only a reference to the file in
+    the metadata database. Smaller values are stored in the database as usual.
+
+    Configurable via ``airflow.cfg`` like so:
+
+    .. code-block:: ini
+
+        [core]
+        xcom_backend = airflow.contrib.xcom.file_xcom_backend.FileXComBackend
+        xcom_file_backend_path = /mnt/shared/xcom
+
+    Pulling an offloaded value returns a :class:`XComFileReference`; use its
+    ``value`` attribute to load it, or stream it with ``iter_chunks()``.
+    Files are overwritten when the same key is pushed again for a task
+    instance but are not removed when XComs are cleared.
+    """
+
+    @staticmethod
+    def get_full_path(path):
+        """Resolves the ``path`` of a reference below the configured directory."""
+        base_path = os.path.abspath(conf.get('core', 'xcom_file_backend_path'))
+        full_path = os.path.abspath(os.path.join(base_path, path))
+        if not full_path.startswith(base_path + os.sep):
+            raise ValueError("XCom file {} is outside of {}".format(path, base_path))
+        return full_path
+
+    @staticmethod
+    def serialize_value(value, key=None, task_id=None, dag_id=None, execution_date=None):
+        data = BaseXCom.serialize_value(value)
+        threshold = conf.getint('core', 'xcom_file_backend_threshold', fallback=MAX_XCOM_SIZE)
+        if len(data) <= threshold:
+            return data
+
+        if None in (key, task_id, dag_id, execution_date):
+            path = uuid.uuid4().hex
+        else:
+            path = os.path.join(*[quote(part, safe='') for part in (
+                dag_id, task_id, execution_date.isoformat(), key)])
+        full_path = FileXComBackend.get_full_path(path)
+        directory = os.path.dirname(full_path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        # Write to a temporary file first so readers never see a partial value
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.rename(tmp_path, full_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+        return BaseXCom.serialize_value({
+            REFERENCE_KEY: path,
+            'size': len(data),
+            'pickled': conf.getboolean('core', 'enable_xcom_pickling'),
+        })
+
+    @staticmethod
+    def deserialize_value(result):
+        value = BaseXCom.deserialize_value(result)
+        if isinstance(value, dict) and REFERENCE_KEY in value:
+            return XComFileReference(value[REFERENCE_KEY], value['size'], value['pickled'])
+        return value
@@ -30,6 +30,7 @@ class BaseDag(object):
     Base DAG object that both the SimpleDag and DAG inherit.
     """
     __metaclass__ = ABCMeta
+    __slots__ = ()
 
     @abstractproperty
     def dag_id(self):
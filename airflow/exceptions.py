@@ -59,6 +59,21 @@ class AirflowRescheduleException(AirflowException):
         self.reschedule_date = reschedule_date
 
 
+class AirflowSensingException(AirflowException):
+    """
+    Raise when the sensor task should be handed over to the sensor service.
+
+    :param poke_context: the constructor arguments the sensor service
+        rebuilds the sensor with
+    :type poke_context: dict
+    :param started_at: when the sensor started poking
+    :type started_at: datetime.datetime
+    """
+    def __init__(self, poke_context, started_at):
+        self.poke_context = poke_context
+        self.started_at = started_at
+
+
 class AirflowTaskTimeout(AirflowException):
     """Raise when the task execution times-out"""
 
@@ -117,3 +132,7 @@ class DagConcurrencyLimitReached(AirflowException):
 
 class TaskConcurrencyLimitReached(AirflowException):
     """Raise when task concurrency limit is reached"""
+
+
+class ExternalFetchException(AirflowException):
+    """Raise when the web server fails to fetch an external resource in time"""
@@ -22,3 +22,4 @@ from airflow.jobs.base_job import BaseJob  # noqa: F401
 from airflow.jobs.backfill_job import BackfillJob  # noqa: F401
 from airflow.jobs.scheduler_job import DagFileProcessor, SchedulerJob  # noqa: F401
 from airflow.jobs.local_task_job import LocalTaskJob  # noqa: F401
+from airflow.jobs.sensor_service_job import SensorServiceJob  # noqa: F401
@@ -23,6 +23,7 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import getpass
+import time
 from time import sleep
 
 from sqlalchemy import Column, Index, Integer, String, and_, or_
@@ -167,14 +168,6 @@ class BaseJob(Base, LoggingMixin):
         previous_heartbeat = self.latest_heartbeat
 
         try:
-            with create_session() as session:
-                # This will cause it to load from the db
-                session.merge(self)
-                previous_heartbeat = self.latest_heartbeat
-
-            if self.state == State.SHUTDOWN:
-                self.kill()
-
             is_unit_test = conf.getboolean('core', 'unit_test_mode')
             if not is_unit_test:
                 # Figure out how long to sleep for
@@ -187,15 +180,21 @@ class BaseJob(Base, LoggingMixin):
 
                 sleep(sleep_for)
 
-            # Update last heartbeat time
             with create_session() as session:
-                # Make the sesion aware of this object
-                session.merge(self)
-                self.latest_heartbeat = timezone.utcnow()
+                start_time = time.time()
+                latest_heartbeat = timezone.utcnow()
+                self._update_heartbeat(latest_heartbeat, session=session)
                 session.commit()
+                Stats.timing(
+                    convert_camel_to_snake(self.__class__.__name__) + '_heartbeat_db_duration',
+                    (time.time() - start_time) * 1000)
                 # At this point, the DB has updated.
+                self.latest_heartbeat = latest_heartbeat
                 previous_heartbeat = self.latest_heartbeat
 
+                if self.state == State.SHUTDOWN:
+                    self.kill()
+
                 self.heartbeat_callback(session=session)
                 self.log.debug('[heartbeat]')
         except OperationalError:
@@ -206,6 +205,20 @@ class BaseJob(Base, LoggingMixin):
             # We didn't manage to heartbeat, so make sure that the timestamp isn't updated
             self.latest_heartbeat = previous_heartbeat
 
+    def _update_heartbeat(self, latest_heartbeat, session):
+        """
+        Writes ``latest_heartbeat`` to the job's entry and loads the state
+        of the job, which is set to ``shutdown`` to kill the job externally.
+        Only the heartbeat column is written, so the state set externally
+        is not overwritten. Subclasses can load what their heartbeat
+        callback needs with the same query.
+        """
+        session.query(BaseJob).filter(BaseJob.id == self.id).update(
+            {BaseJob.latest_heartbeat: latest_heartbeat}, synchronize_session=False)
+        job = session.query(BaseJob.state).filter(BaseJob.id == self.id).first()
+        if job:
+            self.state = job.state
+
     def run(self):
         Stats.incr(self.__class__.__name__.lower() + '_start', 1, 1)
         # Adding an entry in the DB
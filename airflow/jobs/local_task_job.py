@@ -26,8 +26,11 @@ import os
 import signal
 import time
 
+from sqlalchemy import and_
+
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException
+from airflow.models import TaskInstance
 from airflow.settings import Stats
 from airflow.task.task_runner import get_task_runner
 from airflow.utils import timezone
@@ -67,6 +70,8 @@ class LocalTaskJob(BaseJob):
         # terminating state is used so that a job don't try to
         # terminate multiple times
         self.terminating = False
+        # Whether the state of the task instance was loaded by the last heartbeat
+        self._ti_state_loaded = False
 
         super(LocalTaskJob, self).__init__(*args, **kwargs)
 
@@ -96,6 +101,15 @@ class LocalTaskJob(BaseJob):
 
             heartbeat_time_limit = conf.getint('scheduler',
                                                'scheduler_zombie_task_threshold')
+            # Long running tasks heartbeat less often, while staying well
+            # within the time limit after which they are considered zombies.
+            # The task process is still checked every job_heartbeat_sec, so
+            # the job exits soon after the task does.
+            poll_interval = self.heartrate
+            max_heartrate = min(
+                max(conf.getfloat('scheduler', 'local_task_job_max_heartbeat_sec'),
+                    poll_interval),
+                heartbeat_time_limit / 3.0)
             while True:
                 # Monitor the task to see if it's done
                 return_code = self.task_runner.return_code()
@@ -103,7 +117,11 @@ class LocalTaskJob(BaseJob):
                     self.log.info("Task exited with return code %s", return_code)
                     return
 
-                self.heartbeat()
+                runtime = (timezone.utcnow() - self.start_date).total_seconds()
+                self.heartrate = min(max(poll_interval, runtime / 10), max_heartrate)
+                time_since_last_heartbeat = (timezone.utcnow() - self.latest_heartbeat).total_seconds()
+                if time_since_last_heartbeat >= self.heartrate:
+                    self.heartbeat()
 
                 # If it's been too long since we've heartbeat, then it's possible that
                 # the scheduler rescheduled this task, so kill launched processes.
@@ -117,8 +135,8 @@ class LocalTaskJob(BaseJob):
                                            .format(time_since_last_heartbeat,
                                                    heartbeat_time_limit))
 
-                if time_since_last_heartbeat < self.heartrate:
-                    sleep_for = self.heartrate - time_since_last_heartbeat
+                sleep_for = min(poll_interval, self.heartrate - time_since_last_heartbeat)
+                if sleep_for > 0:
                     self.log.debug("Time since last heartbeat(%.2f s) < heartrate(%s s)"
                                    ", sleeping for %s s", time_since_last_heartbeat,
                                    self.heartrate, sleep_for)
@@ -130,6 +148,28 @@ class LocalTaskJob(BaseJob):
         self.task_runner.terminate()
         self.task_runner.on_finish()
 
+    def _update_heartbeat(self, latest_heartbeat, session):
+        """
+        Writes ``latest_heartbeat`` and loads the states of the job and of
+        its task instance with one query.
+        """
+        TI = TaskInstance
+        ti = self.task_instance
+        session.query(BaseJob).filter(BaseJob.id == self.id).update(
+            {BaseJob.latest_heartbeat: latest_heartbeat}, synchronize_session=False)
+        row = (
+            session
+            .query(BaseJob.state, TI.state, TI.hostname, TI.pid)
+            .outerjoin(TI, and_(TI.dag_id == ti.dag_id,
+                                TI.task_id == ti.task_id,
+                                TI.execution_date == ti.execution_date))
+            .filter(BaseJob.id == self.id)
+            .first()
+        )
+        if row:
+            self.state, ti.state, ti.hostname, ti.pid = row
+            self._ti_state_loaded = True
+
     @provide_session
     def heartbeat_callback(self, session=None):
         """Self destruct task if state has been moved away from running externally"""
@@ -139,7 +179,11 @@ class LocalTaskJob(BaseJob):
             self.task_runner.terminate()
             return
 
-        self.task_instance.refresh_from_db()
+        if self._ti_state_loaded:
+            # Loaded by the heartbeat this callback follows
+            self._ti_state_loaded = False
+        else:
+            self.task_instance.refresh_from_db()
         ti = self.task_instance
 
         fqdn = get_hostname()
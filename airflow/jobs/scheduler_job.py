@@ -22,6 +22,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import hashlib
 import logging
 import multiprocessing
 import os
@@ -43,7 +44,7 @@ from airflow.configuration import conf
 from airflow import executors, models, settings
 from airflow.exceptions import AirflowException, TaskNotFound
 from airflow.jobs.base_job import BaseJob
-from airflow.models import DagRun, SlaMiss, errors
+from airflow.models import DagModel, DagRun, SlaMiss, errors
 from airflow.settings import Stats
 from airflow.ti_deps.dep_context import DepContext, SCHEDULEABLE_STATES, SCHEDULED_DEPS
 from airflow.operators.dummy_operator import DummyOperator
@@ -434,6 +435,17 @@ class SchedulerJob(BaseJob):
             (timezone.utcnow() - self.latest_heartbeat).total_seconds() < scheduler_health_check_threshold
         )
 
+    @staticmethod
+    def _get_sla_hash(dag):
+        """
+        Returns a hash of what the SLA deadlines of the tasks of ``dag`` depend on.
+        """
+        slas = sorted((task.task_id, task.sla.total_seconds()) for task in dag.tasks
+                      if isinstance(task.sla, timedelta))
+        return hashlib.md5(
+            repr((str(dag.normalized_schedule_interval), str(dag.timezone), slas)).encode('utf-8')
+        ).hexdigest()
+
     @provide_session
     def manage_slas(self, dag, session=None):
         """
@@ -442,6 +454,11 @@ class SchedulerJob(BaseJob):
 
         We are assuming that the scheduler runs often, so we only check for
         tasks that should have succeeded in the past hour.
+
+        The earliest time at which a task can newly miss its SLA is stored as
+        ``next_sla_check`` of the DAG, and no new SLA misses are looked for
+        before then unless the SLAs or the schedule of the DAG change. The
+        notifications of recorded SLA misses are sent either way.
         """
         if not any([isinstance(ti.sla, timedelta) for ti in dag.tasks]):
             self.log.info("Skipping SLA check for %s because no tasks in DAG have SLAs", dag)
@@ -455,44 +472,20 @@ class SchedulerJob(BaseJob):
                           "skipped in 1.10.4, due to related refactoring going on.")
             return
 
-        TI = models.TaskInstance
-        sq = (
-            session
-            .query(
-                TI.task_id,
-                func.max(TI.execution_date).label('max_ti'))
-            .with_hint(TI, 'USE INDEX (PRIMARY)', dialect_name='mysql')
-            .filter(TI.dag_id == dag.dag_id)
-            .filter(or_(
-                TI.state == State.SUCCESS,
-                TI.state == State.SKIPPED))
-            .filter(TI.task_id.in_(dag.task_ids))
-            .group_by(TI.task_id).subquery('sq')
-        )
-
-        max_tis = session.query(TI).filter(
-            TI.dag_id == dag.dag_id,
-            TI.task_id == sq.c.task_id,
-            TI.execution_date == sq.c.max_ti,
-        ).all()
-
         ts = timezone.utcnow()
-        for ti in max_tis:
-            task = dag.get_task(ti.task_id)
-            dttm = ti.execution_date
-            if isinstance(task.sla, timedelta):
-                dttm = dag.following_schedule(dttm)
-                while dttm < timezone.utcnow():
-                    following_schedule = dag.following_schedule(dttm)
-                    if following_schedule + task.sla < timezone.utcnow():
-                        session.merge(SlaMiss(
-                            task_id=ti.task_id,
-                            dag_id=ti.dag_id,
-                            execution_date=dttm,
-                            timestamp=ts))
-                    dttm = dag.following_schedule(dttm)
-        session.commit()
+        dag_model = session.query(DagModel).filter(DagModel.dag_id == dag.dag_id).first()
+        sla_hash = self._get_sla_hash(dag)
+        if (dag_model and dag_model.sla_hash == sla_hash and
+                dag_model.next_sla_check and ts < dag_model.next_sla_check):
+            # No task can have missed its SLA since the last check, but the
+            # notifications of earlier misses may still have to be sent
+            self.log.debug("Skipping SLA miss detection for %s until %s",
+                           dag, dag_model.next_sla_check)
+        else:
+            self._record_sla_misses(dag, dag_model, sla_hash, ts, session=session)
+            session.commit()
 
+        TI = models.TaskInstance
         slas = (
             session
             .query(SlaMiss)
@@ -587,6 +580,67 @@ class SchedulerJob(BaseJob):
                     session.merge(sla)
             session.commit()
 
+    def _record_sla_misses(self, dag, dag_model, sla_hash, ts, session):
+        """
+        Records the SLA misses of ``dag`` up to ``ts`` that are not recorded
+        yet, and stores in ``dag_model`` when the SLAs have to be checked next.
+        """
+        TI = models.TaskInstance
+        sq = (
+            session
+            .query(
+                TI.task_id,
+                func.max(TI.execution_date).label('max_ti'))
+            .with_hint(TI, 'USE INDEX (PRIMARY)', dialect_name='mysql')
+            .filter(TI.dag_id == dag.dag_id)
+            .filter(or_(
+                TI.state == State.SUCCESS,
+                TI.state == State.SKIPPED))
+            .filter(TI.task_id.in_(dag.task_ids))
+            .group_by(TI.task_id).subquery('sq')
+        )
+
+        max_tis = session.query(TI).filter(
+            TI.dag_id == dag.dag_id,
+            TI.task_id == sq.c.task_id,
+            TI.execution_date == sq.c.max_ti,
+        ).all()
+
+        sla_misses = []
+        # Tasks that never succeeded can miss their SLA as soon as they do
+        can_skip_checks = {ti.task_id for ti in max_tis} >= {
+            task.task_id for task in dag.tasks if isinstance(task.sla, timedelta)}
+        next_sla_check = None
+        for ti in max_tis:
+            task = dag.get_task(ti.task_id)
+            if not isinstance(task.sla, timedelta):
+                continue
+            dttm = dag.following_schedule(ti.execution_date)
+            # The SLA deadlines grow with the execution dates, so the runs
+            # after the first one that is not late are not late either
+            while dttm < ts and dag.following_schedule(dttm) + task.sla < ts:
+                sla_misses.append((ti.task_id, dttm))
+                dttm = dag.following_schedule(dttm)
+            deadline = dag.following_schedule(dttm) + task.sla
+            if next_sla_check is None or deadline < next_sla_check:
+                next_sla_check = deadline
+
+        if sla_misses:
+            recorded_sla_misses = set(
+                session
+                .query(SlaMiss.task_id, SlaMiss.execution_date)
+                .filter(SlaMiss.dag_id == dag.dag_id,
+                        SlaMiss.execution_date >= min(dttm for _, dttm in sla_misses))
+            )
+            session.add_all([
+                SlaMiss(task_id=task_id, dag_id=dag.dag_id, execution_date=dttm, timestamp=ts)
+                for task_id, dttm in sla_misses
+                if (task_id, dttm) not in recorded_sla_misses
+            ])
+        if dag_model:
+            dag_model.next_sla_check = next_sla_check if can_skip_checks else None
+            dag_model.sla_hash = sla_hash
+
     @staticmethod
     def update_import_errors(session, dagbag):
         """
@@ -783,6 +837,9 @@ class SchedulerJob(BaseJob):
                 make_transient(run)
                 active_dag_runs.append(run)
 
+        # The context memoizes what the task instances of a DAG run share, e.g.
+        # the previous DAG run, so it is shared by all the runs of this loop
+        dep_context = DepContext(flag_upstream_failed=True)
         for run in active_dag_runs:
             self.log.debug("Examining active DAG run: %s", run)
             tis = run.get_task_instances(state=SCHEDULEABLE_STATES)
@@ -797,7 +854,7 @@ class SchedulerJob(BaseJob):
                 ti.task = task
 
                 if ti.are_dependencies_met(
-                        dep_context=DepContext(flag_upstream_failed=True),
+                        dep_context=dep_context,
                         session=session):
                     self.log.debug('Queuing task: %s', ti)
                     task_instances_list.append(ti.key)
@@ -1520,13 +1577,14 @@ class SchedulerJob(BaseJob):
         self._change_state_for_tis_without_dagrun(simple_dag_bag,
                                                   [State.UP_FOR_RETRY],
                                                   State.FAILED)
-        # If a task instance is scheduled or queued or up for reschedule,
-        # but the corresponding DAG run isn't running, set the state to
-        # NONE so we don't try to re-run it.
+        # If a task instance is scheduled or queued or up for reschedule or
+        # sensing, but the corresponding DAG run isn't running, set the state
+        # to NONE so we don't try to re-run it.
         self._change_state_for_tis_without_dagrun(simple_dag_bag,
                                                   [State.QUEUED,
                                                    State.SCHEDULED,
-                                                   State.UP_FOR_RESCHEDULE],
+                                                   State.UP_FOR_RESCHEDULE,
+                                                   State.SENSING],
                                                   State.NONE)
         self._execute_task_instances(simple_dag_bag,
                                      (State.SCHEDULED,))
@@ -1578,8 +1636,7 @@ class SchedulerJob(BaseJob):
             return [], len(dagbag.import_errors)
 
         # Save individual DAGs in the ORM and update DagModel.last_scheduled_time
-        for dag in dagbag.dags.values():
-            dag.sync_to_db()
+        models.DAG.bulk_sync_to_db(dagbag.dags.values())
 
         paused_dag_ids = [dag.dag_id for dag in dagbag.dags.values()
                           if dag.is_paused]
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import multiprocessing
+import time
+from collections import defaultdict
+from datetime import timedelta
+from multiprocessing.pool import ThreadPool
+
+from sqlalchemy import and_, exists
+
+from airflow.configuration import conf
+from airflow.jobs.base_job import BaseJob
+from airflow.models import DagModel, SensorInstance, TaskDuration, TaskInstance
+from airflow.settings import STORE_SERIALIZED_DAGS, Stats
+from airflow.utils import timezone
+from airflow.utils.db import provide_session
+from airflow.utils.helpers import query_chunks
+from airflow.utils.module_loading import import_string
+from airflow.utils.state import State
+
+
+class SensorServiceJob(BaseJob):
+    """
+    Pokes the sensor task instances that were handed over to the sensor
+    service, so that they do not hold a worker slot while they wait.
+
+    The sensing task instances are loaded with one query per loop. Sensors
+    that poke for the same criteria share a single poke, the pokes of a loop
+    run concurrently on ``[sensor_service] parallelism`` threads, and the
+    task instances whose criteria were met, or that timed out, are updated
+    in one transaction per loop.
+
+    A loop waits for each poke until the next poke of its sensors would be
+    due, or until they time out if that is sooner. A poke that takes longer
+    counts as not met, and its sensors are not poked again before it
+    returns, so a poke that hangs does not hold up the other sensors.
+
+    :param num_runs: The number of times to run the sensing loop. If you
+        have a large number of sensors, you can set this to -1 to run forever.
+    :type num_runs: int
+    :param loop_interval: Number of seconds to wait between two loops,
+        defaults to ``[sensor_service] loop_interval``
+    :type loop_interval: float
+    """
+
+    __mapper_args__ = {
+        'polymorphic_identity': 'SensorServiceJob'
+    }
+
+    def __init__(self, num_runs=-1, loop_interval=None, *args, **kwargs):
+        self.num_runs = num_runs
+        if loop_interval is None:
+            loop_interval = conf.getfloat('sensor_service', 'loop_interval')
+        self.loop_interval = loop_interval
+        self.max_sensors_per_loop = conf.getint('sensor_service', 'max_sensors_per_loop')
+        self.parallelism = conf.getint('sensor_service', 'parallelism')
+        # Pokes may use the metadata database, e.g. to look up connections, so
+        # there is no point in running more of them than there are pooled
+        # database connections
+        pool_size = conf.getint('core', 'sql_alchemy_pool_size')
+        if conf.getboolean('core', 'sql_alchemy_pool_enabled') and 0 < pool_size < self.parallelism:
+            self.parallelism = pool_size
+        # The threads the pokes run on, created on the first loop that needs them
+        self._poke_pool = None
+        # The pokes that missed their deadline and are still running, by hashcode
+        self._late_pokes = {}
+        # When each group of sensors sharing a poke should be poked next
+        self._next_poke_dates = {}
+        super(SensorServiceJob, self).__init__(*args, **kwargs)
+
+    def _execute(self):
+        self.log.info("Starting the sensor service")
+        self.log.info("Poking sensors on up to %s threads", self.parallelism)
+        loop_count = 0
+        try:
+            while self.num_runs < 0 or loop_count < self.num_runs:
+                loop_start_time = time.time()
+                self.run_sensing_loop()
+                loop_count += 1
+                loop_duration = time.time() - loop_start_time
+                Stats.timing('sensor_service.loop_duration', loop_duration * 1000)
+                self.log.debug("Ran sensing loop in %.2f seconds", loop_duration)
+
+                if (timezone.utcnow() - self.latest_heartbeat).total_seconds() >= self.heartrate:
+                    self.heartbeat()
+                if self.num_runs < 0 or loop_count < self.num_runs:
+                    time.sleep(max(0, self.loop_interval - loop_duration))
+        finally:
+            self._close_poke_pool()
+
+        self.log.info("Exited sensing loop")
+
+    @provide_session
+    def run_sensing_loop(self, session=None):
+        """
+        Pokes every group of sensing task instances whose poke interval has
+        passed and finishes the task instances whose criteria were met or
+        that timed out.
+        """
+        TI = TaskInstance
+        SI = SensorInstance
+        self._remove_stale_sensor_instances(session=session)
+
+        sensor_instances = (
+            session
+            .query(SI, TI.max_tries)
+            .join(TI, and_(TI.dag_id == SI.dag_id,
+                           TI.task_id == SI.task_id,
+                           TI.execution_date == SI.execution_date))
+            .filter(TI.state == State.SENSING)
+            .order_by(SI.created_at)
+            .limit(self.max_sensors_per_loop)
+            .all()
+        )
+        sensors_by_hashcode = defaultdict(list)
+        for sensor_instance, max_tries in sensor_instances:
+            sensors_by_hashcode[sensor_instance.hashcode].append((sensor_instance, max_tries))
+        Stats.gauge('sensor_service.sensing_task_instances', len(sensor_instances))
+        Stats.gauge('sensor_service.poke_targets', len(sensors_by_hashcode))
+
+        for hashcode in set(self._next_poke_dates) - set(sensors_by_hashcode):
+            del self._next_poke_dates[hashcode]
+        for hashcode, late_poke in list(self._late_pokes.items()):
+            if late_poke.ready():
+                del self._late_pokes[hashcode]
+
+        new_states = {}
+        due = []
+        poke_timeouts = []
+        now = timezone.utcnow()
+        for hashcode, sensors in sensors_by_hashcode.items():
+            waiting = []
+            for sensor_instance, max_tries in sensors:
+                if sensor_instance.execution_deadline and now > sensor_instance.execution_deadline:
+                    self.log.info("%s exceeded its execution_timeout", sensor_instance)
+                    Stats.incr('sensor_service.timeouts')
+                    new_states[sensor_instance] = self._get_failed_state(sensor_instance, max_tries)
+                elif (now - sensor_instance.start_date).total_seconds() > sensor_instance.timeout:
+                    self.log.info("%s timed out", sensor_instance)
+                    Stats.incr('sensor_service.timeouts')
+                    new_states[sensor_instance] = self._get_failed_state(
+                        sensor_instance, max_tries, timed_out=True)
+                else:
+                    waiting.append((sensor_instance, max_tries))
+
+            if (not waiting or self._next_poke_dates.get(hashcode, now) > now or
+                    hashcode in self._late_pokes):
+                continue
+            poke_interval = min(sensor_instance.poke_interval for sensor_instance, _ in waiting)
+            self._next_poke_dates[hashcode] = now + timedelta(seconds=poke_interval)
+            due.append(waiting)
+            poke_timeouts.append(min(
+                [poke_interval] +
+                [self._get_remaining_time(sensor_instance, now) for sensor_instance, _ in waiting]))
+
+        self._prefetch([waiting[0][0] for waiting in due])
+        results = self._poke_all([waiting[0][0] for waiting in due], poke_timeouts)
+        for waiting, criteria_met in zip(due, results):
+            if isinstance(criteria_met, Exception):
+                Stats.incr('sensor_service.poke_exceptions')
+                for sensor_instance, max_tries in waiting:
+                    new_states[sensor_instance] = self._get_failed_state(sensor_instance, max_tries)
+                continue
+
+            if criteria_met:
+                Stats.incr('sensor_service.poke_success')
+                for sensor_instance, _ in waiting:
+                    new_states[sensor_instance] = State.SUCCESS
+
+        if new_states:
+            self._finish_task_instances(new_states, session=session)
+        session.commit()
+
+    def _prefetch(self, sensor_instances):
+        """
+        Lets each sensor class load what the pokes of ``sensor_instances``
+        need at once, e.g. with a single query.
+        """
+        poke_contexts_by_operator = defaultdict(list)
+        for sensor_instance in sensor_instances:
+            poke_contexts_by_operator[sensor_instance.operator].append(
+                sensor_instance.get_poke_context())
+
+        for operator, poke_contexts in poke_contexts_by_operator.items():
+            try:
+                import_string(operator).prefetch(poke_contexts)
+            except Exception:  # pylint: disable=broad-except
+                self.log.exception("Prefetching for %s failed, poking without it", operator)
+
+    @staticmethod
+    def _get_remaining_time(sensor_instance, now):
+        """
+        Returns the number of seconds left before ``sensor_instance`` times
+        out or exceeds its execution timeout.
+        """
+        remaining = sensor_instance.timeout - (now - sensor_instance.start_date).total_seconds()
+        if sensor_instance.execution_deadline:
+            remaining = min(remaining, (sensor_instance.execution_deadline - now).total_seconds())
+        return remaining
+
+    def _poke_all(self, sensor_instances, poke_timeouts):
+        """
+        Pokes ``sensor_instances``, on up to ``parallelism`` threads as pokes
+        mostly wait on I/O, and waits for each poke for at most its number
+        of seconds in ``poke_timeouts``.
+
+        :return: for each sensor instance, whether its criteria are met or
+            the exception its poke raised. A poke that did not return in
+            time did not meet the criteria.
+        :rtype: list
+        """
+        if not sensor_instances:
+            return []
+        if self._poke_pool is None:
+            self._poke_pool = ThreadPool(self.parallelism)
+
+        start_time = time.time()
+        deadlines = [start_time + max(poke_timeout, 0) for poke_timeout in poke_timeouts]
+        async_results = [
+            self._poke_pool.apply_async(self._safe_poke, (sensor_instance, deadline))
+            for sensor_instance, deadline in zip(sensor_instances, deadlines)
+        ]
+        results = []
+        for sensor_instance, deadline, async_result in zip(
+                sensor_instances, deadlines, async_results):
+            try:
+                results.append(async_result.get(max(deadline - time.time(), 0)))
+            except multiprocessing.TimeoutError:
+                self.log.warning("Poking for %s did not return within %.2f seconds",
+                                 sensor_instance, deadline - start_time)
+                Stats.incr('sensor_service.poke_timeouts')
+                self._late_pokes[sensor_instance.hashcode] = async_result
+                results.append(False)
+        return results
+
+    def _close_poke_pool(self):
+        if self._poke_pool is not None:
+            self._poke_pool.close()
+            # The threads of pokes that hang would never be joined
+            if not self._late_pokes:
+                self._poke_pool.join()
+            self._poke_pool = None
+            self._late_pokes = {}
+
+    def _safe_poke(self, sensor_instance, deadline):
+        if time.time() > deadline:
+            # Waited for a thread for too long, the loop does not wait anymore
+            return False
+        try:
+            return self._poke(sensor_instance)
+        except Exception as e:  # pylint: disable=broad-except
+            self.log.exception("Poking for %s failed", sensor_instance)
+            return e
+
+    def _poke(self, sensor_instance):
+        """
+        Rebuilds the sensor from the poke context of ``sensor_instance`` and
+        pokes it once.
+
+        :return: whether the criteria of the sensor are met
+        :rtype: bool
+        """
+        poke_context = sensor_instance.get_poke_context()
+        context = {
+            'execution_date': poke_context.pop('execution_date', sensor_instance.execution_date),
+        }
+        sensor_class = import_string(sensor_instance.operator)
+        sensor = sensor_class(task_id='sensor_service_' + sensor_instance.hashcode, **poke_context)
+
+        Stats.incr('sensor_service.pokes')
+        start_time = time.time()
+        try:
+            return sensor.poke(context)
+        finally:
+            Stats.timing('sensor_service.poke_duration', (time.time() - start_time) * 1000)
+
+    @staticmethod
+    def _get_failed_state(sensor_instance, max_tries, timed_out=False):
+        """
+        Returns the state a failed sensor task instance moves to, following
+        the same rules as a sensor failing in a worker.
+        """
+        eligible_to_retry = max_tries and sensor_instance.try_number <= max_tries
+        if timed_out and sensor_instance.soft_fail and not eligible_to_retry:
+            return State.SKIPPED
+        if eligible_to_retry:
+            return State.UP_FOR_RETRY
+        return State.FAILED
+
+    @provide_session
+    def _finish_task_instances(self, new_states, session=None):
+        """
+        Sets the new states of the task instances that are still sensing and
+        removes their sensor instances.
+
+        :param new_states: new task instance state for each sensor instance
+        :type new_states: dict[airflow.models.SensorInstance, str]
+        """
+        TI = TaskInstance
+        sensor_instances_by_key = {
+            (si.dag_id, si.task_id, si.execution_date): si for si in new_states
+        }
+        keys_by_dag_id = defaultdict(list)
+        for dag_id, task_id, execution_date in sensor_instances_by_key:
+            keys_by_dag_id[dag_id].append((task_id, execution_date))
+
+        end_date = timezone.utcnow()
+        skipped_tis = []
+        for dag_id, keys in keys_by_dag_id.items():
+            for keys_chunk in query_chunks(keys):
+                tis = (
+                    session
+                    .query(TI)
+                    .filter(TI.dag_id == dag_id,
+                            TI.task_id.in_({task_id for task_id, _ in keys_chunk}),
+                            TI.execution_date.in_({date for _, date in keys_chunk}),
+                            TI.state == State.SENSING)
+                    .with_for_update()
+                    .populate_existing()
+                )
+                for ti in tis:
+                    sensor_instance = sensor_instances_by_key.get(ti.key[:3])
+                    if sensor_instance is None:
+                        continue
+                    ti.state = new_states[sensor_instance]
+                    ti.end_date = end_date
+                    ti.set_duration()
+                    if ti.state == State.SUCCESS:
+                        Stats.timing('sensor_service.sensing_duration',
+                                     end_date - sensor_instance.created_at)
+                        TaskDuration.record(ti, session=session)
+                    elif ti.state == State.SKIPPED:
+                        skipped_tis.append(ti)
+                    self.log.info("Marking %s as %s", ti, ti.state.upper())
+
+        if skipped_tis:
+            self._skip_downstream_tasks(skipped_tis, end_date, session=session)
+
+        for si_chunk in query_chunks([si.id for si in new_states]):
+            session.query(SensorInstance).filter(
+                SensorInstance.id.in_(si_chunk)
+            ).delete(synchronize_session=False)
+
+    def _skip_downstream_tasks(self, tis, end_date, session):
+        """
+        Skips all the tasks downstream of the soft failed sensor task
+        instances ``tis``, like ``BaseSensorOperator`` does when a sensor
+        times out in a worker.
+        """
+        TI = TaskInstance
+        dags = {}
+        for ti in tis:
+            if ti.dag_id not in dags:
+                dags[ti.dag_id] = self._get_dag(ti.dag_id, session=session)
+            dag = dags[ti.dag_id]
+            if dag is None or not dag.has_task(ti.task_id):
+                self.log.warning("Could not find the task of %s, its downstream "
+                                 "tasks are not skipped", ti)
+                continue
+
+            downstream_task_ids = dag.get_task(ti.task_id).get_flat_relative_ids(upstream=False)
+            self.log.debug("Skipping the downstream tasks %s of %s", downstream_task_ids, ti)
+            for task_ids_chunk in query_chunks(sorted(downstream_task_ids)):
+                session.query(TI).filter(
+                    TI.dag_id == ti.dag_id,
+                    TI.execution_date == ti.execution_date,
+                    TI.task_id.in_(task_ids_chunk)
+                ).update({TI.state: State.SKIPPED,
+                          TI.start_date: end_date,
+                          TI.end_date: end_date},
+                         synchronize_session=False)
+
+    @staticmethod
+    def _get_dag(dag_id, session):
+        """
+        Returns the DAG ``dag_id``, from the serialized DAGs when they are
+        stored, or None if it is not known.
+        """
+        dag_model = DagModel.get_dagmodel(dag_id, session=session)
+        if dag_model is None:
+            return None
+        return dag_model.get_dag(STORE_SERIALIZED_DAGS)
+
+    @provide_session
+    def _remove_stale_sensor_instances(self, session=None):
+        """
+        Removes the sensor instances of task instances that are not sensing
+        anymore, e.g. because they were cleared or marked externally.
+        """
+        TI = TaskInstance
+        SI = SensorInstance
+        session.query(SI).filter(~exists().where(and_(
+            TI.dag_id == SI.dag_id,
+            TI.task_id == SI.task_id,
+            TI.execution_date == SI.execution_date,
+            TI.state == State.SENSING,
+        ))).delete(synchronize_session=False)
@@ -0,0 +1,46 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add source_code_hash to dag_code
+
+Revision ID: a7e1c2b3d9f0
+Revises: c1e2a7f9d4b6
+Create Date: 2020-05-06 15:31:07.224185
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a7e1c2b3d9f0'
+down_revision = 'c1e2a7f9d4b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add source_code_hash column to dag_code"""
+    with op.batch_alter_table('dag_code') as batch_op:
+        batch_op.add_column(sa.Column('source_code_hash', sa.String(32), nullable=True))
+
+
+def downgrade():
+    """Drop source_code_hash column from dag_code"""
+    with op.batch_alter_table('dag_code') as batch_op:
+        batch_op.drop_column('source_code_hash')
@@ -0,0 +1,82 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add sensor_instance table
+
+Revision ID: b3f4a7c9e2d1
+Revises: a7e1c2b3d9f0
+Create Date: 2020-05-12 10:14:32.516487
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'b3f4a7c9e2d1'
+down_revision = 'a7e1c2b3d9f0'
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = 'sensor_instance'
+
+
+def upgrade():
+    """Create sensor_instance table"""
+    # See 0e2a74e0fc9f_add_time_zone_awareness
+    conn = op.get_bind()
+    if conn.dialect.name == 'mysql':
+        timestamp = mysql.TIMESTAMP(fsp=6)
+    elif conn.dialect.name == 'mssql':
+        timestamp = sa.DateTime()
+    else:
+        timestamp = sa.TIMESTAMP(timezone=True)
+
+    op.create_table(
+        TABLE_NAME,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.String(length=250), nullable=False),
+        sa.Column('dag_id', sa.String(length=250), nullable=False),
+        # use explicit server_default=None otherwise mysql implies defaults for first timestamp column
+        sa.Column('execution_date', timestamp, nullable=False, server_default=None),
+        sa.Column('try_number', sa.Integer(), nullable=False),
+        sa.Column('start_date', timestamp, nullable=False),
+        sa.Column('operator', sa.String(length=1000), nullable=False),
+        sa.Column('poke_context', sa.Text(), nullable=False),
+        sa.Column('hashcode', sa.String(length=32), nullable=False),
+        sa.Column('poke_interval', sa.Float(), nullable=False),
+        sa.Column('timeout', sa.Float(), nullable=False),
+        sa.Column('soft_fail', sa.Boolean(), nullable=False),
+        sa.Column('created_at', timestamp, nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(
+            ['task_id', 'dag_id', 'execution_date'],
+            ['task_instance.task_id', 'task_instance.dag_id', 'task_instance.execution_date'],
+            name='sensor_instance_dag_task_date_fkey',
+            ondelete='CASCADE')
+    )
+    op.create_index('si_dag_task_date', TABLE_NAME, ['dag_id', 'task_id', 'execution_date'],
+                    unique=True)
+    op.create_index('si_hashcode', TABLE_NAME, ['hashcode'], unique=False)
+
+
+def downgrade():
+    """Drop sensor_instance table"""
+    op.drop_index('si_hashcode', table_name=TABLE_NAME)
+    op.drop_index('si_dag_task_date', table_name=TABLE_NAME)
+    op.drop_table(TABLE_NAME)
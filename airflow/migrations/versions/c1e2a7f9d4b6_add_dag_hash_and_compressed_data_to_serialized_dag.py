@@ -0,0 +1,79 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add dag_hash and data_compressed to serialized_dag
+
+Revision ID: c1e2a7f9d4b6
+Revises: e9a7d1b0c3f4
+Create Date: 2020-05-04 10:12:41.132019
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'c1e2a7f9d4b6'
+down_revision = 'e9a7d1b0c3f4'
+branch_labels = None
+depends_on = None
+
+
+def _json_type(conn):
+    json_type = sa.JSON
+    if conn.dialect.name != "postgresql":
+        # Mysql 5.7+/MariaDB 10.2.3 has JSON support. Rather than checking for
+        # versions, check for the function existing.
+        try:
+            conn.execute("SELECT JSON_VALID(1)").fetchone()
+        except (sa.exc.OperationalError, sa.exc.ProgrammingError):
+            json_type = sa.Text
+    return json_type
+
+
+def upgrade():
+    """Add dag_hash and data_compressed columns and make data nullable"""
+    conn = op.get_bind()  # pylint: disable=no-member
+    json_type = _json_type(conn)
+
+    with op.batch_alter_table('serialized_dag') as batch_op:
+        batch_op.add_column(sa.Column('dag_hash', sa.String(32), nullable=True))
+        batch_op.add_column(sa.Column('data_compressed', sa.LargeBinary, nullable=True))
+        batch_op.alter_column('data', existing_type=json_type(), nullable=True)
+
+    if conn.dialect.name == "mysql":
+        op.alter_column(  # pylint: disable=no-member
+            table_name='serialized_dag',
+            column_name='data_compressed',
+            type_=mysql.LONGBLOB,
+            nullable=True,
+        )
+
+
+def downgrade():
+    """Drop dag_hash and data_compressed columns"""
+    conn = op.get_bind()  # pylint: disable=no-member
+    json_type = _json_type(conn)
+
+    # Compressed DAGs are written again by the scheduler
+    op.execute("DELETE FROM serialized_dag WHERE data IS NULL")  # pylint: disable=no-member
+    with op.batch_alter_table('serialized_dag') as batch_op:
+        batch_op.alter_column('data', existing_type=json_type(), nullable=False)
+        batch_op.drop_column('data_compressed')
+        batch_op.drop_column('dag_hash')
@@ -0,0 +1,69 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add task_duration table and next SLA check of dags
+
+Revision ID: c4d8e2f1a6b5
+Revises: b3f4a7c9e2d1
+Create Date: 2020-05-19 09:41:07.283614
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'c4d8e2f1a6b5'
+down_revision = 'b3f4a7c9e2d1'
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = 'task_duration'
+
+
+def upgrade():
+    """Create task_duration table and add next_sla_check and sla_hash to dag"""
+    # See 0e2a74e0fc9f_add_time_zone_awareness
+    conn = op.get_bind()
+    if conn.dialect.name == 'mysql':
+        timestamp = mysql.TIMESTAMP(fsp=6)
+    elif conn.dialect.name == 'mssql':
+        timestamp = sa.DateTime()
+    else:
+        timestamp = sa.TIMESTAMP(timezone=True)
+
+    op.create_table(
+        TABLE_NAME,
+        sa.Column('dag_id', sa.String(length=250), nullable=False),
+        sa.Column('task_id', sa.String(length=250), nullable=False),
+        sa.Column('durations', sa.Text(), nullable=False),
+        sa.Column('p50', sa.Float(), nullable=False),
+        sa.Column('p95', sa.Float(), nullable=False),
+        # use explicit server_default=None otherwise mysql implies defaults for first timestamp column
+        sa.Column('updated_at', timestamp, nullable=False, server_default=None),
+        sa.PrimaryKeyConstraint('dag_id', 'task_id')
+    )
+    op.add_column('dag', sa.Column('next_sla_check', timestamp, nullable=True))
+    op.add_column('dag', sa.Column('sla_hash', sa.String(length=32), nullable=True))
+
+
+def downgrade():
+    """Drop task_duration table and next_sla_check and sla_hash from dag"""
+    op.drop_column('dag', 'sla_hash')
+    op.drop_column('dag', 'next_sla_check')
+    op.drop_table(TABLE_NAME)
@@ -0,0 +1,55 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add execution_deadline to sensor_instance
+
+Revision ID: d7a3e5b9c1f2
+Revises: c4d8e2f1a6b5
+Create Date: 2020-05-26 14:12:45.518233
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'd7a3e5b9c1f2'
+down_revision = 'c4d8e2f1a6b5'
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = 'sensor_instance'
+
+
+def upgrade():
+    """Add execution_deadline to sensor_instance"""
+    # See 0e2a74e0fc9f_add_time_zone_awareness
+    conn = op.get_bind()
+    if conn.dialect.name == 'mysql':
+        timestamp = mysql.TIMESTAMP(fsp=6)
+    elif conn.dialect.name == 'mssql':
+        timestamp = sa.DateTime()
+    else:
+        timestamp = sa.TIMESTAMP(timezone=True)
+
+    op.add_column(TABLE_NAME, sa.Column('execution_deadline', timestamp, nullable=True))
+
+
+def downgrade():
+    """Drop execution_deadline from sensor_instance"""
+    op.drop_column(TABLE_NAME, 'execution_deadline')
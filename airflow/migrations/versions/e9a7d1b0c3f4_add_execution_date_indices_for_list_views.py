@@ -0,0 +1,45 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add execution_date indices for list views
+
+Revision ID: e9a7d1b0c3f4
+Revises: 952da73b5eff
+Create Date: 2020-04-20 10:12:43.517302
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e9a7d1b0c3f4'
+down_revision = '952da73b5eff'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ti_execution_date', 'task_instance',
+                    ['execution_date', 'dag_id', 'task_id'], unique=False)
+    op.create_index('dr_execution_date', 'dag_run',
+                    ['execution_date', 'dag_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('dr_execution_date', table_name='dag_run')
+    op.drop_index('ti_execution_date', table_name='task_instance')
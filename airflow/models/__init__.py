@@ -28,9 +28,11 @@ from airflow.models.errors import ImportError  # noqa: F401, pylint: disable=red
 from airflow.models.log import Log  # noqa: F401
 from airflow.models.pool import Pool  # noqa: F401
 from airflow.models.renderedtifields import RenderedTaskInstanceFields  # noqa: F401
+from airflow.models.sensorinstance import SensorInstance  # noqa: F401
 from airflow.models.skipmixin import SkipMixin  # noqa: F401
 from airflow.models.slamiss import SlaMiss  # noqa: F401
 from airflow.models.taskfail import TaskFail  # noqa: F401
+from airflow.models.taskduration import TaskDuration  # noqa: F401
 from airflow.models.taskinstance import TaskInstance, clear_task_instances  # noqa: F401
 from airflow.models.taskreschedule import TaskReschedule  # noqa: F401
 from airflow.models.variable import Variable  # noqa: F401
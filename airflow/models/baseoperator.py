@@ -50,7 +50,7 @@ from airflow.ti_deps.deps.trigger_rule_dep import TriggerRuleDep
 from airflow.utils import timezone
 from airflow.utils.db import provide_session
 from airflow.utils.decorators import apply_defaults
-from airflow.utils.helpers import validate_key
+from airflow.utils.helpers import get_template_from_string, validate_key
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.operator_resources import Resources
 from airflow.utils.trigger_rule import TriggerRule
@@ -144,7 +144,7 @@ class BaseOperator(LoggingMixin):
     :type priority_weight: int
     :param weight_rule: weighting method used for the effective total
         priority weight of the task. Options are:
-        ``{ downstream | upstream | absolute }`` default is ``downstream``
+        ``{ downstream | upstream | absolute | critical_path }`` default is ``downstream``
         When set to ``downstream`` the effective weight of the task is the
         aggregate sum of all downstream descendants. As a result, upstream
         tasks will have higher weight and will be scheduled more aggressively
@@ -160,9 +160,13 @@ class BaseOperator(LoggingMixin):
         ``absolute``, the effective weight is the exact ``priority_weight``
         specified without additional weighting. You may want to do this when
         you know exactly what priority weight each task should have.
-        Additionally, when set to ``absolute``, there is bonus effect of
-        significantly speeding up the task creation process as for very large
-        DAGS. Options can be set as string or using the constants defined in
+        When set to ``critical_path``, the effective weight is the
+        ``priority_weight`` plus the expected number of seconds it takes to run
+        the task and the longest chain of tasks downstream of it, based on the
+        median duration of their latest successful runs. Tasks that are
+        followed by long chains then start earlier, which shortens the duration
+        of the whole DAG run.
+        Options can be set as string or using the constants defined in
         the static class ``airflow.utils.WeightRule``
     :type weight_rule: str
     :param queue: which queue to target when running this job. Not
@@ -597,21 +601,16 @@ class BaseOperator(LoggingMixin):
           - WeightRule.ABSOLUTE - only own weight
           - WeightRule.DOWNSTREAM - adds priority weight of all downstream tasks
           - WeightRule.UPSTREAM - adds priority weight of all upstream tasks
+          - WeightRule.CRITICAL_PATH - adds the expected duration in seconds of the
+            task and of the longest chain of downstream tasks
 
+        The weights of all the tasks of a DAG are computed at once and cached by
+        ``DAG.get_priority_weights``.
         """
-        if self.weight_rule == WeightRule.ABSOLUTE:
+        if not self.has_dag():
+            # Tasks without a DAG have no relatives
             return self.priority_weight
-        elif self.weight_rule == WeightRule.DOWNSTREAM:
-            upstream = False
-        elif self.weight_rule == WeightRule.UPSTREAM:
-            upstream = True
-        else:
-            upstream = False
-
-        return self.priority_weight + sum(
-            map(lambda task_id: self._dag.task_dict[task_id].priority_weight,
-                self.get_flat_relative_ids(upstream=upstream))
-        )
+        return self._dag.get_priority_weights()[self.task_id]
 
     @cached_property
     def operator_extra_link_dict(self):
@@ -749,7 +748,7 @@ class BaseOperator(LoggingMixin):
                 # Content contains a filepath
                 return jinja_env.get_template(content).render(**context)
             else:
-                return jinja_env.from_string(content).render(**context)
+                return get_template_from_string(jinja_env, content).render(**context)
 
         if isinstance(content, tuple):
             if type(content) is not tuple:
@@ -901,18 +900,24 @@ class BaseOperator(LoggingMixin):
     def get_flat_relative_ids(self, upstream=False, found_descendants=None):
         """
         Get a flat list of relatives' ids, either upstream or downstream.
+
+        Relatives already in ``found_descendants`` are not traversed again, so
+        a set shared between calls for several tasks visits each task once.
         """
 
-        if not found_descendants:
+        if found_descendants is None:
             found_descendants = set()
-        relative_ids = self.get_direct_relative_ids(upstream)
+        relative_ids = list(self.get_direct_relative_ids(upstream))
+        if not relative_ids:
+            return found_descendants
+        task_dict = self._dag.task_dict
 
-        for relative_id in relative_ids:
+        while relative_ids:
+            relative_id = relative_ids.pop()
             if relative_id not in found_descendants:
                 found_descendants.add(relative_id)
-                relative_task = self._dag.task_dict[relative_id]
-                relative_task.get_flat_relative_ids(upstream,
-                                                    found_descendants)
+                relative_ids.extend(
+                    task_dict[relative_id].get_direct_relative_ids(upstream))
 
         return found_descendants
 
@@ -1022,6 +1027,7 @@ class BaseOperator(LoggingMixin):
 
         if dag and not self.has_dag():
             self.dag = dag
+        dag.clear_priority_weights()
 
         for task in task_list:
             if dag and not task.has_dag():
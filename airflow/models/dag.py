@@ -27,7 +27,7 @@ import re
 import sys
 import traceback
 import warnings
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict, defaultdict, deque
 from datetime import timedelta, datetime
 from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, List, Optional, Type, Union
 
@@ -38,7 +38,7 @@ from croniter import croniter
 from dateutil.relativedelta import relativedelta
 from future.standard_library import install_aliases
 from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Text, func, or_
-from sqlalchemy.orm import backref, relationship
+from sqlalchemy.orm import backref, joinedload, relationship
 
 from airflow import settings, utils
 from airflow.configuration import conf
@@ -52,6 +52,7 @@ from airflow.models.dagbag import DagBag
 from airflow.models.dagcode import DagCode
 from airflow.models.dagpickle import DagPickle
 from airflow.models.dagrun import DagRun
+from airflow.models.taskduration import TaskDuration
 from airflow.models.taskinstance import TaskInstance, clear_task_instances
 from airflow.settings import STORE_SERIALIZED_DAGS, MIN_SERIALIZED_DAG_UPDATE_INTERVAL
 from airflow.utils import timezone
@@ -62,6 +63,7 @@ from airflow.utils.helpers import validate_key
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.sqlalchemy import UtcDateTime, Interval
 from airflow.utils.state import State
+from airflow.utils.weight_rule import WeightRule
 
 if TYPE_CHECKING:
     from airflow.models.baseoperator import BaseOperator  # Avoid circular dependency
@@ -316,6 +318,8 @@ class DAG(BaseDag, LoggingMixin):
         self.is_subdag = False  # DagBag.bag_dag() will set this to True if appropriate
 
         self.partial = False
+        # Total priority weight of each task, see get_priority_weights()
+        self._priority_weights = None  # type: Optional[Dict[str, int]]
         self.on_success_callback = on_success_callback
         self.on_failure_callback = on_failure_callback
         self.doc_md = doc_md
@@ -879,51 +883,130 @@ class DAG(BaseDag, LoggingMixin):
         Sorts tasks in topographical order, such that a task comes after any of its
         upstream dependencies.
 
-        Heavily inspired by:
-        http://blog.jupo.org/2012/04/06/topological-sorting-acyclic-directed-graphs/
+        Uses Kahn's algorithm, so every task and dependency is only visited once.
+        Tasks that become ready at the same time keep the order in which they
+        were added to the DAG.
 
         :return: list of tasks in topological order
         """
-
-        # convert into an OrderedDict to speedup lookup while keeping order the same
-        graph_unsorted = OrderedDict((task.task_id, task) for task in self.tasks)
+        task_positions = {task_id: i for i, task_id in enumerate(self.task_dict)}
+        # number of upstream tasks within this DAG that are not sorted yet
+        pending_upstream = {
+            task_id: sum(1 for upstream_id in task.upstream_task_ids
+                         if upstream_id in task_positions)
+            for task_id, task in self.task_dict.items()
+        }
+        ready = deque(task_id for task_id, count in pending_upstream.items() if count == 0)
 
         graph_sorted = []
+        while ready:
+            task = self.task_dict[ready.popleft()]
+            graph_sorted.append(task)
+            downstream_ids = sorted(
+                (downstream_id for downstream_id in task.downstream_task_ids
+                 if downstream_id in task_positions),
+                key=task_positions.get)
+            for downstream_id in downstream_ids:
+                pending_upstream[downstream_id] -= 1
+                if pending_upstream[downstream_id] == 0:
+                    ready.append(downstream_id)
+
+        if len(graph_sorted) < len(self.task_dict):
+            raise AirflowException("A cyclic dependency occurred in dag: {}"
+                                   .format(self.dag_id))
 
-        # special case
-        if len(self.tasks) == 0:
-            return tuple(graph_sorted)
-
-        # Run until the unsorted graph is empty.
-        while graph_unsorted:
-            # Go through each of the node/edges pairs in the unsorted
-            # graph. If a set of edges doesn't contain any nodes that
-            # haven't been resolved, that is, that are still in the
-            # unsorted graph, remove the pair from the unsorted graph,
-            # and append it to the sorted graph. Note here that by using
-            # using the items() method for iterating, a copy of the
-            # unsorted graph is used, allowing us to modify the unsorted
-            # graph as we move through it. We also keep a flag for
-            # checking that that graph is acyclic, which is true if any
-            # nodes are resolved during each pass through the graph. If
-            # not, we need to bail out as the graph therefore can't be
-            # sorted.
-            acyclic = False
-            for node in list(graph_unsorted.values()):
-                for edge in node.upstream_list:
-                    if edge.task_id in graph_unsorted:
-                        break
-                # no edges in upstream tasks
-                else:
-                    acyclic = True
-                    del graph_unsorted[node.task_id]
-                    graph_sorted.append(node)
+        return tuple(graph_sorted)
+
+    def get_priority_weights(self):
+        """
+        Returns the total priority weight of every task of the DAG following its
+        ``weight_rule``, see ``BaseOperator.priority_weight_total``.
 
-            if not acyclic:
-                raise AirflowException("A cyclic dependency occurred in dag: {}"
-                                       .format(self.dag_id))
+        The weights of all the tasks are computed together in one pass over the
+        tasks in topological order and cached until tasks or relations are added
+        to the DAG. Call :meth:`clear_priority_weights` after changing the
+        ``priority_weight`` or ``weight_rule`` of a task of the DAG.
 
-        return tuple(graph_sorted)
+        :return: total priority weight for each task ID
+        :rtype: dict[str, int]
+        """
+        if self._priority_weights is None:
+            self._priority_weights = self._compute_priority_weights()
+        return self._priority_weights
+
+    def clear_priority_weights(self):
+        """
+        Clears the cached priority weights of the tasks of the DAG.
+        """
+        self._priority_weights = None
+
+    def _compute_priority_weights(self):
+        tasks = self.topological_sort()
+        weight_rules = {task.weight_rule for task in tasks}
+        task_positions = {task.task_id: i for i, task in enumerate(tasks)}
+        # Tasks of each priority weight as a bit mask of their positions, so
+        # that the weight of a set of relatives is summed per distinct weight
+        masks_by_weight = defaultdict(int)
+        for task in tasks:
+            masks_by_weight[task.priority_weight] |= 1 << task_positions[task.task_id]
+
+        def get_relative_masks(ordered_tasks, upstream):
+            # The relatives of a task are its direct relatives and their relatives,
+            # which come before it in ordered_tasks
+            relative_masks = {}
+            for task in ordered_tasks:
+                mask = 0
+                for relative_id in task.get_direct_relative_ids(upstream=upstream):
+                    if relative_id in task_positions:
+                        mask |= relative_masks[relative_id] | (1 << task_positions[relative_id])
+                relative_masks[task.task_id] = mask
+            return relative_masks
+
+        def sum_weights(mask):
+            return sum(weight * bin(mask & weight_mask).count('1')
+                       for weight, weight_mask in masks_by_weight.items())
+
+        downstream_masks = upstream_masks = critical_path_durations = None
+        if weight_rules - {WeightRule.ABSOLUTE, WeightRule.UPSTREAM, WeightRule.CRITICAL_PATH}:
+            downstream_masks = get_relative_masks(reversed(tasks), upstream=False)
+        if WeightRule.UPSTREAM in weight_rules:
+            upstream_masks = get_relative_masks(tasks, upstream=True)
+        if WeightRule.CRITICAL_PATH in weight_rules:
+            critical_path_durations = self._get_critical_path_durations(tasks)
+
+        weights = {}
+        for task in tasks:
+            if task.weight_rule == WeightRule.ABSOLUTE:
+                relatives_weight = 0
+            elif task.weight_rule == WeightRule.UPSTREAM:
+                relatives_weight = sum_weights(upstream_masks[task.task_id])
+            elif task.weight_rule == WeightRule.CRITICAL_PATH:
+                relatives_weight = int(round(critical_path_durations[task.task_id]))
+            else:
+                relatives_weight = sum_weights(downstream_masks[task.task_id])
+            weights[task.task_id] = task.priority_weight + relatives_weight
+        return weights
+
+    @provide_session
+    def _get_critical_path_durations(self, tasks, session=None):
+        """
+        Returns the expected number of seconds it takes to run each task and the
+        longest chain of tasks downstream of it, using the median duration of the
+        latest successful runs of each task. Tasks that never succeeded count as
+        taking no time.
+        """
+        expected_durations = {
+            task_id: task_duration.p50
+            for task_id, task_duration in TaskDuration.get_for_dag(
+                self.dag_id, session=session).items()
+        }
+        task_ids = {task.task_id for task in tasks}
+        durations = {}
+        for task in reversed(tasks):
+            durations[task.task_id] = expected_durations.get(task.task_id, 0.0) + max(
+                [durations[downstream_id] for downstream_id in task.downstream_task_ids
+                 if downstream_id in task_ids] or [0])
+        return durations
 
     @provide_session
     def set_dag_runs_state(
@@ -1209,6 +1292,8 @@ class DAG(BaseDag, LoggingMixin):
         result.user_defined_macros = self.user_defined_macros
         result.user_defined_filters = self.user_defined_filters
         result.params = self.params
+        # The copy may get other tasks, e.g. in sub_dag
+        result._priority_weights = None
         return result
 
     def sub_dag(self, task_regex, include_downstream=False,
@@ -1228,12 +1313,16 @@ class DAG(BaseDag, LoggingMixin):
 
         regex_match = [
             t for t in self.tasks if re.findall(task_regex, t.task_id)]
-        also_include = []
+        # The relatives found so far are shared between the matched tasks, so
+        # every task is only traversed once however many tasks matched
+        downstream_ids = set()
+        upstream_ids = set()
         for t in regex_match:
             if include_downstream:
-                also_include += t.get_flat_relatives(upstream=False)
+                t.get_flat_relative_ids(upstream=False, found_descendants=downstream_ids)
             if include_upstream:
-                also_include += t.get_flat_relatives(upstream=True)
+                t.get_flat_relative_ids(upstream=True, found_descendants=upstream_ids)
+        also_include = [self.task_dict[task_id] for task_id in downstream_ids | upstream_ids]
 
         # Compiling the unique list of tasks that made the cut
         # Make sure to not recursively deepcopy the dag while copying the task
@@ -1340,6 +1429,7 @@ class DAG(BaseDag, LoggingMixin):
         else:
             self.task_dict[task.task_id] = task
             task.dag = self
+            self._priority_weights = None
 
         self.task_count = len(self.task_dict)
 
@@ -1499,53 +1589,97 @@ class DAG(BaseDag, LoggingMixin):
         :type sync_time: datetime
         :return: None
         """
+        self.bulk_sync_to_db([self], owner=owner, sync_time=sync_time, session=session)
+
+    @classmethod
+    @provide_session
+    def bulk_sync_to_db(cls, dags, owner=None, sync_time=None, session=None):
+        """
+        Save attributes about a list of DAGs and their SubDAGs to the DB.
+        The existing DagModel rows and their tags are loaded with a single
+        query and all changes are written in one transaction.
+
+        :param dags: the DAG objects to save to the DB
+        :type dags: list[airflow.models.DAG]
+        :param owner: the owner to store for all DAGs, defaults to the owner
+            of each DAG. SubDAGs get the owner of their parent DAG.
+        :type owner: str
+        :param sync_time: The time that the DAGs should be marked as sync'ed
+        :type sync_time: datetime
+        :return: None
+        """
         from airflow.models.serialized_dag import SerializedDagModel
 
-        if owner is None:
-            owner = self.owner
+        if not dags:
+            return
         if sync_time is None:
             sync_time = timezone.utcnow()
 
-        orm_dag = session.query(
-            DagModel).filter(DagModel.dag_id == self.dag_id).first()
-        if not orm_dag:
-            orm_dag = DagModel(dag_id=self.dag_id)
-            if self.is_paused_upon_creation is not None:
-                orm_dag.is_paused = self.is_paused_upon_creation
-            self.log.info("Creating ORM DAG for %s", self.dag_id)
-            session.add(orm_dag)
-        if self.is_subdag:
-            orm_dag.is_subdag = True
-            orm_dag.fileloc = self.parent_dag.fileloc
-            orm_dag.root_dag_id = self.parent_dag.dag_id
-        else:
-            orm_dag.is_subdag = False
-            orm_dag.fileloc = self.fileloc
-        orm_dag.owners = owner
-        orm_dag.is_active = True
-        orm_dag.last_scheduler_run = sync_time
-        orm_dag.default_view = self._default_view
-        orm_dag.description = self.description
-        orm_dag.schedule_interval = self.schedule_interval
-        orm_dag.tags = self.get_dagtags(session=session)
+        dags_by_id = OrderedDict()
+        owners = {}
+        for dag in dags:
+            dags_by_id[dag.dag_id] = dag
+            owners.setdefault(dag.dag_id, owner or dag.owner)
+            for subdag in dag.subdags:
+                dags_by_id[subdag.dag_id] = subdag
+                owners[subdag.dag_id] = owner or dag.owner
+
+        orm_dags = {
+            orm_dag.dag_id: orm_dag
+            for orm_dag in session.query(DagModel)
+            .options(joinedload(DagModel.tags))
+            .filter(DagModel.dag_id.in_(dags_by_id.keys()))
+        }
+
+        for dag_id, dag in dags_by_id.items():
+            orm_dag = orm_dags.get(dag_id)
+            if not orm_dag:
+                orm_dag = DagModel(dag_id=dag_id)
+                if dag.is_paused_upon_creation is not None:
+                    orm_dag.is_paused = dag.is_paused_upon_creation
+                dag.log.info("Creating ORM DAG for %s", dag_id)
+                session.add(orm_dag)
+            if dag.is_subdag:
+                orm_dag.is_subdag = True
+                orm_dag.fileloc = dag.parent_dag.fileloc
+                orm_dag.root_dag_id = dag.parent_dag.dag_id
+            else:
+                orm_dag.is_subdag = False
+                orm_dag.fileloc = dag.fileloc
+            orm_dag.owners = owners[dag_id]
+            orm_dag.is_active = True
+            orm_dag.last_scheduler_run = sync_time
+            orm_dag.default_view = dag._default_view
+            orm_dag.description = dag.description
+            orm_dag.schedule_interval = dag.schedule_interval
+
+            tag_names = set(dag.tags or [])
+            for orm_tag in list(orm_dag.tags):
+                if orm_tag.name not in tag_names:
+                    orm_dag.tags.remove(orm_tag)
+            existing_tag_names = {orm_tag.name for orm_tag in orm_dag.tags}
+            for name in tag_names - existing_tag_names:
+                orm_dag.tags.append(DagTag(name=name, dag_id=dag_id))
 
         if conf.getboolean('core', 'store_dag_code', fallback=False):
-            DagCode.bulk_sync_to_db([orm_dag.fileloc])
+            DagCode.bulk_sync_to_db(
+                {dag.fileloc for dag in dags_by_id.values() if not dag.is_subdag},
+                session=session)
 
         session.commit()
 
-        for subdag in self.subdags:
-            subdag.sync_to_db(owner=owner, sync_time=sync_time, session=session)
-
         # Write DAGs to serialized_dag table in DB.
         # subdags are not written into serialized_dag, because they are not displayed
         # in the DAG list on UI. They are included in the serialized parent DAG.
-        if STORE_SERIALIZED_DAGS and not self.is_subdag:
-            SerializedDagModel.write_dag(
-                self,
-                min_update_interval=MIN_SERIALIZED_DAG_UPDATE_INTERVAL,
-                session=session
-            )
+        if STORE_SERIALIZED_DAGS:
+            for dag in dags_by_id.values():
+                if dag.is_subdag:
+                    continue
+                SerializedDagModel.write_dag(
+                    dag,
+                    min_update_interval=MIN_SERIALIZED_DAG_UPDATE_INTERVAL,
+                    session=session
+                )
 
     @provide_session
     def get_dagtags(self, session=None):
@@ -1656,33 +1790,35 @@ class DAG(BaseDag, LoggingMixin):
         # default of int is 0 which corresponds to CYCLE_NEW
         visit_map = defaultdict(int)
         for task_id in self.task_dict.keys():
-            # print('starting %s' % task_id)
             if visit_map[task_id] == DagBag.CYCLE_NEW:
                 self._test_cycle_helper(visit_map, task_id)
         return False
 
     def _test_cycle_helper(self, visit_map, task_id):
         """
-        Checks if a cycle exists from the input task using DFS traversal
+        Checks if a cycle exists from the input task using an iterative DFS
+        traversal, so that long chains of tasks do not hit the recursion limit.
         """
         from airflow.models.dagbag import DagBag  # Avoid circular imports
 
-        # print('Inspecting %s' % task_id)
-        if visit_map[task_id] == DagBag.CYCLE_DONE:
-            return False
-
         visit_map[task_id] = DagBag.CYCLE_IN_PROGRESS
-
-        task = self.task_dict[task_id]
-        for descendant_id in task.get_direct_relative_ids():
-            if visit_map[descendant_id] == DagBag.CYCLE_IN_PROGRESS:
-                msg = "Cycle detected in DAG. Faulty task: {0} to {1}".format(
-                    task_id, descendant_id)
-                raise AirflowDagCycleException(msg)
+        # each entry holds a task on the current path and its unvisited descendants
+        path = [(task_id, iter(self.task_dict[task_id].get_direct_relative_ids()))]
+        while path:
+            current_id, descendant_ids = path[-1]
+            for descendant_id in descendant_ids:
+                if visit_map[descendant_id] == DagBag.CYCLE_IN_PROGRESS:
+                    msg = "Cycle detected in DAG. Faulty task: {0} to {1}".format(
+                        current_id, descendant_id)
+                    raise AirflowDagCycleException(msg)
+                if visit_map[descendant_id] == DagBag.CYCLE_NEW:
+                    visit_map[descendant_id] = DagBag.CYCLE_IN_PROGRESS
+                    path.append((descendant_id, iter(
+                        self.task_dict[descendant_id].get_direct_relative_ids())))
+                    break
             else:
-                self._test_cycle_helper(visit_map, descendant_id)
-
-        visit_map[task_id] = DagBag.CYCLE_DONE
+                visit_map[current_id] = DagBag.CYCLE_DONE
+                path.pop()
 
     @classmethod
     def get_serialized_fields(cls):
@@ -1694,7 +1830,7 @@ class DAG(BaseDag, LoggingMixin):
                 'partial', '_old_context_manager_dags',
                 '_pickle_id', '_log', 'is_subdag', 'task_dict', 'template_searchpath',
                 'sla_miss_callback', 'on_success_callback', 'on_failure_callback',
-                'template_undefined', 'jinja_environment_kwargs'
+                'template_undefined', 'jinja_environment_kwargs', '_priority_weights'
             }
         return cls.__serialized_fields
 
@@ -1752,6 +1888,10 @@ class DagModel(Base):
     schedule_interval = Column(Interval)
     # Tags for view filter
     tags = relationship('DagTag', cascade='all,delete-orphan', backref=backref('dag'))
+    # Earliest time at which a task of the DAG can newly miss its SLA
+    next_sla_check = Column(UtcDateTime)
+    # Hash of the SLAs and schedule next_sla_check was computed for
+    sla_hash = Column(String(32))
 
     __table_args__ = (
         Index('idx_root_dag_id', root_dag_id, unique=False),
@@ -333,6 +333,7 @@ class DagBag(BaseDagBag, LoggingMixin):
                     ti.test_mode = self.UNIT_TEST_MODE
                     ti.handle_failure("{} detected as zombie".format(ti),
                                       ti.test_mode, ti.get_template_context())
+                    Stats.incr('zombies_killed')
                     self.log.info('Marked zombie job %s as %s', ti, ti.state)
         session.commit()
 
@@ -349,6 +350,8 @@ class DagBag(BaseDagBag, LoggingMixin):
 
         for task in dag.tasks:
             settings.policy(task)
+        # The policy may have changed the priority weights of the tasks
+        dag.clear_priority_weights()
 
         subdags = dag.subdags
 
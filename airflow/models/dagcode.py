@@ -19,11 +19,14 @@ import os
 import struct
 from datetime import datetime
 
+import six
+
 from sqlalchemy import BigInteger, Column, String, UnicodeText, and_, exists
 
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException, DagCodeNotFound
 from airflow.models import Base
+from airflow.settings import Stats
 from airflow.utils import timezone
 from airflow.utils.file import correct_maybe_zipped, open_maybe_zipped
 from airflow.utils.db import provide_session
@@ -41,6 +44,9 @@ class DagCode(Base):
     * ``[core] store_serialized_dags = True``: enable this feature
     * ``[core] store_dag_code = True``: enable this feature
 
+    The code of a file is only written again when the file was modified and
+    its content hash differs from the stored ``source_code_hash``.
+
     For details on dag serialization see SerializedDagModel
     """
     __tablename__ = 'dag_code'
@@ -51,12 +57,14 @@ class DagCode(Base):
     # The max length of fileloc exceeds the limit of indexing.
     last_updated = Column(UtcDateTime, nullable=False)
     source_code = Column(UnicodeText, nullable=False)
+    source_code_hash = Column(String(32), nullable=True)
 
     def __init__(self, full_filepath, source_code=None):
         self.fileloc = full_filepath
         self.fileloc_hash = DagCode.dag_fileloc_hash(self.fileloc)
         self.last_updated = timezone.utcnow()
         self.source_code = source_code or DagCode.code(self.fileloc)
+        self.source_code_hash = DagCode.dag_source_code_hash(self.source_code)
 
     @provide_session
     def sync_to_db(self, session=None):
@@ -78,21 +86,16 @@ class DagCode(Base):
         filelocs_to_hashes = {
             fileloc: DagCode.dag_fileloc_hash(fileloc) for fileloc in filelocs
         }
+        # The source code itself is not needed to decide whether it changed
         existing_orm_dag_codes = (
             session
-            .query(DagCode)
+            .query(DagCode.fileloc_hash, DagCode.fileloc,
+                   DagCode.last_updated, DagCode.source_code_hash)
             .filter(DagCode.fileloc_hash.in_(filelocs_to_hashes.values()))
             .with_for_update(of=DagCode)
             .all()
         )
 
-        if existing_orm_dag_codes:
-            existing_orm_dag_codes_map = {
-                orm_dag_code.fileloc: orm_dag_code for orm_dag_code in existing_orm_dag_codes
-            }
-        else:
-            existing_orm_dag_codes_map = dict()
-
         existing_orm_dag_codes_by_fileloc_hashes = {
             orm.fileloc_hash: orm for orm in existing_orm_dag_codes
         }
@@ -121,6 +124,7 @@ class DagCode(Base):
         for fileloc in missing_filelocs:
             orm_dag_code = DagCode(fileloc, cls._get_code_from_file(fileloc))
             session.add(orm_dag_code)
+            Stats.incr('dag_code.writes')
 
         for fileloc in existing_filelocs:
             current_version = existing_orm_dag_codes_by_fileloc_hashes[filelocs_to_hashes[fileloc]]
@@ -129,10 +133,28 @@ class DagCode(Base):
             )
 
             if file_mod_time > current_version.last_updated:
-                orm_dag_code = existing_orm_dag_codes_map[fileloc]
-                orm_dag_code.last_updated = file_mod_time
-                orm_dag_code.source_code = cls._get_code_from_file(orm_dag_code.fileloc)
-                session.merge(orm_dag_code)
+                source_code = cls._get_code_from_file(fileloc)
+                source_code_hash = cls.dag_source_code_hash(source_code)
+                if source_code_hash != current_version.source_code_hash:
+                    session.query(DagCode).filter(
+                        DagCode.fileloc_hash == current_version.fileloc_hash
+                    ).update({
+                        DagCode.last_updated: file_mod_time,
+                        DagCode.source_code: source_code,
+                        DagCode.source_code_hash: source_code_hash,
+                    }, synchronize_session=False)
+                    Stats.incr('dag_code.writes')
+                    continue
+
+                # The file was touched without changing the code; record the
+                # new modification time so it is not read and hashed again
+                session.query(DagCode).filter(
+                    DagCode.fileloc_hash == current_version.fileloc_hash
+                ).update({
+                    DagCode.last_updated: file_mod_time,
+                }, synchronize_session=False)
+
+            Stats.incr('dag_code.skipped_writes')
 
     @classmethod
     @provide_session
@@ -201,6 +223,18 @@ class DagCode(Base):
             code = dag_code.source_code
         return code
 
+    @staticmethod
+    def dag_source_code_hash(source_code):
+        """Hashing source code to detect changes without comparing it.
+
+        :param source_code: source code of a DAG file
+        :return: hex digest of the source code
+        """
+        import hashlib
+        if isinstance(source_code, six.text_type):
+            source_code = source_code.encode('utf-8')
+        return hashlib.md5(source_code).hexdigest()
+
     @staticmethod
     def dag_fileloc_hash(full_filepath):
         """"Hashing file location for indexing.
@@ -61,6 +61,7 @@ class DagRun(Base, LoggingMixin):
 
     __table_args__ = (
         Index('dag_id_state', dag_id, _state),
+        Index('dr_execution_date', execution_date, dag_id),
         UniqueConstraint('dag_id', 'execution_date'),
         UniqueConstraint('dag_id', 'run_id'),
     )
@@ -283,15 +284,16 @@ class DagRun(Base, LoggingMixin):
         if unfinished_tasks and none_depends_on_past and none_task_concurrency:
             # todo: this can actually get pretty slow: one task costs between 0.01-015s
             no_dependencies_met = True
+            dep_context = DepContext(
+                flag_upstream_failed=True,
+                ignore_in_retry_period=True,
+                ignore_in_reschedule_period=True)
             for ut in unfinished_tasks:
                 # We need to flag upstream and check for changes because upstream
                 # failures/re-schedules can result in deadlock false positives
                 old_state = ut.state
                 deps_met = ut.are_dependencies_met(
-                    dep_context=DepContext(
-                        flag_upstream_failed=True,
-                        ignore_in_retry_period=True,
-                        ignore_in_reschedule_period=True),
+                    dep_context=dep_context,
                     session=session)
                 if deps_met or old_state != ut.current_state(session=session):
                     no_dependencies_met = False
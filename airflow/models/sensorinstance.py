@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""SensorInstance stores sensor task instances handed over to the sensor service."""
+import hashlib
+import json
+
+from sqlalchemy import Boolean, Column, Float, ForeignKeyConstraint, Index, Integer, String, Text
+
+from airflow.models.base import Base, ID_LEN
+from airflow.utils import timezone
+from airflow.utils.sqlalchemy import UtcDateTime
+
+
+class SensorInstance(Base):
+    """
+    SensorInstance stores what a sensor task instance in the ``sensing`` state
+    pokes for, so that the sensor service can rebuild and poke the sensor
+    without parsing its DAG file. Sensors that poke for the same criteria
+    share the same ``hashcode``.
+    """
+
+    __tablename__ = "sensor_instance"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(String(ID_LEN), nullable=False)
+    dag_id = Column(String(ID_LEN), nullable=False)
+    execution_date = Column(UtcDateTime, nullable=False)
+    try_number = Column(Integer, nullable=False)
+    start_date = Column(UtcDateTime, nullable=False)
+    operator = Column(String(1000), nullable=False)
+    poke_context = Column(Text, nullable=False)
+    hashcode = Column(String(32), nullable=False)
+    poke_interval = Column(Float, nullable=False)
+    timeout = Column(Float, nullable=False)
+    soft_fail = Column(Boolean, nullable=False, default=False)
+    created_at = Column(UtcDateTime, nullable=False)
+    # When the execution_timeout of the task instance expires, if it has one
+    execution_deadline = Column(UtcDateTime)
+
+    __table_args__ = (
+        Index('si_dag_task_date', dag_id, task_id, execution_date, unique=True),
+        Index('si_hashcode', hashcode),
+        ForeignKeyConstraint([task_id, dag_id, execution_date],
+                             ['task_instance.task_id', 'task_instance.dag_id',
+                              'task_instance.execution_date'],
+                             name='sensor_instance_dag_task_date_fkey',
+                             ondelete='CASCADE')
+    )
+
+    def __init__(self, ti, sensor, poke_context, start_date, execution_deadline=None):
+        from airflow.serialization.serialized_objects import BaseSerialization
+
+        self.dag_id = ti.dag_id
+        self.task_id = ti.task_id
+        self.execution_date = ti.execution_date
+        self.try_number = ti.try_number
+        self.start_date = start_date
+        self.operator = self.get_classpath(sensor)
+        self.poke_context = json.dumps(BaseSerialization._serialize(poke_context),
+                                       sort_keys=True)
+        self.hashcode = hashlib.md5(
+            (self.operator + self.poke_context).encode('utf-8')).hexdigest()
+        self.poke_interval = sensor.poke_interval
+        self.timeout = sensor.timeout
+        self.soft_fail = sensor.soft_fail
+        self.created_at = timezone.utcnow()
+        self.execution_deadline = execution_deadline
+
+    def __repr__(self):
+        return '<SensorInstance: {}.{} {} [{}]>'.format(
+            self.dag_id, self.task_id, self.execution_date, self.operator)
+
+    @staticmethod
+    def get_classpath(obj):
+        """
+        Returns the full import path of the class of ``obj``.
+        """
+        return '{}.{}'.format(obj.__class__.__module__, obj.__class__.__name__)
+
+    def get_poke_context(self):
+        """
+        Returns the poke context of the sensor with the values it was
+        registered with.
+
+        :rtype: dict
+        """
+        from airflow.serialization.serialized_objects import BaseSerialization
+
+        return BaseSerialization._deserialize(json.loads(self.poke_context))
@@ -19,18 +19,21 @@
 
 """Serialzed DAG table in database."""
 
+import hashlib
+import zlib
 from datetime import timedelta
 from typing import Any, Optional
 
 import sqlalchemy_jsonfield
-from sqlalchemy import BigInteger, Column, Index, String, and_
+from sqlalchemy import BigInteger, Column, Index, LargeBinary, String, and_
 from sqlalchemy.sql import exists
 
+from airflow.configuration import conf
 from airflow.models.base import ID_LEN, Base
 from airflow.models.dag import DAG
 from airflow.models.dagcode import DagCode
 from airflow.serialization.serialized_objects import SerializedDAG
-from airflow.settings import json
+from airflow.settings import Stats, json
 from airflow.utils import db, timezone
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.sqlalchemy import UtcDateTime
@@ -49,6 +52,10 @@ class SerializedDagModel(Base):
     * ``[core] min_serialized_dag_update_interval = 30`` (s):
       serialized DAGs are updated in DB when a file gets processed by scheduler,
       to reduce DB write rate, there is a minimal interval of updating serialized DAGs.
+      A DAG whose serialized form has the same ``dag_hash`` as the stored one is not
+      written again.
+    * ``[core] compress_serialized_dags = False``: store the serialized DAG
+      zlib-compressed in ``data_compressed`` instead of as JSON in ``data``
     * ``[scheduler] dag_dir_list_interval = 300`` (s):
       interval of deleting serialized DAGs in DB when the files are deleted, suggest
       to use a smaller interval such as 60
@@ -63,8 +70,10 @@ class SerializedDagModel(Base):
     fileloc = Column(String(2000), nullable=False)
     # The max length of fileloc exceeds the limit of indexing.
     fileloc_hash = Column(BigInteger, nullable=False)
-    data = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=False)
+    data = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=True)
+    data_compressed = Column(LargeBinary, nullable=True)
     last_updated = Column(UtcDateTime, nullable=False)
+    dag_hash = Column(String(32), nullable=True)
 
     __table_args__ = (
         Index('idx_fileloc_hash', fileloc_hash, unique=False),
@@ -74,9 +83,18 @@ class SerializedDagModel(Base):
         self.dag_id = dag.dag_id
         self.fileloc = dag.full_filepath
         self.fileloc_hash = DagCode.dag_fileloc_hash(self.fileloc)
-        self.data = SerializedDAG.to_dict(dag)
         self.last_updated = timezone.utcnow()
 
+        dag_data = SerializedDAG.to_dict(dag)
+        dag_data_json = json.dumps(dag_data, sort_keys=True).encode('utf-8')
+        self.dag_hash = hashlib.md5(dag_data_json).hexdigest()
+        if conf.getboolean('core', 'compress_serialized_dags', fallback=False):
+            self.data = None
+            self.data_compressed = zlib.compress(dag_data_json)
+        else:
+            self.data = dag_data
+            self.data_compressed = None
+
     @classmethod
     @db.provide_session
     def write_dag(cls,
@@ -84,10 +102,14 @@ class SerializedDagModel(Base):
                   min_update_interval=None,   # type: Optional[int]
                   session=None):
         """Serializes a DAG and writes it into database.
+        If the serialized DAG has not changed since it was last written, it is not
+        written again.
 
         :param dag: a DAG to be written into database
         :param min_update_interval: minimal interval in seconds to update serialized DAG
         :param session: ORM Session
+        :returns: whether the DAG was written
+        :rtype: bool
         """
         log.debug("Writing DAG: %s to the DB", dag)
         # Checks if (Current Time - Time when the DAG was written to DB) < min_update_interval
@@ -98,11 +120,21 @@ class SerializedDagModel(Base):
                 and_(cls.dag_id == dag.dag_id,
                      (timezone.utcnow() - timedelta(seconds=min_update_interval)) < cls.last_updated))
             ).scalar():
-                return
+                Stats.incr('serialized_dag.skipped_writes')
+                return False
+
+        new_serialized_dag = cls(dag)
+        stored_dag_hash = session.query(cls.dag_hash).filter(cls.dag_id == dag.dag_id).scalar()
+        if stored_dag_hash == new_serialized_dag.dag_hash:
+            log.debug("Serialized DAG: %s is unchanged, skipping writing to the DB", dag.dag_id)
+            Stats.incr('serialized_dag.skipped_writes')
+            return False
 
         log.debug("Writing DAG: %s to the DB", dag.dag_id)
-        session.merge(cls(dag))
+        session.merge(new_serialized_dag)
         log.debug("DAG: %s written to the DB", dag.dag_id)
+        Stats.incr('serialized_dag.writes')
+        return True
 
     @classmethod
     @db.provide_session
@@ -130,8 +162,11 @@ class SerializedDagModel(Base):
 
     @property
     def dag(self):
-        """The DAG deserialized from the ``data`` column"""
-        if isinstance(self.data, dict):
+        """The DAG deserialized from the ``data`` or ``data_compressed`` column"""
+        if self.data_compressed is not None:
+            dag = SerializedDAG.from_dict(
+                json.loads(zlib.decompress(self.data_compressed).decode('utf-8')))
+        elif isinstance(self.data, dict):
             dag = SerializedDAG.from_dict(self.data)  # type: Any
         else:
             # noinspection PyTypeChecker
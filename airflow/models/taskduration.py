@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""TaskDuration keeps rolling statistics of the durations of each task."""
+import json
+import math
+
+from sqlalchemy import Column, Float, String, Text
+from sqlalchemy.exc import IntegrityError
+
+from airflow.configuration import conf
+from airflow.models.base import Base, ID_LEN
+from airflow.utils import timezone
+from airflow.utils.db import provide_session
+from airflow.utils.sqlalchemy import UtcDateTime
+
+
+class TaskDuration(Base):
+    """
+    TaskDuration keeps the durations of the latest successful task instances of
+    a task, up to ``[scheduler] task_duration_history_size`` of them, and their
+    50th and 95th percentiles. It is updated when a task instance succeeds, so
+    the expected duration of a task is known without scanning its history.
+    """
+
+    __tablename__ = "task_duration"
+
+    dag_id = Column(String(ID_LEN), primary_key=True)
+    task_id = Column(String(ID_LEN), primary_key=True)
+    # JSON list of the latest durations in seconds, the oldest first
+    durations = Column(Text, nullable=False)
+    p50 = Column(Float, nullable=False)
+    p95 = Column(Float, nullable=False)
+    updated_at = Column(UtcDateTime, nullable=False)
+
+    def __init__(self, dag_id, task_id):
+        self.dag_id = dag_id
+        self.task_id = task_id
+        self.set_durations([])
+
+    def __repr__(self):
+        return '<TaskDuration: {}.{} p50={} p95={}>'.format(
+            self.dag_id, self.task_id, self.p50, self.p95)
+
+    def get_durations(self):
+        """
+        Returns the latest durations of the task in seconds, the oldest first.
+
+        :rtype: list[float]
+        """
+        return json.loads(self.durations)
+
+    def set_durations(self, durations):
+        """
+        Keeps the latest ``durations`` and updates the percentiles.
+
+        :param durations: durations in seconds, the oldest first
+        :type durations: list[float]
+        """
+        durations = durations[-conf.getint('scheduler', 'task_duration_history_size'):]
+        self.durations = json.dumps(durations)
+        self.p50 = self.percentile(durations, 50)
+        self.p95 = self.percentile(durations, 95)
+        self.updated_at = timezone.utcnow()
+
+    @staticmethod
+    def percentile(values, percent):
+        """
+        Returns the nearest-rank ``percent`` percentile of ``values``, 0 for
+        no values.
+        """
+        if not values:
+            return 0.0
+        values = sorted(values)
+        return float(values[max(int(math.ceil(percent / 100.0 * len(values))), 1) - 1])
+
+    @classmethod
+    @provide_session
+    def record(cls, task_instance, session=None):
+        """
+        Adds the duration of a successful task instance to the history of its
+        task. The row of the task is locked until the session is committed.
+
+        :param task_instance: the task instance that succeeded
+        :type task_instance: airflow.models.TaskInstance
+        """
+        if task_instance.duration is None:
+            return
+        query = (
+            session
+            .query(cls)
+            .filter(cls.dag_id == task_instance.dag_id,
+                    cls.task_id == task_instance.task_id)
+            .with_for_update()
+        )
+        task_duration = query.first()
+        if task_duration is None:
+            try:
+                # In a savepoint, so that losing the race against another task
+                # instance of the task inserting the row does not roll back
+                # the caller's transaction
+                with session.begin_nested():
+                    session.add(cls(task_instance.dag_id, task_instance.task_id))
+            except IntegrityError:
+                pass
+            task_duration = query.one()
+        task_duration.set_durations(
+            task_duration.get_durations() + [float(task_instance.duration)])
+        session.flush()
+
+    @classmethod
+    @provide_session
+    def get_for_dag(cls, dag_id, session=None):
+        """
+        Returns the duration statistics of every task of a DAG that succeeded
+        at least once.
+
+        :param dag_id: the DAG ID
+        :type dag_id: str
+        :rtype: dict[str, TaskDuration]
+        """
+        return {
+            task_duration.task_id: task_duration
+            for task_duration in session.query(cls).filter(cls.dag_id == dag_id)
+        }
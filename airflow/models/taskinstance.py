@@ -18,7 +18,6 @@
 # under the License.
 
 import copy
-import functools
 import getpass
 import hashlib
 import logging
@@ -43,11 +42,13 @@ from sqlalchemy.orm.session import Session
 from airflow import settings
 from airflow.configuration import conf
 from airflow.exceptions import (
-    AirflowException, AirflowTaskTimeout, AirflowSkipException, AirflowRescheduleException
+    AirflowException, AirflowTaskTimeout, AirflowSkipException, AirflowRescheduleException,
+    AirflowSensingException
 )
 from airflow.models.base import Base, ID_LEN
 from airflow.models.log import Log
 from airflow.models.pool import Pool
+from airflow.models.taskduration import TaskDuration
 from airflow.models.taskfail import TaskFail
 from airflow.models.taskreschedule import TaskReschedule
 from airflow.models.variable import Variable
@@ -59,7 +60,7 @@ from airflow.settings import STORE_SERIALIZED_DAGS
 from airflow.utils import timezone
 from airflow.utils.db import provide_session
 from airflow.utils.email import send_email
-from airflow.utils.helpers import is_container
+from airflow.utils.helpers import get_template_from_string, is_container
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.net import get_hostname
 from airflow.utils.sqlalchemy import UtcDateTime
@@ -173,6 +174,7 @@ class TaskInstance(Base, LoggingMixin):
         Index('ti_state_lkp', dag_id, task_id, execution_date, state),
         Index('ti_pool', pool, state, priority_weight),
         Index('ti_job_id', job_id),
+        Index('ti_execution_date', execution_date, dag_id, task_id),
     )
 
     def __init__(self, task, execution_date, state=None):
@@ -590,22 +592,28 @@ class TaskInstance(Base, LoggingMixin):
 
                 return TaskInstance(task=self.task, execution_date=previous_scheduled_date)
 
-            dr.dag = dag
-
-            # We always ignore schedule in dagrun lookup when `state` is given or `schedule_interval is None`.
-            # For legacy reasons, when `catchup=True`, we use `get_previous_scheduled_dagrun` unless
-            # `ignore_schedule` is `True`.
-            ignore_schedule = state is not None or dag.schedule_interval is None
-            if dag.catchup is True and not ignore_schedule:
-                last_dagrun = dr.get_previous_scheduled_dagrun(session=session)
-            else:
-                last_dagrun = dr.get_previous_dagrun(session=session, state=state)
-
+            last_dagrun = self._get_previous_dagrun(dr, state=state, session=session)
             if last_dagrun:
                 return last_dagrun.get_task_instance(self.task_id, session=session)
 
         return None
 
+    def _get_previous_dagrun(self, dagrun, state=None, session=None):
+        """
+        Returns the DAG run before ``dagrun``, the DAG run of this task instance,
+        that holds the previous task instance of this task instance.
+        """
+        dag = self.task.dag
+        dagrun.dag = dag
+
+        # We always ignore schedule in dagrun lookup when `state` is given or `schedule_interval is None`.
+        # For legacy reasons, when `catchup=True`, we use `get_previous_scheduled_dagrun` unless
+        # `ignore_schedule` is `True`.
+        ignore_schedule = state is not None or dag.schedule_interval is None
+        if dag.catchup is True and not ignore_schedule:
+            return dagrun.get_previous_scheduled_dagrun(session=session)
+        return dagrun.get_previous_dagrun(session=session, state=state)
+
     @property
     def previous_ti(self):  # type: () -> Optional['TaskInstance']
         """The task instance for the task that ran before this task instance."""
@@ -647,7 +655,8 @@ class TaskInstance(Base, LoggingMixin):
         :param session: database session
         :type session: sqlalchemy.orm.session.Session
         :param verbose: whether log details on failed dependencies on
-            info or debug log level
+            info or debug log level. Unless verbose, the dependencies are only
+            evaluated until the first one that is not met.
         :type verbose: bool
         """
         dep_context = dep_context or DepContext()
@@ -662,6 +671,8 @@ class TaskInstance(Base, LoggingMixin):
                 "Dependencies not met for %s, dependency '%s' FAILED: %s",
                 self, dep_status.dep_name, dep_status.reason
             )
+            if not verbose:
+                break
 
         if failed:
             return False
@@ -674,12 +685,20 @@ class TaskInstance(Base, LoggingMixin):
             self,
             dep_context=None,
             session=None):
+        """
+        Yields the statuses of the dependencies of ``dep_context`` that are not met,
+        evaluating the cheapest dependencies first.
+        """
         dep_context = dep_context or DepContext()
-        for dep in dep_context.deps | self.task.deps:
-            for dep_status in dep.get_dep_statuses(
-                    self,
-                    session,
-                    dep_context):
+        deps = dep_context.deps
+        if dep_context.include_task_deps:
+            deps = deps | self.task.deps
+        for dep in sorted(deps, key=lambda dep: (dep.COST, dep.name)):
+            start_time = time.time()
+            dep_statuses = list(dep.get_dep_statuses(self, session, dep_context))
+            Stats.timing('ti_deps.{}'.format(dep.__class__.__name__),
+                         (time.time() - start_time) * 1000)
+            for dep_status in dep_statuses:
 
                 self.log.debug(
                     "%s dependency '%s' PASSED: %s, %s",
@@ -757,6 +776,38 @@ class TaskInstance(Base, LoggingMixin):
 
         return open_slots <= 0
 
+    @provide_session
+    def get_predicted_end_dates(self, session=None):
+        """
+        Returns when the task instance is expected to finish, typically and in the
+        worst case, from the 50th and 95th percentiles of the durations of the
+        latest successful runs of its task. A task instance that runs for longer
+        than expected is expected to finish now.
+
+        :param session: database session
+        :type session: sqlalchemy.orm.session.Session
+        :return: the typical and the worst case end dates, the actual end date
+            twice if the task instance finished, or None if it is not running
+            or its task never succeeded
+        :rtype: tuple[datetime.datetime, datetime.datetime] or None
+        """
+        if self.state in State.finished() and self.end_date:
+            return self.end_date, self.end_date
+        if (self.state not in {State.RUNNING, State.UP_FOR_RESCHEDULE, State.SENSING} or
+                not self.start_date):
+            return None
+
+        task_duration = session.query(TaskDuration).filter(
+            TaskDuration.dag_id == self.dag_id,
+            TaskDuration.task_id == self.task_id,
+        ).first()
+        if task_duration is None:
+            return None
+        now = timezone.utcnow()
+        return tuple(
+            max(now, self.start_date + timedelta(seconds=duration))
+            for duration in (task_duration.p50, task_duration.p95))
+
     @provide_session
     def get_dagrun(self, session):
         """
@@ -845,19 +896,22 @@ class TaskInstance(Base, LoggingMixin):
             # Set the task start date. In case it was re-scheduled use the initial
             # start date that is recorded in task_reschedule table
             self.start_date = timezone.utcnow()
-            task_reschedules = TaskReschedule.find_for_task_instance(self, session)
-            if task_reschedules:
-                self.start_date = task_reschedules[0].start_date
+            first_reschedule = TaskReschedule.query_for_task_instance(
+                self, session=session).first()
+            if first_reschedule:
+                self.start_date = first_reschedule.start_date
 
             # Secondly we find non-runnable but requeueable tis. We reset its state.
             # This is because we might have hit concurrency limits,
-            # e.g. because of backfilling.
+            # e.g. because of backfilling. The task dependencies were
+            # evaluated above already.
             dep_context = DepContext(
                 deps=REQUEUEABLE_DEPS,
                 ignore_all_deps=ignore_all_deps,
                 ignore_depends_on_past=ignore_depends_on_past,
                 ignore_task_deps=ignore_task_deps,
-                ignore_ti_state=ignore_ti_state)
+                ignore_ti_state=ignore_ti_state,
+                include_task_deps=False)
             if not self.are_dependencies_met(
                     dep_context=dep_context,
                     session=session,
@@ -1026,6 +1080,10 @@ class TaskInstance(Base, LoggingMixin):
             self.refresh_from_db()
             self._handle_reschedule(actual_start_date, reschedule_exception, test_mode, context)
             return
+        except AirflowSensingException as sensing_exception:
+            self.refresh_from_db()
+            self._handle_sensing(sensing_exception, actual_start_date)
+            return
         except AirflowException as e:
             self.refresh_from_db()
             # for case when task is marked as success/failed externally
@@ -1067,6 +1125,8 @@ class TaskInstance(Base, LoggingMixin):
         if not test_mode:
             session.add(Log(self.state, self))
             session.merge(self)
+            if self.state == State.SUCCESS:
+                TaskDuration.record(self, session=session)
         session.commit()
 
     @provide_session
@@ -1135,6 +1195,31 @@ class TaskInstance(Base, LoggingMixin):
         session.commit()
         self.log.info('Rescheduling task, marking task as UP_FOR_RESCHEDULE')
 
+    @provide_session
+    def _handle_sensing(self, sensing_exception, actual_start_date, session=None):
+        from airflow.models.sensorinstance import SensorInstance
+
+        # The execution_timeout of the task keeps running in the sensor service
+        execution_deadline = None
+        if self.task.execution_timeout:
+            execution_deadline = actual_start_date + self.task.execution_timeout
+
+        # Replace the sensor instance of an earlier try
+        session.query(SensorInstance).filter(
+            SensorInstance.dag_id == self.dag_id,
+            SensorInstance.task_id == self.task_id,
+            SensorInstance.execution_date == self.execution_date,
+        ).delete(synchronize_session=False)
+        session.add(SensorInstance(self, self.task, sensing_exception.poke_context,
+                                   sensing_exception.started_at, execution_deadline))
+
+        # The task instance and its sensor instance are committed together,
+        # so the sensor service never sees one without the other
+        self.state = State.SENSING
+        session.merge(self)
+        session.commit()
+        self.log.info('Handing task over to the sensor service, marking task as SENSING')
+
     @provide_session
     def handle_failure(self, error, test_mode=None, context=None, session=None):
         if test_mode is None:
@@ -1420,10 +1505,16 @@ class TaskInstance(Base, LoggingMixin):
 
     def render_templates(self, context=None):
         """Render templates in the operator fields."""
+        start_dttm = timezone.utcnow()
         if not context:
             context = self.get_template_context()
 
         self.task.render_template_fields(context)
+        Stats.timing(
+            'dag.{dag_id}.{task_id}.render_templates'.format(
+                dag_id=self.dag_id,
+                task_id=self.task_id),
+            timezone.utcnow() - start_dttm)
 
     def email_alert(self, exception):
         exception_html = str(exception).replace('\n', '<br>')
@@ -1466,7 +1557,7 @@ class TaskInstance(Base, LoggingMixin):
                 with open(path) as f:
                     content = f.read()
 
-            return jinja_env.from_string(content).render(**jinja_context)
+            return get_template_from_string(jinja_env, content).render(**jinja_context)
 
         subject = render('subject_template', default_subject)
         html_content = render('html_content_template', default_html_content)
@@ -1553,17 +1644,22 @@ class TaskInstance(Base, LoggingMixin):
         if dag_id is None:
             dag_id = self.dag_id
 
-        pull_fn = functools.partial(
-            XCom.get_one,
-            execution_date=self.execution_date,
-            key=key,
-            dag_id=dag_id,
-            include_prior_dates=include_prior_dates)
-
         if is_container(task_ids):
-            return tuple(pull_fn(task_id=t) for t in task_ids)
+            # Fetch the values of all tasks at once rather than one query per task
+            values = XCom.get_latest_by_task_id(
+                execution_date=self.execution_date,
+                task_ids=task_ids,
+                key=key,
+                dag_id=dag_id,
+                include_prior_dates=include_prior_dates)
+            return tuple(values.get(t) for t in task_ids)
         else:
-            return pull_fn(task_id=task_ids)
+            return XCom.get_one(
+                execution_date=self.execution_date,
+                key=key,
+                task_id=task_ids,
+                dag_id=dag_id,
+                include_prior_dates=include_prior_dates)
 
     @provide_session
     def get_num_running_task_instances(self, session):
@@ -17,7 +17,7 @@
 # specific language governing permissions and limitations
 # under the License.
 """TaskReschedule tracks rescheduled task instances."""
-from sqlalchemy import Column, ForeignKeyConstraint, Index, Integer, String, asc
+from sqlalchemy import Column, ForeignKeyConstraint, Index, Integer, String, asc, desc, func
 
 from airflow.models.base import Base, ID_LEN
 from airflow.utils.db import provide_session
@@ -64,13 +64,16 @@ class TaskReschedule(Base):
 
     @staticmethod
     @provide_session
-    def find_for_task_instance(task_instance, session):
+    def query_for_task_instance(task_instance, descending=False, session=None):
         """
-        Returns all task reschedules for the task instance and try number,
-        in ascending order.
+        Returns a query for the task reschedules of the task instance and try
+        number. Use ``.first()`` on it when only the first, or with
+        ``descending`` the latest, reschedule is needed.
 
         :param task_instance: the task instance to find task reschedules for
         :type task_instance: airflow.models.TaskInstance
+        :param descending: if True then the latest reschedule comes first
+        :type descending: bool
         """
         TR = TaskReschedule
         return (
@@ -80,6 +83,48 @@ class TaskReschedule(Base):
                     TR.task_id == task_instance.task_id,
                     TR.execution_date == task_instance.execution_date,
                     TR.try_number == task_instance.try_number)
-            .order_by(asc(TR.id))
-            .all()
+            .order_by(desc(TR.id) if descending else asc(TR.id))
+        )
+
+    @staticmethod
+    @provide_session
+    def find_for_task_instance(task_instance, session):
+        """
+        Returns all task reschedules for the task instance and try number,
+        in ascending order.
+
+        :param task_instance: the task instance to find task reschedules for
+        :type task_instance: airflow.models.TaskInstance
+        """
+        return TaskReschedule.query_for_task_instance(task_instance, session=session).all()
+
+    @staticmethod
+    @provide_session
+    def find_latest_reschedule_dates(dag_id, execution_date, session=None):
+        """
+        Returns the reschedule date of the latest task reschedule of every task
+        and try number of a DAG run, loaded with a single query.
+
+        :param dag_id: the DAG ID of the DAG run
+        :type dag_id: str
+        :param execution_date: the execution date of the DAG run
+        :type execution_date: datetime.datetime
+        :return: the latest reschedule date for each ``(task_id, try_number)``
+        :rtype: dict
+        """
+        TR = TaskReschedule
+        latest_ids = (
+            session
+            .query(func.max(TR.id))
+            .filter(TR.dag_id == dag_id,
+                    TR.execution_date == execution_date)
+            .group_by(TR.task_id, TR.try_number)
         )
+        return {
+            (task_id, try_number): reschedule_date
+            for task_id, try_number, reschedule_date in (
+                session
+                .query(TR.task_id, TR.try_number, TR.reschedule_date)
+                .filter(TR.id.in_(latest_ids))
+            )
+        }
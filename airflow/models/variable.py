@@ -29,7 +29,7 @@ from airflow.models.base import ID_LEN, Base
 from airflow.models.crypto import get_fernet, InvalidFernetToken
 from airflow.utils.db import provide_session
 from airflow.utils.log.logging_mixin import LoggingMixin
-from airflow.secrets import get_variable
+from airflow.secrets import get_variable, invalidate_secrets_cache
 
 
 class Variable(Base, LoggingMixin):
@@ -140,11 +140,13 @@ class Variable(Base, LoggingMixin):
         Variable.delete(key, session=session)
         session.add(Variable(key=key, val=stored_value))  # type: ignore
         session.flush()
+        invalidate_secrets_cache(variable_key=key)
 
     @classmethod
     @provide_session
     def delete(cls, key, session=None):
         session.query(cls).filter(cls.key == key).delete()
+        invalidate_secrets_cache(variable_key=key)
 
     def rotate_fernet_key(self):
         fernet = get_fernet()
@@ -20,15 +20,16 @@
 import json
 import pickle
 
-from sqlalchemy import Column, Integer, String, Index, LargeBinary, and_
+from sqlalchemy import Column, Integer, String, Index, LargeBinary, and_, func
 from sqlalchemy.orm import reconstructor
 
 from airflow.configuration import conf
 from airflow.models.base import Base, ID_LEN
 from airflow.utils import timezone
 from airflow.utils.db import provide_session
-from airflow.utils.helpers import as_tuple
+from airflow.utils.helpers import as_tuple, query_chunks
 from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.module_loading import import_string
 from airflow.utils.sqlalchemy import UtcDateTime
 
 
@@ -38,9 +39,13 @@ MAX_XCOM_SIZE = 49344
 XCOM_RETURN_KEY = 'return_value'
 
 
-class XCom(Base, LoggingMixin):
+class BaseXCom(Base, LoggingMixin):
     """
     Base class for XCom objects.
+
+    Custom XCom backends subclass it and override :meth:`serialize_value`
+    and :meth:`deserialize_value` to control how values are stored; they are
+    enabled with the ``[core] xcom_backend`` option.
     """
     __tablename__ = "xcom"
 
@@ -65,17 +70,13 @@ class XCom(Base, LoggingMixin):
     """
     @reconstructor
     def init_on_load(self):
-        enable_pickling = conf.getboolean('core', 'enable_xcom_pickling')
-        if enable_pickling:
+        try:
+            self.value = self.deserialize_value(self)
+        except (UnicodeEncodeError, ValueError):
+            # For backward-compatibility.
+            # Preventing errors in webserver
+            # due to XComs mixed with pickled and unpickled.
             self.value = pickle.loads(self.value)
-        else:
-            try:
-                self.value = json.loads(self.value.decode('UTF-8'))
-            except (UnicodeEncodeError, ValueError):
-                # For backward-compatibility.
-                # Preventing errors in webserver
-                # due to XComs mixed with pickled and unpickled.
-                self.value = pickle.loads(self.value)
 
     def __repr__(self):
         return '<XCom "{key}" ({task_id} @ {execution_date})>'.format(
@@ -98,26 +99,54 @@ class XCom(Base, LoggingMixin):
 
         :return: None
         """
-        session.expunge_all()
+        cls.set_many({key: value},
+                     execution_date=execution_date,
+                     task_id=task_id,
+                     dag_id=dag_id,
+                     session=session)
+
+    @classmethod
+    @provide_session
+    def set_many(
+            cls,
+            values,
+            execution_date,
+            task_id,
+            dag_id,
+            session=None):
+        """
+        Store several XCom values of a task instance in a single transaction,
+        replacing any XComs previously stored under the same keys.
+
+        :param values: mapping of XCom keys to the values to store
+        :type values: dict
+        :return: None
+        """
+        if not values:
+            return
 
-        value = XCom.serialize_value(value)
+        xcoms = [
+            cls(key=key,
+                value=cls.serialize_value(value,
+                                          key=key,
+                                          task_id=task_id,
+                                          dag_id=dag_id,
+                                          execution_date=execution_date),
+                execution_date=execution_date,
+                task_id=task_id,
+                dag_id=dag_id)
+            for key, value in values.items()
+        ]
 
         # remove any duplicate XComs
         session.query(cls).filter(
-            cls.key == key,
+            cls.key.in_(list(values)),
             cls.execution_date == execution_date,
             cls.task_id == task_id,
-            cls.dag_id == dag_id).delete()
+            cls.dag_id == dag_id).delete(synchronize_session=False)
 
-        session.commit()
-
-        # insert new XCom
-        session.add(XCom(
-            key=key,
-            value=value,
-            execution_date=execution_date,
-            task_id=task_id,
-            dag_id=dag_id))
+        # insert new XComs
+        session.add_all(xcoms)
 
         session.commit()
 
@@ -155,19 +184,58 @@ class XCom(Base, LoggingMixin):
 
         result = query.first()
         if result:
-            enable_pickling = conf.getboolean('core', 'enable_xcom_pickling')
-            if enable_pickling:
-                return pickle.loads(result.value)
-            else:
-                try:
-                    return json.loads(result.value.decode('UTF-8'))
-                except ValueError:
-                    log = LoggingMixin().log
-                    log.error("Could not deserialize the XCOM value from JSON. "
-                              "If you are using pickles instead of JSON "
-                              "for XCOM, then you need to enable pickle "
-                              "support for XCOM in your airflow config.")
-                    raise
+            return cls.deserialize_value(result)
+
+    @classmethod
+    @provide_session
+    def get_latest_by_task_id(cls,
+                              execution_date,
+                              task_ids,
+                              key=None,
+                              dag_id=None,
+                              include_prior_dates=False,
+                              session=None):
+        """
+        Retrieve the value :meth:`get_one` would return for each of ``task_ids``
+        using a constant number of queries. The candidate rows are looked up
+        without their values, and only at the latest matching execution date
+        of every task, so only the value of the most recent XCom of every task
+        is loaded and deserialized.
+
+        :return: dict mapping the task ids that have a matching XCom to its value
+        """
+        filters = []
+        if key:
+            filters.append(cls.key == key)
+        if dag_id:
+            filters.append(cls.dag_id == dag_id)
+        if include_prior_dates:
+            filters.append(cls.execution_date <= execution_date)
+        else:
+            filters.append(cls.execution_date == execution_date)
+
+        latest_ids = {}
+        for task_ids_chunk in query_chunks(sorted(set(task_ids))):
+            chunk_filters = [cls.task_id.in_(task_ids_chunk)] + filters
+            query = session.query(cls.id, cls.task_id).filter(*chunk_filters)
+            if include_prior_dates:
+                latest_dates = (
+                    session.query(cls.task_id,
+                                  func.max(cls.execution_date).label('execution_date'))
+                           .filter(*chunk_filters)
+                           .group_by(cls.task_id)
+                           .subquery())
+                query = query.join(latest_dates, and_(
+                    cls.task_id == latest_dates.c.task_id,
+                    cls.execution_date == latest_dates.c.execution_date))
+            for xcom_id, task_id in query.order_by(cls.timestamp.desc()):
+                latest_ids.setdefault(task_id, xcom_id)
+
+        values = {}
+        for ids_chunk in query_chunks(list(latest_ids.values())):
+            for result in session.query(cls.id, cls.value).filter(cls.id.in_(ids_chunk)):
+                values[result.id] = cls.deserialize_value(result)
+        return {task_id: values[xcom_id] for task_id, xcom_id in latest_ids.items()}
 
     @classmethod
     @provide_session
@@ -206,10 +274,10 @@ class XCom(Base, LoggingMixin):
     @classmethod
     @provide_session
     def delete(cls, xcoms, session=None):
-        if isinstance(xcoms, XCom):
+        if isinstance(xcoms, BaseXCom):
             xcoms = [xcoms]
         for xcom in xcoms:
-            if not isinstance(xcom, XCom):
+            if not isinstance(xcom, BaseXCom):
                 raise TypeError(
                     'Expected XCom; received {}'.format(xcom.__class__.__name__)
                 )
@@ -217,7 +285,11 @@ class XCom(Base, LoggingMixin):
         session.commit()
 
     @staticmethod
-    def serialize_value(value):
+    def serialize_value(value, key=None, task_id=None, dag_id=None, execution_date=None):
+        """
+        Serializes ``value`` into the bytes stored in the ``value`` column.
+        The remaining arguments identify the XCom being stored.
+        """
         # TODO: "pickling" has been deprecated and JSON is preferred.
         # "pickling" will be removed in Airflow 2.0.
         if conf.getboolean('core', 'enable_xcom_pickling'):
@@ -232,3 +304,41 @@ class XCom(Base, LoggingMixin):
                       "for XCOM, then you need to enable pickle "
                       "support for XCOM in your airflow config.")
             raise
+
+    @staticmethod
+    def deserialize_value(result):
+        """
+        Deserializes the ``value`` column of ``result``, a row or XCom object.
+        """
+        # TODO: "pickling" has been deprecated and JSON is preferred.
+        # "pickling" will be removed in Airflow 2.0.
+        if conf.getboolean('core', 'enable_xcom_pickling'):
+            return pickle.loads(result.value)
+
+        try:
+            return json.loads(result.value.decode('UTF-8'))
+        except ValueError:
+            log = LoggingMixin().log
+            log.error("Could not deserialize the XCOM value from JSON. "
+                      "If you are using pickles instead of JSON "
+                      "for XCOM, then you need to enable pickle "
+                      "support for XCOM in your airflow config.")
+            raise
+
+
+def resolve_xcom_backend():
+    """
+    Returns the XCom class configured with ``[core] xcom_backend``.
+    """
+    xcom_backend = conf.get('core', 'xcom_backend', fallback='')
+    if not xcom_backend:
+        return BaseXCom
+    clazz = import_string(xcom_backend)
+    if not issubclass(clazz, BaseXCom):
+        raise TypeError(
+            "Your custom XCom class `{class_name}` is not a subclass of `{base_name}`."
+            .format(class_name=clazz.__name__, base_name=BaseXCom.__name__))
+    return clazz
+
+
+XCom = resolve_xcom_backend()
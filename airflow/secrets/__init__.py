@@ -25,12 +25,14 @@ Secrets framework provides means of getting connection objects from various sour
 __all__ = ['BaseSecretsBackend', 'get_connections', 'get_variable']
 
 import json
+import threading
 from typing import List, Optional
 
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.models.connection import Connection
 from airflow.secrets.base_secrets import BaseSecretsBackend
+from airflow.utils.cache import TTLCache
 from airflow.utils.module_loading import import_string
 
 CONFIG_SECTION = "secrets"
@@ -40,6 +42,9 @@ DEFAULT_SECRETS_SEARCH_PATH = [
 ]
 
 
+_NOT_CACHED = object()
+
+
 def get_connections(conn_id):
     # type: (str) -> List[Connection]
     """
@@ -48,11 +53,25 @@ def get_connections(conn_id):
     :param conn_id: connection id
     :return: array of connections
     """
+    cache = get_secrets_cache()
+    cache_key = ('connection', conn_id)
+    if cache is not None:
+        conn_list = cache.get(cache_key, _NOT_CACHED)
+        if conn_list is not _NOT_CACHED:
+            if conn_list:
+                return list(conn_list)
+            raise AirflowException("The conn_id `{0}` isn't defined".format(conn_id))
+
     for secrets_backend in ensure_secrets_loaded():
         conn_list = secrets_backend.get_connections(conn_id=conn_id)
         if conn_list:
+            conn_list = list(conn_list)
+            if cache is not None:
+                cache.set(cache_key, conn_list)
             return list(conn_list)
 
+    if cache is not None:
+        cache.set(cache_key, [])
     raise AirflowException("The conn_id `{0}` isn't defined".format(conn_id))
 
 
@@ -64,12 +83,57 @@ def get_variable(key):
     :param key: Variable Key
     :return: Variable Value
     """
+    cache = get_secrets_cache()
+    cache_key = ('variable', key)
+    if cache is not None:
+        var_val = cache.get(cache_key, _NOT_CACHED)
+        if var_val is not _NOT_CACHED:
+            return var_val
+
+    var_val = None
     for secrets_backend in ensure_secrets_loaded():
         var_val = secrets_backend.get_variable(key=key)
         if var_val is not None:
-            return var_val
+            break
+
+    if cache is not None:
+        cache.set(cache_key, var_val)
+    return var_val
+
 
-    return None
+def get_secrets_cache():
+    # type: (...) -> Optional[TTLCache]
+    """
+    Returns the cache shared by all lookups in this process, or None when
+    ``[secrets] cache_ttl_seconds`` disables it.
+    """
+    global _secrets_cache  # pylint: disable=global-statement
+    if _secrets_cache is _NOT_CACHED:
+        with _secrets_cache_lock:
+            if _secrets_cache is _NOT_CACHED:
+                ttl = conf.getfloat(CONFIG_SECTION, 'cache_ttl_seconds', fallback=0)
+                maxsize = conf.getint(CONFIG_SECTION, 'cache_size', fallback=1024)
+                _secrets_cache = TTLCache(maxsize=maxsize, ttl=ttl) if ttl > 0 else None
+    return _secrets_cache
+
+
+def invalidate_secrets_cache(conn_id=None, variable_key=None):
+    """
+    Drops cached lookups for the given connection and/or variable, or the
+    whole cache when neither is given. The cache settings are re-read on the
+    next lookup in the latter case.
+    """
+    global _secrets_cache  # pylint: disable=global-statement
+    if conn_id is None and variable_key is None:
+        _secrets_cache = _NOT_CACHED
+        return
+    cache = _secrets_cache
+    if cache is None or cache is _NOT_CACHED:
+        return
+    if conn_id is not None:
+        cache.invalidate(('connection', conn_id))
+    if variable_key is not None:
+        cache.invalidate(('variable', variable_key))
 
 
 def initialize_secrets_backends():
@@ -78,11 +142,9 @@ def initialize_secrets_backends():
     * import secrets backend classes
     * instantiate them and return them in a list
     """
-    alternative_secrets_backend = conf.get(section=CONFIG_SECTION, key='backend', fallback='')
+    alternative_secrets_backend, alternative_secrets_kwargs = _get_secrets_backend_config()
     try:
-        alternative_secrets_config_dict = json.loads(
-            conf.get(section=CONFIG_SECTION, key='backend_kwargs', fallback='{}')
-        )
+        alternative_secrets_config_dict = json.loads(alternative_secrets_kwargs)
     except ValueError:
         alternative_secrets_config_dict = {}
 
@@ -99,16 +161,33 @@ def initialize_secrets_backends():
     return backend_list
 
 
+def _get_secrets_backend_config():
+    return (
+        conf.get(section=CONFIG_SECTION, key='backend', fallback=''),
+        conf.get(section=CONFIG_SECTION, key='backend_kwargs', fallback='{}'),
+    )
+
+
 def ensure_secrets_loaded():
     # type: (...) -> List[BaseSecretsBackend]
     """
     Ensure that all secrets backends are loaded.
-    If the secrets_backend_list contains only 2 default backends, reload it.
+    If the secrets_backend_list contains only 2 default backends, reload it
+    whenever the configured alternative backend changes.
     """
+    global _reloaded_backends  # pylint: disable=global-statement
     # Check if the secrets_backend_list contains only 2 default backends
     if len(secrets_backend_list) == 2:
-        return initialize_secrets_backends()
+        backend_config = _get_secrets_backend_config()
+        reloaded_backends = _reloaded_backends
+        if reloaded_backends is None or reloaded_backends[0] != backend_config:
+            reloaded_backends = (backend_config, initialize_secrets_backends())
+            _reloaded_backends = reloaded_backends
+        return reloaded_backends[1]
     return secrets_backend_list
 
 
+_secrets_cache = _NOT_CACHED
+_secrets_cache_lock = threading.Lock()
+_reloaded_backends = None
 secrets_backend_list = initialize_secrets_backends()
@@ -21,8 +21,9 @@
 from time import sleep
 from datetime import timedelta
 
+from airflow.configuration import conf
 from airflow.exceptions import AirflowException, AirflowSensorTimeout, \
-    AirflowSkipException, AirflowRescheduleException
+    AirflowSkipException, AirflowRescheduleException, AirflowSensingException
 from airflow.models import BaseOperator, SkipMixin, TaskReschedule
 from airflow.utils import timezone
 from airflow.utils.decorators import apply_defaults
@@ -55,10 +56,17 @@ class BaseSensorOperator(BaseOperator, SkipMixin):
         this mode if the time before the criteria is met is expected to be
         quite long. The poke interval should be more than one minute to
         prevent too much load on the scheduler.
+        In both modes, sensors listed in ``[sensor_service] sensors_enabled``
+        are handed over to the sensor service when it is enabled and their
+        first poke did not meet the criteria.
     :type mode: str
     """
     ui_color = '#e6f1f2'
     valid_modes = ['poke', 'reschedule']
+    # Attributes that define what the sensor pokes for. The sensor service
+    # rebuilds the sensor from them, so they must be named like constructor
+    # arguments. Sensors without them are never handed over to the service.
+    poke_context_fields = ()
 
     @apply_defaults
     def __init__(self,
@@ -97,13 +105,48 @@ class BaseSensorOperator(BaseOperator, SkipMixin):
         """
         raise AirflowException('Override me.')
 
+    def get_poke_context(self, context):
+        """
+        Returns the constructor arguments the sensor service rebuilds this
+        sensor with. An ``execution_date`` entry is passed to ``poke`` in the
+        context instead, it defaults to the execution date of the task instance.
+        """
+        return {field: getattr(self, field) for field in self.poke_context_fields}
+
+    @classmethod
+    def prefetch(cls, poke_contexts):
+        """
+        Called by the sensor service with the poke contexts of all the sensors
+        of this class it is about to poke, so that a sensor can load what its
+        pokes need for all of them at once. Does nothing by default.
+
+        :param poke_contexts: poke contexts as returned by ``get_poke_context``
+        :type poke_contexts: list[dict]
+        """
+
+    def is_sensor_service_compatible(self):
+        """
+        Returns whether the task instances of this sensor are handed over to
+        the sensor service once their first poke did not meet the criteria.
+        The sensor service does not run callbacks nor send alert emails, so
+        sensors that have any stay in the workers.
+        """
+        if not self.poke_context_fields or not conf.getboolean('sensor_service', 'enabled'):
+            return False
+        if self.on_failure_callback or self.on_retry_callback or self.on_success_callback:
+            return False
+        if self.email and (self.email_on_failure or self.email_on_retry):
+            return False
+        sensors_enabled = conf.get('sensor_service', 'sensors_enabled').split(',')
+        return self.__class__.__name__ in {name.strip() for name in sensors_enabled}
+
     def execute(self, context):
         started_at = timezone.utcnow()
         if self.reschedule:
             # If reschedule, use first start date of current try
-            task_reschedules = TaskReschedule.find_for_task_instance(context['ti'])
-            if task_reschedules:
-                started_at = task_reschedules[0].start_date
+            first_reschedule = TaskReschedule.query_for_task_instance(context['ti']).first()
+            if first_reschedule:
+                started_at = first_reschedule.start_date
         while not self.poke(context):
             if (timezone.utcnow() - started_at).total_seconds() > self.timeout:
                 # If sensor is in soft fail mode but will be retried then
@@ -114,6 +157,8 @@ class BaseSensorOperator(BaseOperator, SkipMixin):
                     raise AirflowSkipException('Snap. Time is OUT.')
                 else:
                     raise AirflowSensorTimeout('Snap. Time is OUT.')
+            if self.is_sensor_service_compatible() and not context.get('test_mode'):
+                raise AirflowSensingException(self.get_poke_context(context), started_at)
             if self.reschedule:
                 reschedule_date = timezone.utcnow() + timedelta(
                     seconds=self.poke_interval)
@@ -19,17 +19,23 @@
 
 import datetime
 import os
+from collections import defaultdict
 
-from sqlalchemy import func
+from sqlalchemy import and_, or_
 
+from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.models import DagBag, DagModel, DagRun, TaskInstance
 from airflow.operators.dummy_operator import DummyOperator
 from airflow.sensors.base_sensor_operator import BaseSensorOperator
+from airflow.utils.cache import TTLCache
 from airflow.utils.db import provide_session
+from airflow.utils.helpers import query_chunks
 from airflow.utils.decorators import apply_defaults
 from airflow.utils.state import State
 
+_NOT_CACHED = object()
+
 
 class ExternalTaskSensor(BaseSensorOperator):
     """
@@ -61,7 +67,15 @@ class ExternalTaskSensor(BaseSensorOperator):
     :type check_existence: bool
     """
     template_fields = ['external_dag_id', 'external_task_id']
+    poke_context_fields = ('external_dag_id', 'external_task_id', 'allowed_states',
+                           'check_existence')
     ui_color = '#19647e'
+    # States of external task instances and DAG runs, keyed by
+    # (external_dag_id, external_task_id, execution_date). Filled by
+    # ``prefetch`` for all the sensors the sensor service pokes in one loop.
+    _external_states = TTLCache(
+        maxsize=conf.getint('sensor_service', 'max_sensors_per_loop'),
+        ttl=conf.getfloat('sensor_service', 'loop_interval'))
 
     @apply_defaults
     def __init__(self,
@@ -99,16 +113,25 @@ class ExternalTaskSensor(BaseSensorOperator):
         self.external_task_id = external_task_id
         self.check_existence = check_existence
 
-    @provide_session
-    def poke(self, context, session=None):
+    def _get_dttm_filter(self, context):
         if self.execution_delta:
             dttm = context['execution_date'] - self.execution_delta
         elif self.execution_date_fn:
             dttm = self.execution_date_fn(context['execution_date'])
         else:
             dttm = context['execution_date']
+        return dttm if isinstance(dttm, list) else [dttm]
 
-        dttm_filter = dttm if isinstance(dttm, list) else [dttm]
+    def get_poke_context(self, context):
+        # The sensor service pokes for the resolved execution dates, so
+        # sensors waiting for the same external runs share their pokes
+        poke_context = super(ExternalTaskSensor, self).get_poke_context(context)
+        poke_context['execution_date'] = self._get_dttm_filter(context)
+        return poke_context
+
+    @provide_session
+    def poke(self, context, session=None):
+        dttm_filter = self._get_dttm_filter(context)
         serialized_dttm_filter = ','.join(
             [datetime.isoformat() for datetime in dttm_filter])
 
@@ -118,8 +141,6 @@ class ExternalTaskSensor(BaseSensorOperator):
         )
 
         DM = DagModel
-        TI = TaskInstance
-        DR = DagRun
         if self.check_existence:
             dag_to_wait = session.query(DM).filter(
                 DM.dag_id == self.external_dag_id
@@ -140,25 +161,92 @@ class ExternalTaskSensor(BaseSensorOperator):
                                            '{} in DAG {} does not exist.'.format(self.external_task_id,
                                                                                  self.external_dag_id))
 
-        if self.external_task_id:
-            # .count() is inefficient
-            count = session.query(func.count()).filter(
-                TI.dag_id == self.external_dag_id,
-                TI.task_id == self.external_task_id,
-                TI.state.in_(self.allowed_states),
-                TI.execution_date.in_(dttm_filter),
-            ).scalar()
-        else:
-            # .count() is inefficient
-            count = session.query(func.count()).filter(
-                DR.dag_id == self.external_dag_id,
-                DR.state.in_(self.allowed_states),
-                DR.execution_date.in_(dttm_filter),
-            ).scalar()
+        keys = [(self.external_dag_id, self.external_task_id or None, dttm)
+                for dttm in dttm_filter]
+        states = self.get_external_states(keys, session=session)
+        count = sum(1 for key in keys
+                    if states.get(key) is not None and states[key] in self.allowed_states)
 
         session.commit()
         return count == len(dttm_filter)
 
+    @classmethod
+    @provide_session
+    def get_external_states(cls, keys, session=None):
+        """
+        Returns the states of the external task instances, or of the external
+        DAG runs when the task id is ``None``. States prefetched for the
+        current loop of the sensor service are reused, the others are loaded
+        with one query.
+
+        :param keys: (external_dag_id, external_task_id, execution_date) keys
+        :type keys: list[tuple]
+        :return: the state of each key that exists
+        :rtype: dict[tuple, str]
+        """
+        states = {}
+        missing_keys = []
+        for key in keys:
+            state = cls._external_states.get(key, _NOT_CACHED)
+            if state is _NOT_CACHED:
+                missing_keys.append(key)
+            elif state is not None:
+                states[key] = state
+        if missing_keys:
+            states.update(cls._query_external_states(missing_keys, session=session))
+        return states
+
+    @classmethod
+    def prefetch(cls, poke_contexts):
+        # Sensors waiting for the same external task instances or DAG runs
+        # share the states loaded here, whatever their allowed states
+        keys = {
+            (poke_context['external_dag_id'], poke_context['external_task_id'] or None, dttm)
+            for poke_context in poke_contexts
+            for dttm in poke_context['execution_date']
+        }
+        states = cls._query_external_states(keys)
+        cls._external_states.invalidate()
+        for key in keys:
+            # Keys without a task instance or DAG run are cached as None
+            cls._external_states.set(key, states.get(key))
+
+    @staticmethod
+    @provide_session
+    def _query_external_states(keys, session=None):
+        """
+        Loads the states of the given external task instances and DAG runs
+        with one query on each table, filtered on their primary or unique key.
+        """
+        TI = TaskInstance
+        DR = DagRun
+        dates_by_task = defaultdict(set)
+        for dag_id, task_id, dttm in keys:
+            dates_by_task[(dag_id, task_id)].add(dttm)
+
+        states = {}
+        task_keys = [key for key in dates_by_task if key[1] is not None]
+        for task_keys_chunk in query_chunks(task_keys):
+            rows = session.query(TI.dag_id, TI.task_id, TI.execution_date, TI.state).filter(or_(
+                and_(TI.dag_id == dag_id,
+                     TI.task_id == task_id,
+                     TI.execution_date.in_(dates_by_task[(dag_id, task_id)]))
+                for dag_id, task_id in task_keys_chunk
+            ))
+            for dag_id, task_id, execution_date, state in rows:
+                states[(dag_id, task_id, execution_date)] = state
+
+        dag_ids = [dag_id for dag_id, task_id in dates_by_task if task_id is None]
+        for dag_ids_chunk in query_chunks(dag_ids):
+            rows = session.query(DR.dag_id, DR.execution_date, DR.state).filter(or_(
+                and_(DR.dag_id == dag_id,
+                     DR.execution_date.in_(dates_by_task[(dag_id, None)]))
+                for dag_id in dag_ids_chunk
+            ))
+            for dag_id, execution_date, state in rows:
+                states[(dag_id, None, execution_date)] = state
+        return states
+
 
 class ExternalTaskMarker(DummyOperator):
     """
@@ -42,6 +42,7 @@ class HivePartitionSensor(BaseSensorOperator):
     :type metastore_conn_id: str
     """
     template_fields = ('schema', 'table', 'partition',)
+    poke_context_fields = ('schema', 'table', 'partition', 'metastore_conn_id')
     ui_color = '#C5CAE9'
 
     @apply_defaults
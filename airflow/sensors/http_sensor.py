@@ -51,6 +51,8 @@ class HttpSensor(BaseSensorOperator):
     """
 
     template_fields = ('endpoint', 'request_params')
+    poke_context_fields = ('endpoint', 'http_conn_id', 'method', 'request_params', 'headers',
+                           'extra_options')
 
     @apply_defaults
     def __init__(self,
@@ -64,6 +66,7 @@ class HttpSensor(BaseSensorOperator):
         super(HttpSensor, self).__init__(*args, **kwargs)
         self.endpoint = endpoint
         self.http_conn_id = http_conn_id
+        self.method = method
         self.request_params = request_params or {}
         self.headers = headers or {}
         self.extra_options = extra_options or {}
@@ -73,6 +76,11 @@ class HttpSensor(BaseSensorOperator):
             method=method,
             http_conn_id=http_conn_id)
 
+    def is_sensor_service_compatible(self):
+        # A response check cannot be stored in the poke context
+        return (self.response_check is None and
+                super(HttpSensor, self).is_sensor_service_compatible())
+
     def poke(self, context):
         self.log.info('Poking: %s', self.endpoint)
         try:
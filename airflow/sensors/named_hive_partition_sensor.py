@@ -41,6 +41,7 @@ class NamedHivePartitionSensor(BaseSensorOperator):
     """
 
     template_fields = ('partition_names',)
+    poke_context_fields = ('partition_names', 'metastore_conn_id')
     ui_color = '#8d99ae'
 
     @apply_defaults
@@ -59,6 +59,7 @@ class SqlSensor(BaseSensorOperator):
     template_fields = ('sql',)  # type: Iterable[str]
     template_ext = ('.hql', '.sql',)  # type: Iterable[str]
     ui_color = '#7c7287'
+    poke_context_fields = ('conn_id', 'sql', 'parameters', 'fail_on_empty', 'allow_null')
 
     @apply_defaults
     def __init__(self, conn_id, sql, parameters=None, success=None, failure=None, fail_on_empty=False,
@@ -72,6 +73,11 @@ class SqlSensor(BaseSensorOperator):
         self.allow_null = allow_null
         super(SqlSensor, self).__init__(*args, **kwargs)
 
+    def is_sensor_service_compatible(self):
+        # Success and failure criteria cannot be stored in the poke context
+        return (self.success is None and self.failure is None and
+                super(SqlSensor, self).is_sensor_service_compatible())
+
     def _get_hook(self):
         conn = BaseHook.get_connection(self.conn_id)
 
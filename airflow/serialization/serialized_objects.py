@@ -30,6 +30,7 @@ import pendulum
 from dateutil import relativedelta
 
 from airflow import DAG, AirflowException, LoggingMixin
+from airflow.configuration import conf
 from airflow.models.baseoperator import BaseOperator, BaseOperatorLink
 from airflow.models.connection import Connection
 from airflow.serialization.enums import DagAttributeTypes as DAT, Encoding
@@ -199,8 +200,13 @@ class BaseSerialization:
                 return str(get_python_source(var, return_none_if_x_none=True))
             elif isinstance(var, set):
                 # FIXME: casts set to list in customized serialization in future.
-                return cls._encode(
-                    [cls._serialize(v) for v in var], type_=DAT.SET)
+                serialized_set = [cls._serialize(v) for v in var]
+                try:
+                    # Sort so that the same set is always serialized the same way
+                    serialized_set.sort()
+                except TypeError:
+                    pass
+                return cls._encode(serialized_set, type_=DAT.SET)
             elif isinstance(var, tuple):
                 # FIXME: casts tuple to list in customized serialization in future.
                 return cls._encode(
@@ -594,7 +600,8 @@ class SerializedDAG(DAG, BaseSerialization):
         }
 
         # Validate Serialized DAG with Json Schema. Raises Error if it mismatches
-        cls.validate_schema(json_dict)
+        if conf.getboolean('core', 'validate_serialized_dags', fallback=False):
+            cls.validate_schema(json_dict)
         return json_dict
 
     @classmethod
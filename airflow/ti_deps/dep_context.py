@@ -66,6 +66,15 @@ class DepContext(object):
     :type ignore_task_deps: bool
     :param ignore_ti_state: Ignore the task instance's previous failure/success
     :type ignore_ti_state: bool
+    :param include_task_deps: Whether to evaluate the dependencies of the task itself
+        (``task.deps``) on top of ``deps``
+    :type include_task_deps: bool
+
+    Facts that are shared by many task instances, like the state of their DAG run or
+    the open slots of their pool, are memoized in the context the first time a
+    dependency looks them up (see :meth:`memoize`). A context should therefore only
+    be reused for task instances that are evaluated at about the same time, e.g. in
+    one scheduling loop.
     """
     def __init__(
             self,
@@ -76,7 +85,8 @@ class DepContext(object):
             ignore_in_retry_period=False,
             ignore_in_reschedule_period=False,
             ignore_task_deps=False,
-            ignore_ti_state=False):
+            ignore_ti_state=False,
+            include_task_deps=True):
         self.deps = deps or set()
         self.flag_upstream_failed = flag_upstream_failed
         self.ignore_all_deps = ignore_all_deps
@@ -85,6 +95,20 @@ class DepContext(object):
         self.ignore_in_reschedule_period = ignore_in_reschedule_period
         self.ignore_task_deps = ignore_task_deps
         self.ignore_ti_state = ignore_ti_state
+        self.include_task_deps = include_task_deps
+        self._memo = {}
+
+    def memoize(self, key, func):
+        """
+        Returns the value memoized for ``key`` in this context, computing it with
+        ``func`` the first time.
+
+        :param key: hashable key of the value, e.g. ``('dagrun', dag_id, execution_date)``
+        :param func: function without arguments that computes the value
+        """
+        if key not in self._memo:
+            self._memo[key] = func()
+        return self._memo[key]
 
 
 # In order to be able to get queued a task must have one of these states
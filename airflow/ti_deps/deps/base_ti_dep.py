@@ -37,6 +37,12 @@ class BaseTIDep(object):
     # to some tasks (e.g. depends_on_past is not specified by all tasks).
     IS_TASK_DEP = False
 
+    # Relative cost of evaluating this dependency. Dependencies are evaluated from the
+    # cheapest to the most expensive, so that the checks that do not hit the database
+    # can rule a task instance out before the ones that do: 0 for checks on the task
+    # instance alone, 1 for a few queries, 2 for checks that walk previous DAG runs.
+    COST = 1
+
     def __init__(self):
         pass
 
@@ -141,6 +147,14 @@ class BaseTIDep(object):
             if not dep_status.passed:
                 yield dep_status.reason
 
+    @staticmethod
+    def _get_dagrun(ti, session, dep_context):
+        """
+        Returns the DAG run of ``ti``, looked up once per DAG run in ``dep_context``.
+        """
+        return dep_context.memoize(('dagrun', ti.dag_id, ti.execution_date),
+                                   lambda: ti.get_dagrun(session))
+
     def _failing_status(self, reason=''):
         return TIDepStatus(self.name, False, reason)
 
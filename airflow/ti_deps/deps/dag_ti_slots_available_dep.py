@@ -27,7 +27,10 @@ class DagTISlotsAvailableDep(BaseTIDep):
 
     @provide_session
     def _get_dep_statuses(self, ti, session, dep_context):
-        if ti.task.dag.concurrency_reached:
+        concurrency_reached = dep_context.memoize(
+            ('dag_concurrency_reached', ti.dag_id),
+            lambda: ti.task.dag.concurrency_reached)
+        if concurrency_reached:
             yield self._failing_status(
                 reason="The maximum number of running tasks ({0}) for this task's DAG "
                        "'{1}' has been reached.".format(ti.task.dag.concurrency,
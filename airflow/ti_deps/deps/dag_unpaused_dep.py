@@ -27,6 +27,8 @@ class DagUnpausedDep(BaseTIDep):
 
     @provide_session
     def _get_dep_statuses(self, ti, session, dep_context):
-        if ti.task.dag.is_paused:
+        is_paused = dep_context.memoize(('dag_is_paused', ti.dag_id),
+                                        lambda: ti.task.dag.is_paused)
+        if is_paused:
             yield self._failing_status(
                 reason="Task's DAG '{0}' is paused.".format(ti.dag_id))
@@ -29,7 +29,7 @@ class DagrunRunningDep(BaseTIDep):
     @provide_session
     def _get_dep_statuses(self, ti, session, dep_context):
         dag = ti.task.dag
-        dagrun = ti.get_dagrun(session)
+        dagrun = self._get_dagrun(ti, session, dep_context)
         if not dagrun:
             # The import is needed here to avoid a circular dependency
             from airflow.models import DagRun
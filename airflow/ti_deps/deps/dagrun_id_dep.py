@@ -46,7 +46,7 @@ class DagrunIdDep(BaseTIDep):
         :return: True if DagRun ID is valid for scheduling from scheduler.
         """
         from airflow.jobs import BackfillJob  # To avoid a circular dependency
-        dagrun = ti.get_dagrun(session)
+        dagrun = self._get_dagrun(ti, session, dep_context)
 
         if not dagrun.run_id or not match(BackfillJob.ID_PREFIX + '.*', dagrun.run_id):
             yield self._passing_status(
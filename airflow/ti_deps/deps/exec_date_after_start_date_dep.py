@@ -24,6 +24,7 @@ from airflow.utils.db import provide_session
 class ExecDateAfterStartDateDep(BaseTIDep):
     NAME = "Execution Date"
     IGNOREABLE = True
+    COST = 0
 
     @provide_session
     def _get_dep_statuses(self, ti, session, dep_context):
@@ -27,6 +27,7 @@ class NotInRetryPeriodDep(BaseTIDep):
     NAME = "Not In Retry Period"
     IGNOREABLE = True
     IS_TASK_DEP = True
+    COST = 0
 
     @provide_session
     def _get_dep_statuses(self, ti, session, dep_context):
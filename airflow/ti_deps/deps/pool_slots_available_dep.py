@@ -50,16 +50,18 @@ class PoolSlotsAvailableDep(BaseTIDep):
         P = models.Pool
         pool_name = ti.pool
 
-        pools = session.query(P).filter(P.pool == pool_name).all()
-        if not pools:
+        def get_open_slots():
+            pool = session.query(P).filter(P.pool == pool_name).first()
+            # Controlled by UNIQUE key in slot_pool table,
+            # only one result can be returned.
+            return pool.open_slots(session=session) if pool else None
+
+        open_slots = dep_context.memoize(('pool_open_slots', pool_name), get_open_slots)
+        if open_slots is None:
             yield self._failing_status(
                 reason=("Tasks using non-existent pool '%s' will not be scheduled",
                         pool_name))
             return
-        else:
-            # Controlled by UNIQUE key in slot_pool table,
-            # only one result can be returned.
-            open_slots = pools[0].open_slots()
 
         if ti.state in STATES_TO_COUNT_AS_RUNNING:
             open_slots += ti.pool_slots
@@ -30,6 +30,7 @@ class PrevDagrunDep(BaseTIDep):
     NAME = "Previous Dagrun State"
     IGNOREABLE = True
     IS_TASK_DEP = True
+    COST = 2
 
     @provide_session
     def _get_dep_statuses(self, ti, session, dep_context):
@@ -57,15 +58,15 @@ class PrevDagrunDep(BaseTIDep):
                     reason="This task instance was the first task instance for its task.")
                 return
         else:
-            dr = ti.get_dagrun()
-            last_dagrun = dr.get_previous_dagrun() if dr else None
+            dr = self._get_dagrun(ti, session, dep_context)
+            last_dagrun = self._get_previous_dagrun(ti, dr, session, dep_context) if dr else None
 
             if not last_dagrun:
                 yield self._passing_status(
                     reason="This task instance was the first task instance for its task.")
                 return
 
-        previous_ti = ti.previous_ti
+        previous_ti = self._get_previous_ti(ti, session, dep_context)
         if not previous_ti:
             yield self._failing_status(
                 reason="depends_on_past is true for this task's DAG, but the previous "
@@ -84,3 +85,30 @@ class PrevDagrunDep(BaseTIDep):
             yield self._failing_status(
                 reason="The tasks downstream of the previous task instance {0} haven't "
                        "completed (and wait_for_downstream is True).".format(previous_ti))
+
+    @staticmethod
+    def _get_previous_dagrun(ti, dagrun, session, dep_context):
+        return dep_context.memoize(
+            ('previous_dagrun', ti.dag_id, ti.execution_date),
+            lambda: ti._get_previous_dagrun(dagrun, session=session))
+
+    def _get_previous_ti(self, ti, session, dep_context):
+        """
+        Returns the previous task instance of ``ti``. The task instances of the
+        previous DAG run are loaded with one query for all the task instances of a
+        DAG run evaluated in ``dep_context``.
+        """
+        dagrun = self._get_dagrun(ti, session, dep_context)
+        if not dagrun:
+            return ti.previous_ti
+
+        def get_previous_tis():
+            last_dagrun = self._get_previous_dagrun(ti, dagrun, session, dep_context)
+            if not last_dagrun:
+                return {}
+            return {previous_ti.task_id: previous_ti
+                    for previous_ti in last_dagrun.get_task_instances(session=session)}
+
+        previous_tis = dep_context.memoize(
+            ('previous_dagrun_tis', ti.dag_id, ti.execution_date), get_previous_tis)
+        return previous_tis.get(ti.task_id)
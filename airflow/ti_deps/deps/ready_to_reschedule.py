@@ -38,6 +38,9 @@ class ReadyToRescheduleDep(BaseTIDep):
         handled by this dependency class, otherwise this dependency is
         considered as passed. This dependency fails if the latest reschedule
         request's reschedule date is still in future.
+
+        The latest reschedule dates of all the task instances of a DAG run are
+        loaded at once and memoized in ``dep_context``.
         """
         if dep_context.ignore_in_reschedule_period:
             yield self._passing_status(
@@ -50,14 +53,17 @@ class ReadyToRescheduleDep(BaseTIDep):
                 reason="The task instance is not in State_UP_FOR_RESCHEDULE or NONE state.")
             return
 
-        task_reschedules = TaskReschedule.find_for_task_instance(task_instance=ti)
-        if not task_reschedules:
+        next_reschedule_dates = dep_context.memoize(
+            ('next_reschedule_dates', ti.dag_id, ti.execution_date),
+            lambda: TaskReschedule.find_latest_reschedule_dates(
+                ti.dag_id, ti.execution_date, session=session))
+        next_reschedule_date = next_reschedule_dates.get((ti.task_id, ti.try_number))
+        if next_reschedule_date is None:
             yield self._passing_status(
                 reason="There is no reschedule request for this task instance.")
             return
 
         now = timezone.utcnow()
-        next_reschedule_date = task_reschedules[-1].reschedule_date
         if now >= next_reschedule_date:
             yield self._passing_status(
                 reason="Task instance id ready for reschedule.")
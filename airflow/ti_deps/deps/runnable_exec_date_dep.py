@@ -25,6 +25,7 @@ from airflow.utils.db import provide_session
 class RunnableExecDateDep(BaseTIDep):
     NAME = "Execution Date"
     IGNOREABLE = True
+    COST = 0
 
     @provide_session
     def _get_dep_statuses(self, ti, session, dep_context):
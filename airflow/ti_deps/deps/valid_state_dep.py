@@ -25,6 +25,7 @@ from airflow.utils.db import provide_session
 class ValidStateDep(BaseTIDep):
     NAME = "Task Instance State"
     IGNOREABLE = True
+    COST = 0
 
     """
     Ensures that the task instance's state is in a given set of valid states.
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""In-process caches."""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache(object):
+    """
+    Thread-safe, size bounded cache whose entries expire ``ttl`` seconds
+    after they were set. When full, the least recently used entry is evicted.
+
+    :param maxsize: maximum number of entries kept in the cache
+    :type maxsize: int
+    :param ttl: number of seconds an entry is valid for, or None if entries
+        never expire
+    :type ttl: float
+    """
+
+    def __init__(self, maxsize=128, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached for ``key``, or ``default`` when there is
+        no valid entry for it.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or self._expired(entry):
+                self.misses += 1
+                return default
+            # Re-insert to mark the entry as the most recently used one
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        """Caches ``value`` for ``key``."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.maxsize:
+                self._entries.popitem(last=False)
+            expires_at = time.time() + self.ttl if self.ttl is not None else None
+            self._entries[key] = (expires_at, value)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _expired(entry):
+        return entry[0] is not None and entry[0] < time.time()
+
+    def invalidate(self, key=None):
+        """Removes ``key`` from the cache, or every entry if no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """Returns the number of hits, misses and cached entries."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
@@ -39,7 +39,7 @@ from typing import NamedTuple, Iterable
 import psutil
 from setproctitle import setproctitle
 import six
-from six.moves import reload_module
+from six.moves import intern, reload_module
 from sqlalchemy import or_
 from tabulate import tabulate
 
@@ -52,7 +52,7 @@ from airflow.settings import Stats
 from airflow.models import errors
 from airflow.settings import STORE_SERIALIZED_DAGS
 from airflow.utils import timezone
-from airflow.utils.helpers import reap_process_group
+from airflow.utils.helpers import query_chunks, reap_process_group
 from airflow.utils.db import provide_session
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.state import State
@@ -61,6 +61,17 @@ if six.PY2:
     ConnectionError = IOError
 
 
+def _intern(value):
+    """
+    Returns the canonical copy of ``value`` so that the ids repeated across
+    thousands of task instances share a single string object. Only native
+    strings can be interned, other values are returned as they are.
+    """
+    if isinstance(value, str):
+        return intern(value)
+    return value
+
+
 class SimpleDag(BaseDag):
     """
     A simplified representation of a DAG that contains all attributes
@@ -72,9 +83,12 @@ class SimpleDag(BaseDag):
     :type pickle_id: unicode
     """
 
+    __slots__ = ('_dag_id', '_task_ids', '_full_filepath', '_is_paused',
+                 '_concurrency', '_pickle_id', '_task_special_args')
+
     def __init__(self, dag, pickle_id=None):
-        self._dag_id = dag.dag_id
-        self._task_ids = [task.task_id for task in dag.tasks]
+        self._dag_id = _intern(dag.dag_id)
+        self._task_ids = tuple(_intern(task.task_id) for task in dag.tasks)
         self._full_filepath = dag.full_filepath
         self._is_paused = dag.is_paused
         self._concurrency = dag.concurrency
@@ -85,7 +99,14 @@ class SimpleDag(BaseDag):
             if task.task_concurrency is not None:
                 special_args['task_concurrency'] = task.task_concurrency
             if len(special_args) > 0:
-                self._task_special_args[task.task_id] = special_args
+                self._task_special_args[_intern(task.task_id)] = special_args
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
 
     @property
     def dag_id(self):
@@ -98,8 +119,8 @@ class SimpleDag(BaseDag):
     @property
     def task_ids(self):
         """
-        :return: A list of task IDs that are in this DAG
-        :rtype: list[unicode]
+        :return: The IDs of the tasks that are in this DAG
+        :rtype: tuple[unicode]
         """
         return self._task_ids
 
@@ -147,9 +168,21 @@ class SimpleDag(BaseDag):
 
 
 class SimpleTaskInstance(object):
+    """
+    A lightweight copy of the attributes of a TaskInstance that can be
+    passed between processes without a database session.
+
+    :param ti: the task instance to copy
+    :type ti: airflow.models.TaskInstance
+    """
+
+    __slots__ = ('_dag_id', '_task_id', '_execution_date', '_start_date',
+                 '_end_date', '_try_number', '_state', '_executor_config',
+                 '_run_as_user', '_pool', '_priority_weight', '_queue', '_key')
+
     def __init__(self, ti):
-        self._dag_id = ti.dag_id
-        self._task_id = ti.task_id
+        self._dag_id = _intern(ti.dag_id)
+        self._task_id = _intern(ti.task_id)
         self._execution_date = ti.execution_date
         self._start_date = ti.start_date
         self._end_date = ti.end_date
@@ -161,15 +194,22 @@ class SimpleTaskInstance(object):
         else:
             self._run_as_user = None
         if hasattr(ti, 'pool'):
-            self._pool = ti.pool
+            self._pool = _intern(ti.pool)
         else:
             self._pool = None
         if hasattr(ti, 'priority_weight'):
             self._priority_weight = ti.priority_weight
         else:
             self._priority_weight = None
-        self._queue = ti.queue
-        self._key = ti.key
+        self._queue = _intern(ti.queue)
+        self._key = (self._dag_id, self._task_id) + tuple(ti.key[2:])
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
 
     @property
     def dag_id(self):
@@ -778,13 +818,19 @@ class DagFileProcessorManager(LoggingMixin):
         self._file_stats = {}  # type: dict(str, DagFileStat)
 
         self._last_zombie_query_time = None
+        # Heartbeat limit of the last zombie sweep, the next one only looks at
+        # the jobs that heartbeated since
+        self._last_zombie_limit_dttm = None
         # Last time that the DAG dir was traversed to look for files
         self.last_dag_dir_refresh_time = timezone.utcnow()
         # Last time stats were printed
         self.last_stat_print_time = timezone.datetime(2000, 1, 1)
         # TODO: Remove magic number
         self._zombie_query_interval = 10
+        # Zombies left to the processors of their DAG file
         self._zombies = []
+        # Map from zombie key to the ID of its dead job and its DAG file path
+        self._zombie_sources = {}
         # How long to wait before timing out a process to parse a DAG file
         self._processor_timeout = processor_timeout
 
@@ -1266,7 +1312,7 @@ class DagFileProcessorManager(LoggingMixin):
         while (self._parallelism - len(self._processors) > 0 and
                len(self._file_path_queue) > 0):
             file_path = self._file_path_queue.pop(0)
-            processor = self._processor_factory(file_path, self._zombies)
+            processor = self._processor_factory(file_path, self._get_zombies_for_file(file_path))
             Stats.incr('dag_processing.processes')
 
             processor.start()
@@ -1285,40 +1331,165 @@ class DagFileProcessorManager(LoggingMixin):
     def _find_zombies(self, session):
         """
         Find zombie task instances, which are tasks haven't heartbeated for too long
-        and update the current zombie list.
+        or whose job ended while they were running, and handle them.
+
+        Each sweep only looks at the local task jobs that heartbeated since the
+        heartbeat limit of the previous sweep, using the index on the type and
+        latest heartbeat of jobs, as older jobs were looked at already. Zombies
+        whose task is known from the serialized DAGs and has no callbacks are
+        failed right away. The others are kept, until they are not running
+        anymore, for the processor of their DAG file, which runs their
+        callbacks.
         """
         now = timezone.utcnow()
-        zombies = []
-        if not self._last_zombie_query_time or \
-                (now - self._last_zombie_query_time).total_seconds() > self._zombie_query_interval:
-            # to avoid circular imports
-            from airflow.jobs import LocalTaskJob as LJ
-            self.log.info("Finding 'running' jobs without a recent heartbeat")
-            TI = airflow.models.TaskInstance
-            limit_dttm = timezone.utcnow() - timedelta(
-                seconds=self._zombie_threshold_secs)
-            self.log.info("Failing jobs without heartbeat after %s", limit_dttm)
-
-            tis = (
-                session.query(TI)
-                .join(LJ, TI.job_id == LJ.id)
-                .filter(TI.state == State.RUNNING)
-                .filter(
-                    or_(
-                        LJ.state != State.RUNNING,
-                        LJ.latest_heartbeat < limit_dttm,
-                    )
-                ).all()
+        if self._last_zombie_query_time and \
+                (now - self._last_zombie_query_time).total_seconds() <= self._zombie_query_interval:
+            return
+
+        # to avoid circular imports
+        from airflow.jobs import LocalTaskJob as LJ
+        self.log.info("Finding 'running' jobs without a recent heartbeat")
+        TI = airflow.models.TaskInstance
+        limit_dttm = now - timedelta(seconds=self._zombie_threshold_secs)
+        self.log.info("Failing jobs without heartbeat after %s", limit_dttm)
+
+        self._remove_handled_zombies(session=session)
+
+        query = (
+            session
+            .query(TI, LJ.state, LJ.latest_heartbeat, LJ.end_date)
+            .join(LJ, TI.job_id == LJ.id)
+            .filter(TI.state == State.RUNNING)
+            .filter(
+                or_(
+                    LJ.state != State.RUNNING,
+                    LJ.latest_heartbeat < limit_dttm,
+                )
+            )
+        )
+        if self._last_zombie_limit_dttm is not None:
+            query = query.filter(LJ.latest_heartbeat >= self._last_zombie_limit_dttm)
+        results = query.all()
+        self._last_zombie_query_time = timezone.utcnow()
+        self._last_zombie_limit_dttm = limit_dttm
+
+        zombie_tis = []
+        for ti, job_state, latest_heartbeat, job_end_date in results:
+            if ti.key in self._zombie_sources:
+                continue
+            self.log.info(
+                "Detected zombie job with dag_id %s, task_id %s, and execution date %s",
+                ti.dag_id, ti.task_id, ti.execution_date.isoformat())
+            zombie_since = latest_heartbeat + timedelta(seconds=self._zombie_threshold_secs)
+            if job_state != State.RUNNING and job_end_date is not None:
+                zombie_since = min(zombie_since, job_end_date)
+            Stats.timing('zombies.detection_latency',
+                         max(self._last_zombie_query_time - zombie_since, timedelta(0)))
+            zombie_tis.append(ti)
+
+        if STORE_SERIALIZED_DAGS:
+            zombie_tis = self._kill_zombies_from_serialized_dags(zombie_tis, session=session)
+        if not zombie_tis:
+            return
+
+        file_paths = dict(
+            session
+            .query(airflow.models.DagModel.dag_id, airflow.models.DagModel.fileloc)
+            .filter(airflow.models.DagModel.dag_id.in_({ti.dag_id for ti in zombie_tis}))
+        )
+        for ti in zombie_tis:
+            file_path = file_paths.get(ti.dag_id)
+            if file_path is not None:
+                file_path = correct_maybe_zipped(file_path)
+            if file_path not in self._file_paths:
+                # Every processor gets the zombies whose DAG file is not known
+                file_path = None
+            self._zombie_sources[ti.key] = (ti.job_id, file_path)
+            self._zombies.append(SimpleTaskInstance(ti))
+
+    def _kill_zombies_from_serialized_dags(self, zombie_tis, session):
+        """
+        Fails the zombie task instances whose task is in the serialized DAGs
+        and has no callbacks, which would need the DAG file to be parsed.
+
+        :param zombie_tis: the zombie task instances
+        :type zombie_tis: list[airflow.models.TaskInstance]
+        :return: the zombie task instances that were not failed
+        :rtype: list[airflow.models.TaskInstance]
+        """
+        from airflow.models.serialized_dag import SerializedDagModel
+
+        dags = {}
+        remaining_tis = []
+        for ti in zombie_tis:
+            if ti.dag_id not in dags:
+                serialized_dag_model = SerializedDagModel.get(ti.dag_id, session=session)
+                dags[ti.dag_id] = serialized_dag_model.dag if serialized_dag_model else None
+            dag = dags[ti.dag_id]
+            if dag is None or dag.dag_id != ti.dag_id or not dag.has_task(ti.task_id):
+                remaining_tis.append(ti)
+                continue
+            task = dag.get_task(ti.task_id)
+            if task.on_failure_callback or task.on_retry_callback:
+                remaining_tis.append(ti)
+                continue
+
+            ti.task = task
+            try:
+                ti.handle_failure("{} detected as zombie".format(ti),
+                                  conf.getboolean('core', 'unit_test_mode'), {},
+                                  session=session)
+            except Exception:  # pylint: disable=broad-except
+                self.log.exception("Failed to kill zombie %s, leaving it to its DAG file", ti)
+                session.rollback()
+                remaining_tis.append(ti)
+                continue
+            Stats.incr('zombies_killed')
+            self.log.info('Marked zombie job %s as %s', ti, ti.state)
+        return remaining_tis
+
+    @provide_session
+    def _remove_handled_zombies(self, session):
+        """
+        Forgets the zombies that are not running with the job that died anymore,
+        i.e. that a DAG file processor handled or that were cleared.
+        """
+        if not self._zombies:
+            return
+        TI = airflow.models.TaskInstance
+        still_zombies = set()
+        for zombies_chunk in query_chunks(self._zombies):
+            still_zombies.update(
+                (dag_id, task_id, execution_date, job_id)
+                for dag_id, task_id, execution_date, job_id in (
+                    session
+                    .query(TI.dag_id, TI.task_id, TI.execution_date, TI.job_id)
+                    .filter(TI.dag_id.in_({zombie.dag_id for zombie in zombies_chunk}),
+                            TI.task_id.in_({zombie.task_id for zombie in zombies_chunk}),
+                            TI.execution_date.in_({zombie.execution_date
+                                                   for zombie in zombies_chunk}),
+                            TI.state == State.RUNNING)
+                )
             )
-            self._last_zombie_query_time = timezone.utcnow()
-            for ti in tis:
-                sti = SimpleTaskInstance(ti)
-                self.log.info(
-                    "Detected zombie job with dag_id %s, task_id %s, and execution date %s",
-                    sti.dag_id, sti.task_id, sti.execution_date.isoformat())
-                zombies.append(sti)
-
-            self._zombies = zombies
+
+        zombies = []
+        for zombie in self._zombies:
+            job_id = self._zombie_sources[zombie.key][0]
+            if (zombie.dag_id, zombie.task_id, zombie.execution_date, job_id) in still_zombies:
+                zombies.append(zombie)
+            else:
+                del self._zombie_sources[zombie.key]
+        self._zombies = zombies
+
+    def _get_zombies_for_file(self, file_path):
+        """
+        Returns the zombies the processor of ``file_path`` has to kill: the
+        ones of its DAGs and the ones whose DAG file is not known.
+
+        :rtype: list[airflow.utils.dag_processing.SimpleTaskInstance]
+        """
+        return [zombie for zombie in self._zombies
+                if self._zombie_sources[zombie.key][1] in (file_path, None)]
 
     def _kill_timed_out_processors(self):
         """
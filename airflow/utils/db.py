@@ -341,8 +341,7 @@ def initdb(rbac=False):
 
     dagbag = models.DagBag()
     # Save individual DAGs in the ORM
-    for dag in dagbag.dags.values():
-        dag.sync_to_db()
+    models.DAG.bulk_sync_to_db(dagbag.dags.values())
     # Deactivate the unknown ones
     models.DAG.deactivate_unknown_dags(dagbag.dags.keys())
 
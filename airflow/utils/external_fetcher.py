@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Fetching of resources living outside of the web server (worker logs, remote
+logs, extra links) without letting a slow host stall the web server workers.
+"""
+import sys
+import threading
+
+import requests
+import six
+from requests.adapters import HTTPAdapter
+
+from airflow.configuration import conf, AirflowConfigException
+from airflow.exceptions import ExternalFetchException
+from airflow.utils.cache import TTLCache
+from airflow.utils.log.logging_mixin import LoggingMixin
+
+
+class ExternalFetcher(LoggingMixin):
+    """
+    Runs fetches from external hosts in background threads.
+
+    Each fetch is given at most ``deadline`` seconds to complete before the
+    caller gets an :class:`~airflow.exceptions.ExternalFetchException`.
+    A fetch that misses its deadline keeps holding one of the
+    ``concurrency_per_host`` slots of the host it fetches from until it
+    actually returns, so requests for a host that stopped answering fail
+    right away instead of tying up the web server workers. HTTP fetches share pooled connections
+    and their responses can be cached for ``cache_ttl`` seconds.
+
+    :param timeout: connect and read timeout of HTTP requests, in seconds
+    :type timeout: float
+    :param deadline: maximum time to wait for a fetch to complete, in seconds
+    :type deadline: float
+    :param concurrency_per_host: maximum number of pending fetches per host
+    :type concurrency_per_host: int
+    :param cache_size: maximum number of cached responses
+    :type cache_size: int
+    :param cache_ttl: number of seconds a cached response is valid for
+    :type cache_ttl: float
+    """
+
+    def __init__(self, timeout=None, deadline=None, concurrency_per_host=4,
+                 cache_size=64, cache_ttl=60):
+        self.timeout = timeout
+        self.deadline = deadline
+        self.concurrency_per_host = concurrency_per_host
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._host_slots = {}
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=concurrency_per_host)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def _get_slots(self, host_key):
+        with self._lock:
+            if host_key not in self._host_slots:
+                self._host_slots[host_key] = threading.BoundedSemaphore(
+                    self.concurrency_per_host)
+            return self._host_slots[host_key]
+
+    def call(self, host_key, func, *args, **kwargs):
+        """
+        Calls ``func(*args, **kwargs)`` in a background thread and returns its
+        result, re-raising any exception it raised.
+
+        :param host_key: identifies the remote host the call is fetching from,
+            e.g. its host name, used to limit the number of pending calls per
+            host. When the host is not known to the caller, a key standing for
+            it, e.g. the operator whose code does the fetch.
+        :type host_key: str
+        :param func: the callable doing the fetch
+        :type func: callable
+        """
+        slots = self._get_slots(host_key)
+        if not slots.acquire(False):
+            raise ExternalFetchException(
+                "Too many pending fetches from {}, not trying again before "
+                "they complete".format(host_key))
+
+        outcome = {}
+
+        def run():
+            try:
+                outcome['result'] = func(*args, **kwargs)
+            except Exception:  # pylint: disable=broad-except
+                outcome['exc_info'] = sys.exc_info()
+            finally:
+                slots.release()
+
+        thread = threading.Thread(target=run, name='external-fetch-{}'.format(host_key))
+        thread.daemon = True
+        thread.start()
+        thread.join(self.deadline)
+
+        if thread.is_alive():
+            self.log.warning(
+                "Fetch from %s did not complete in %s seconds", host_key, self.deadline)
+            raise ExternalFetchException(
+                "Fetch from {} did not complete in {} seconds".format(host_key, self.deadline))
+        if 'exc_info' in outcome:
+            six.reraise(*outcome['exc_info'])
+        return outcome['result']
+
+    def get_text(self, url, cache=False):
+        """
+        Fetches ``url`` over HTTP using pooled connections and returns the
+        body of the response decoded as UTF-8.
+
+        :param url: the URL to fetch
+        :type url: str
+        :param cache: whether the response can be served from and stored in
+            the cache, only to be used when the resource no longer changes
+        :type cache: bool
+        """
+        if cache:
+            text = self.cache.get(url)
+            if text is not None:
+                return text
+
+        response = self._session.get(url, timeout=self.timeout)
+        response.encoding = "utf-8"
+        # Check if the resource was properly fetched
+        response.raise_for_status()
+        text = response.text
+
+        if cache:
+            self.cache.set(url, text)
+        return text
+
+
+def _get_optional_float(key):
+    try:
+        return conf.getfloat('webserver', key)
+    except (AirflowConfigException, ValueError):
+        return None
+
+
+_fetcher = None
+
+
+def get_fetcher():
+    """Returns the :class:`ExternalFetcher` of the process, creating it on first use."""
+    global _fetcher  # pylint: disable=global-statement
+    if _fetcher is None:
+        _fetcher = ExternalFetcher(
+            timeout=_get_optional_float('log_fetch_timeout_sec'),
+            deadline=_get_optional_float('log_fetch_deadline_sec'),
+            concurrency_per_host=conf.getint('webserver', 'log_fetch_concurrency_per_host'),
+            cache_size=conf.getint('webserver', 'log_fetch_cache_size'),
+            cache_ttl=conf.getint('webserver', 'log_fetch_cache_ttl_sec'),
+        )
+    return _fetcher
@@ -46,6 +46,7 @@ from jinja2 import Template
 
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException
+from airflow.utils.cache import TTLCache
 
 # When killing processes, time to wait after issuing a SIGTERM before issuing a
 # SIGKILL.
@@ -129,6 +130,19 @@ def chunks(items, chunk_size):
         yield items[i:i + chunk_size]
 
 
+def query_chunks(items, chunk_size=None):
+    """
+    Yield successive chunks of a list of items to filter one query each with,
+    of at most ``[scheduler] max_tis_per_query`` items by default. A chunk
+    size of 0 or less means no limit and yields all the items at once.
+    """
+    if chunk_size is None:
+        chunk_size = conf.getint('scheduler', 'max_tis_per_query')
+    if chunk_size <= 0:
+        chunk_size = max(len(items), 1)
+    return chunks(items, chunk_size)
+
+
 def reduce_in_chunks(fn, iterable, initializer, chunk_size=0):
     """
     Reduce the given list of items by splitting it into chunks
@@ -350,6 +364,47 @@ def reap_process_group(pgid, log, sig=signal.SIGTERM,
     return returncodes
 
 
+_compiled_templates = TTLCache(maxsize=conf.getint('core', 'template_cache_size', fallback=1024),
+                               ttl=None)
+
+
+# Settings of a Jinja environment that change the code a template compiles to
+TEMPLATE_COMPILE_OPTIONS = (
+    'block_start_string', 'block_end_string', 'variable_start_string', 'variable_end_string',
+    'comment_start_string', 'comment_end_string', 'line_statement_prefix', 'line_comment_prefix',
+    'trim_blocks', 'lstrip_blocks', 'newline_sequence', 'keep_trailing_newline', 'optimized',
+    'autoescape', 'finalize', 'code_generator_class', 'is_async',
+)
+
+
+def _template_compile_options(jinja_env):
+    return (
+        tuple(getattr(jinja_env, option, None) for option in TEMPLATE_COMPILE_OPTIONS),
+        tuple(sorted(getattr(jinja_env, 'extensions', ()))),
+        tuple(sorted(getattr(jinja_env, 'filters', ()))),
+        tuple(sorted(getattr(jinja_env, 'tests', ()))),
+    )
+
+
+def get_template_from_string(jinja_env, source):
+    """
+    Like ``jinja_env.from_string(source)``, but reuses the code compiled for
+    the same source by any environment with the same compile settings.
+
+    :param jinja_env: Jinja environment the template is rendered in
+    :type jinja_env: jinja2.Environment
+    :param source: template source
+    :type source: str
+    :rtype: jinja2.Template
+    """
+    key = (source, _template_compile_options(jinja_env))
+    code = _compiled_templates.get(key)
+    if code is None:
+        code = jinja_env.compile(source)
+        _compiled_templates.set(key, code)
+    return jinja_env.template_class.from_code(jinja_env, code, jinja_env.make_globals(None))
+
+
 def parse_template_string(template_string):
     if "{{" in template_string:  # jinja mode
         return None, Template(template_string)
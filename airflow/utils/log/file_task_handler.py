@@ -21,12 +21,11 @@ import logging
 import os
 from typing import Optional
 
-import requests
-
 from airflow.configuration import conf
-from airflow.configuration import AirflowConfigException
+from airflow.utils.external_fetcher import get_fetcher
 from airflow.utils.file import mkdirs
 from airflow.utils.helpers import parse_template_string
+from airflow.utils.state import State
 
 
 class FileTaskHandler(logging.Handler):
@@ -118,19 +117,9 @@ class FileTaskHandler(logging.Handler):
             log += "*** Log file does not exist: {}\n".format(location)
             log += "*** Fetching from: {}\n".format(url)
             try:
-                timeout = None  # No timeout
-                try:
-                    timeout = conf.getint('webserver', 'log_fetch_timeout_sec')
-                except (AirflowConfigException, ValueError):
-                    pass
-
-                response = requests.get(url, timeout=timeout)
-                response.encoding = "utf-8"
-
-                # Check if the resource was properly fetched
-                response.raise_for_status()
-
-                log += '\n' + response.text
+                # The log of a finished try no longer changes and can be cached
+                log += '\n' + get_fetcher().get_text(
+                    url, cache=ti.state in State.finished() or ti.try_number > try_number)
             except Exception as e:
                 log += "*** Failed to fetch log file from worker. {}\n".format(str(e))
 
@@ -44,6 +44,7 @@ class State(object):
     FAILED = "failed"
     UP_FOR_RETRY = "up_for_retry"
     UP_FOR_RESCHEDULE = "up_for_reschedule"
+    SENSING = "sensing"  # Handed over to the sensor service
     UPSTREAM_FAILED = "upstream_failed"
     SKIPPED = "skipped"
 
@@ -55,6 +56,7 @@ class State(object):
         SKIPPED,
         UP_FOR_RETRY,
         UP_FOR_RESCHEDULE,
+        SENSING,
         QUEUED,
         NONE,
         SCHEDULED,
@@ -74,6 +76,7 @@ class State(object):
         FAILED: 'red',
         UP_FOR_RETRY: 'gold',
         UP_FOR_RESCHEDULE: 'turquoise',
+        SENSING: 'lightseagreen',
         UPSTREAM_FAILED: 'orange',
         SKIPPED: 'pink',
         REMOVED: 'lightgrey',
@@ -118,5 +121,6 @@ class State(object):
             cls.RUNNING,
             cls.SHUTDOWN,
             cls.UP_FOR_RETRY,
-            cls.UP_FOR_RESCHEDULE
+            cls.UP_FOR_RESCHEDULE,
+            cls.SENSING,
         ]
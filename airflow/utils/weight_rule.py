@@ -27,6 +27,7 @@ class WeightRule(object):
     DOWNSTREAM = 'downstream'
     UPSTREAM = 'upstream'
     ABSOLUTE = 'absolute'
+    CRITICAL_PATH = 'critical_path'
 
     _ALL_WEIGHT_RULES = set()  # type: Set[str]
 
@@ -18,11 +18,68 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import gc
+import importlib
+import time
+
 import setproctitle
 from airflow import settings
+from airflow.configuration import conf
+
+# Time at which the DagBag shared by the preloaded workers was last loaded
+_dagbag_loaded_at = None
 
 
 def post_worker_init(dummy_worker):
     setproctitle.setproctitle(
         settings.GUNICORN_WORKER_READY_PREFIX + setproctitle.getproctitle()
     )
+
+
+def _reload_dagbag():
+    """
+    Replaces the DagBag of the views with a freshly loaded one, so that the
+    workers forked from now on start with the current DAGs.
+    """
+    from airflow import models
+
+    views = importlib.import_module(
+        'airflow.www_rbac.views' if settings.RBAC else 'airflow.www.views')
+    dagbag = models.DagBag(settings.DAGS_FOLDER,
+                           store_serialized_dags=settings.STORE_SERIALIZED_DAGS)
+    if settings.STORE_SERIALIZED_DAGS:
+        dagbag.collect_dags_from_db()
+    views.dagbag = dagbag
+
+
+def pre_fork(dummy_server, dummy_worker):
+    """
+    With ``[webserver] preload_dagbag``, the app (and so its DagBag) is loaded
+    once in the gunicorn master and shared by the workers forked from it.
+    The DagBag is reloaded before forking the first worker of each refresh of
+    the workers, if ``[webserver] worker_refresh_interval`` enables them, and
+    the objects of the master are moved out of reach of the garbage collector
+    so that the workers do not copy the memory pages they share with the
+    master by merely running a collection.
+    """
+    global _dagbag_loaded_at  # pylint: disable=global-statement
+    if not conf.getboolean('webserver', 'preload_dagbag'):
+        return
+
+    now = time.time()
+    # The workers are only refreshed with a positive interval
+    refresh_interval = conf.getint('webserver', 'worker_refresh_interval')
+    if _dagbag_loaded_at is None:
+        # The DagBag was just loaded with the app
+        _dagbag_loaded_at = now
+    elif 0 < refresh_interval <= now - _dagbag_loaded_at:
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+        _reload_dagbag()
+        gc.collect()
+        _dagbag_loaded_at = now
+
+    # Connections opened while loading must not be shared with the workers
+    settings.engine.dispose()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
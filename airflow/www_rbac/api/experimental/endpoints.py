@@ -234,6 +234,46 @@ def task_instance_info(dag_id, execution_date, task_id):
     return jsonify(fields)
 
 
+@api_experimental.route(
+    '/dags/<string:dag_id>/dag_runs/<string:execution_date>/tasks/<string:task_id>'
+    '/predicted_end_date',
+    methods=['GET'])
+@requires_authentication
+def task_instance_predicted_end_date(dag_id, execution_date, task_id):
+    """
+    Returns a JSON with the expected (p50) and worst case (p95) end dates of
+    a task instance, estimated from the durations of the latest successful
+    runs of its task. Both are null when they cannot be estimated.
+    """
+    try:
+        execution_date = timezone.parse(execution_date)
+    except ValueError:
+        error_message = (
+            'Given execution date, {}, could not be identified '
+            'as a date. Example date format: 2015-11-16T14:34:15+00:00'
+            .format(execution_date))
+        _log.info(error_message)
+        response = jsonify({'error': error_message})
+        response.status_code = 400
+
+        return response
+
+    try:
+        info = get_task_instance(dag_id, task_id, execution_date)
+    except AirflowException as err:
+        _log.info(err)
+        response = jsonify(error="{}".format(err))
+        response.status_code = err.status_code
+        return response
+
+    end_dates = info.get_predicted_end_dates()
+    if end_dates is None:
+        return jsonify(state=info.state, expected_end_date=None, worst_case_end_date=None)
+    return jsonify(state=info.state,
+                   expected_end_date=end_dates[0].isoformat(),
+                   worst_case_end_date=end_dates[1].isoformat())
+
+
 @api_experimental.route(
     '/dags/<string:dag_id>/dag_runs/<string:execution_date>',
     methods=['GET'])
@@ -106,6 +106,10 @@ def create_app(config=None, session=None, testing=False, app_name="Airflow"):
             security_manager_class=security_manager_class,
             base_template='airflow/master.html',
             update_perms=conf.getboolean('webserver', 'UPDATE_FAB_PERMS'))
+        # Let the links to the next page of keyset paginated lists carry the
+        # key to seek to
+        from airflow.www_rbac.utils import link_page_filter
+        app.jinja_env.filters['link_page'] = link_page_filter
 
         def init_views(appbuilder):
             from airflow.www_rbac import views
@@ -31,7 +31,7 @@ from past.builtins import basestring
 
 from pygments import highlight, lexers
 from pygments.formatters import HtmlFormatter
-from flask import request, Response, Markup, url_for
+from flask import g, has_request_context, request, Response, Markup, url_for
 from flask_appbuilder.forms import DateTimeField, FieldConverter
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 import flask_appbuilder.models.sqla.filters as fab_sqlafilters
@@ -48,6 +48,10 @@ from airflow.www_rbac.widgets import AirflowDateTimePickerWidget
 
 AUTHENTICATE = conf.getboolean('webserver', 'AUTHENTICATE')
 
+# Prefix of the request argument carrying the last key of the previous page
+# of a KeysetSQLAInterface list
+SEEK_ARG_PREFIX = 'seek_'
+
 DEFAULT_SENSITIVE_VARIABLE_FIELDS = (
     'password',
     'secret',
@@ -457,6 +461,148 @@ class CustomSQLAInterface(SQLAInterface):
     filter_converter_class = UtcAwareFilterConverter
 
 
+class KeysetSQLAInterface(CustomSQLAInterface):
+    """
+    Interface for listing views over very large tables.
+
+    FAB counts every row matching the filters and pages with OFFSET over the
+    full rows, which does not scale to the task_instance and dag_run tables.
+    When the list is ordered by the first of ``keyset_columns`` (which should
+    be backed by an index and uniquely identify a row), this interface seeks
+    to the rows after the last key of the previous page, which the link to
+    the next page carries in its ``seek_<table>`` argument (see
+    :func:`link_page_filter`), and counts at most ``list_view_count_limit``
+    rows. Pages opened without that key, e.g. by jumping to a page number,
+    look up their first key with an OFFSET over the index only. Ordering by
+    any other column falls back to the default FAB behaviour.
+    """
+    def __init__(self, obj, keyset_columns, session=None):
+        super(KeysetSQLAInterface, self).__init__(obj, session=session)
+        self.keyset_columns = keyset_columns
+        self.count_limit = conf.getint('webserver', 'list_view_count_limit')
+        self.seek_arg = SEEK_ARG_PREFIX + obj.__tablename__
+
+    def query(self, filters=None, order_column='', order_direction='',
+              page=None, page_size=None, select_columns=None):
+        if order_column != self.keyset_columns[0]:
+            return super(KeysetSQLAInterface, self).query(
+                filters=filters,
+                order_column=order_column,
+                order_direction=order_direction,
+                page=page,
+                page_size=page_size,
+                select_columns=select_columns)
+
+        descending = order_direction != 'asc'
+        key_columns = [self._get_attr(col_name) for col_name in self.keyset_columns]
+        ordering = [col.desc() if descending else col.asc() for col in key_columns]
+
+        query = self.session.query(self.obj)
+        query = self._query_select_options(query, select_columns)
+        query = self._get_base_query(query=query, filters=filters)
+
+        count = self._get_bounded_count(query, page, page_size)
+
+        if page and page_size:
+            last_key = self._get_seek_key(page, descending)
+            if last_key is not None:
+                query = query.filter(
+                    self._seek_clause(key_columns, last_key, descending, inclusive=False))
+            else:
+                first_key = (
+                    query.with_entities(*key_columns)
+                    .order_by(*ordering)
+                    .offset(page * page_size)
+                    .limit(1)
+                    .first()
+                )
+                if first_key is None:
+                    return count, []
+                query = query.filter(self._seek_clause(key_columns, first_key, descending))
+
+        query = query.order_by(*ordering)
+        if page_size:
+            query = query.limit(page_size)
+        items = query.all()
+
+        if page_size and len(items) == page_size and has_request_context():
+            last_key = [getattr(items[-1], col_name) for col_name in self.keyset_columns]
+            g.setdefault('next_page_seek_args', {})[self.seek_arg] = json.dumps(
+                [(page or 0) + 1, order_direction, last_key],
+                default=lambda value: value.isoformat())
+        return count, items
+
+    def _get_seek_key(self, page, descending):
+        """
+        Returns the key of the last row of the previous page that the request
+        carries, or None if it does not carry one for ``page`` and the
+        requested order.
+        """
+        if not has_request_context() or self.seek_arg not in request.args:
+            return None
+        try:
+            seek_page, seek_direction, last_key = json.loads(request.args[self.seek_arg])
+            if seek_page != page or (seek_direction != 'asc') != descending or \
+                    len(last_key) != len(self.keyset_columns):
+                return None
+            return [
+                timezone.parse(value) if self.is_datetime(col_name) else value
+                for col_name, value in zip(self.keyset_columns, last_key)
+            ]
+        except (TypeError, ValueError):
+            return None
+
+    def _get_bounded_count(self, query, page, page_size):
+        """
+        Counts the rows matched by ``query``, stopping at ``count_limit`` rows
+        (but always far enough to keep the pages around ``page`` reachable).
+        """
+        count_query = query.with_entities(
+            self._get_attr(self.keyset_columns[0])).order_by(None)
+        if self.count_limit > 0:
+            limit = self.count_limit
+            if page_size:
+                limit = max(limit, ((page or 0) + 2) * page_size)
+            count_query = count_query.limit(limit)
+        return self.session.query(sqla.func.count('*')).select_from(
+            count_query.subquery()).scalar()
+
+    @staticmethod
+    def _seek_clause(key_columns, key, descending, inclusive=True):
+        """
+        Builds the row comparison ``key_columns <= key`` (``>=`` when
+        ascending, ``<`` and ``>`` when not ``inclusive``) expanded into plain
+        column comparisons, as row values are not supported by every database.
+        """
+        clauses = []
+        for i, col in enumerate(key_columns):
+            if i == len(key_columns) - 1 and inclusive:
+                last = col <= key[i] if descending else col >= key[i]
+            else:
+                last = col < key[i] if descending else col > key[i]
+            clauses.append(sqla.and_(
+                *[key_columns[j] == key[j] for j in range(i)] + [last]))
+        return sqla.or_(*clauses)
+
+
+def link_page_filter(page, modelview_name):
+    """
+    Replaces the ``link_page`` template filter of FAB: the link to the next
+    page carries the key of the last row of the current page for the
+    :class:`KeysetSQLAInterface` lists to seek to, links to other pages
+    carry none. Arguments are passed like: page_<VIEW_NAME>=<PAGE_NUMBER>
+    """
+    args = request.args.to_dict()
+    for arg in list(args):
+        if arg.startswith(SEEK_ARG_PREFIX):
+            del args[arg]
+    for arg, value in g.get('next_page_seek_args', {}).items():
+        if json.loads(value)[0] == page:
+            args[arg] = value
+    args["page_" + modelview_name] = page
+    return url_for(request.endpoint, **dict(list(request.view_args.items()) + list(args.items())))
+
+
 # This class is used directly (i.e. we cant tell Fab to use a different
 # subclass) so we have no other option than to edit the converstion table in
 # place
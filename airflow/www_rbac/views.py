@@ -60,14 +60,15 @@ from airflow.configuration import conf
 from airflow.api.common.experimental.mark_tasks import (set_dag_run_state_to_success,
                                                         set_dag_run_state_to_failed)
 from airflow.models import Connection, DagModel, DagRun, DagTag, Log, SlaMiss, TaskFail, XCom, errors
-from airflow.exceptions import AirflowException
+from airflow.exceptions import AirflowException, ExternalFetchException
 from airflow.models.dagcode import DagCode
 from airflow.settings import STORE_SERIALIZED_DAGS
 from airflow.ti_deps.dep_context import RUNNING_DEPS, SCHEDULER_QUEUED_DEPS, DepContext
 from airflow.utils import timezone
 from airflow.utils.dates import infer_time_unit, scale_time_units
+from airflow.utils.external_fetcher import get_fetcher
 from airflow.utils.db import provide_session, create_session
-from airflow.utils.helpers import alchemy_to_dict, render_log_filename
+from airflow.utils.helpers import alchemy_to_dict, query_chunks, render_log_filename
 from airflow.utils.state import State
 from airflow._vendor import nvd3
 from airflow.www_rbac import utils as wwwutils
@@ -141,6 +142,24 @@ def get_date_time_num_runs_dag_runs_form_data(request, session, dag):
     }
 
 
+def get_task_instances_chart_query(dag, min_date, base_date, session, *columns):
+    """
+    Returns a query of the ``task_id``, ``execution_date`` and ``columns`` of
+    the task instances of ``dag`` executed between ``min_date`` and
+    ``base_date``, for the charts that would otherwise load every task
+    instance of the period as an ORM object.
+    """
+    TI = models.TaskInstance
+    return (
+        session.query(TI.task_id, TI.execution_date, *columns)
+        .filter(TI.dag_id == dag.dag_id,
+                TI.execution_date >= min_date,
+                TI.execution_date <= base_date,
+                TI.task_id.in_(dag.task_ids))
+        .order_by(TI.execution_date)
+    )
+
+
 ######################################################################################
 #                                    BaseViews
 ######################################################################################
@@ -702,8 +721,14 @@ class Airflow(AirflowBaseView):
                 logs = ["*** Task instance did not exist in the DB\n"]
                 metadata['end_of_log'] = True
             else:
-                logs, metadatas = handler.read(ti, try_number, metadata=metadata)
-                metadata = metadatas[0]
+                try:
+                    logs, metadatas = get_fetcher().call(
+                        ti.hostname or task_log_reader, handler.read,
+                        ti, try_number, metadata=metadata)
+                    metadata = metadatas[0]
+                except ExternalFetchException as e:
+                    logs = ["*** {}\n".format(str(e))]
+                    metadata['end_of_log'] = True
             return logs, metadata
 
         try:
@@ -1685,32 +1710,32 @@ class Airflow(AirflowBaseView):
         x = defaultdict(list)
         cum_y = defaultdict(list)
 
-        tis = dag.get_task_instances(
-            start_date=min_date, end_date=base_date, session=session)
+        TI = models.TaskInstance
         TF = TaskFail
-        ti_fails = (
-            session.query(TF)
+        fails_totals = (
+            session.query(TF.task_id, TF.execution_date,
+                          func.sum(TF.duration).label('duration'))
                    .filter(TF.dag_id == dag.dag_id,  # noqa
                            TF.execution_date >= min_date,
                            TF.execution_date <= base_date,
-                           TF.task_id.in_([t.task_id for t in dag.tasks]))
-                   .all()  # noqa
+                           TF.task_id.in_(dag.task_ids))
+                   .group_by(TF.task_id, TF.execution_date)
+                   .subquery()
+        )
+        tis = (
+            get_task_instances_chart_query(
+                dag, min_date, base_date, session, TI.duration, fails_totals.c.duration)
+            .outerjoin(fails_totals, and_(fails_totals.c.task_id == TI.task_id,
+                                          fails_totals.c.execution_date == TI.execution_date))
+            .all()
         )
 
-        fails_totals = defaultdict(int)
-        for tf in ti_fails:
-            dict_key = (tf.dag_id, tf.task_id, tf.execution_date)
-            if tf.duration:
-                fails_totals[dict_key] += tf.duration
-
-        for ti in tis:
-            if ti.duration:
-                dttm = wwwutils.epoch(ti.execution_date)
-                x[ti.task_id].append(dttm)
-                y[ti.task_id].append(float(ti.duration))
-                fails_dict_key = (ti.dag_id, ti.task_id, ti.execution_date)
-                fails_total = fails_totals[fails_dict_key]
-                cum_y[ti.task_id].append(float(ti.duration + fails_total))
+        for task_id, execution_date, duration, fails_total in tis:
+            if duration:
+                dttm = wwwutils.epoch(execution_date)
+                x[task_id].append(dttm)
+                y[task_id].append(float(duration))
+                cum_y[task_id].append(float(duration + (fails_total or 0)))
 
         # determine the most relevant time unit for the set of task instance
         # durations for the DAG
@@ -1732,8 +1757,7 @@ class Airflow(AirflowBaseView):
                                     y=scale_time_units(cum_y[task.task_id],
                                                        cum_y_unit))
 
-        dates = sorted(list({ti.execution_date for ti in tis}))
-        max_date = max([ti.execution_date for ti in tis]) if dates else None
+        max_date = tis[-1].execution_date if tis else None
 
         session.commit()
 
@@ -1789,23 +1813,22 @@ class Airflow(AirflowBaseView):
             name="lineChart", x_is_date=True, y_axis_format='d', height=chart_height,
             width="1200")
 
+        y = defaultdict(list)
+        x = defaultdict(list)
+
+        TI = models.TaskInstance
+        tis = get_task_instances_chart_query(
+            dag, min_date, base_date, session, TI._try_number).all()
+        for task_id, execution_date, prev_attempted_tries in tis:
+            x[task_id].append(wwwutils.epoch(execution_date))
+            # y value should reflect completed tries to have a 0 baseline.
+            y[task_id].append(prev_attempted_tries)
+
         for task in dag.tasks:
-            y = []
-            x = []
-            for ti in task.get_task_instances(start_date=min_date,
-                                              end_date=base_date,
-                                              session=session):
-                dttm = wwwutils.epoch(ti.execution_date)
-                x.append(dttm)
-                # y value should reflect completed tries to have a 0 baseline.
-                y.append(ti.prev_attempted_tries)
-            if x:
-                chart.add_serie(name=task.task_id, x=x, y=y)
+            if x[task.task_id]:
+                chart.add_serie(name=task.task_id, x=x[task.task_id], y=y[task.task_id])
 
-        tis = dag.get_task_instances(
-            start_date=min_date, end_date=base_date, session=session)
-        tries = sorted(list({ti.try_number for ti in tis}))
-        max_date = max([ti.execution_date for ti in tis]) if tries else None
+        max_date = tis[-1].execution_date if tis else None
 
         session.commit()
 
@@ -1854,21 +1877,25 @@ class Airflow(AirflowBaseView):
         chart_height = wwwutils.get_chart_height(dag)
         chart = nvd3.lineChart(
             name="lineChart", x_is_date=True, height=chart_height, width="1200")
-        y = {}
-        x = {}
-        for task in dag.tasks:
-            task_id = task.task_id
-            y[task_id] = []
-            x[task_id] = []
-            for ti in task.get_task_instances(start_date=min_date, end_date=base_date):
-                ts = ti.execution_date
+        y = defaultdict(list)
+        x = defaultdict(list)
+
+        TI = models.TaskInstance
+        tis = get_task_instances_chart_query(
+            dag, min_date, base_date, session, TI.end_date).all()
+        # Every task instance of a run lands relative to the same schedule
+        landing_bases = {}
+        for task_id, execution_date, end_date in tis:
+            if execution_date not in landing_bases:
+                ts = execution_date
                 if dag.schedule_interval and dag.following_schedule(ts):
                     ts = dag.following_schedule(ts)
-                if ti.end_date:
-                    dttm = wwwutils.epoch(ti.execution_date)
-                    secs = (ti.end_date - ts).total_seconds()
-                    x[task_id].append(dttm)
-                    y[task_id].append(secs)
+                landing_bases[execution_date] = ts
+            if end_date:
+                dttm = wwwutils.epoch(execution_date)
+                secs = (end_date - landing_bases[execution_date]).total_seconds()
+                x[task_id].append(dttm)
+                y[task_id].append(secs)
 
         # determine the most relevant time unit for the set of landing times
         # for the DAG
@@ -1882,10 +1909,7 @@ class Airflow(AirflowBaseView):
                 chart.add_serie(name=task.task_id, x=x[task.task_id],
                                 y=scale_time_units(y[task.task_id], y_unit))
 
-        tis = dag.get_task_instances(
-            start_date=min_date, end_date=base_date, session=session)
-        dates = sorted(list({ti.execution_date for ti in tis}))
-        max_date = max([ti.execution_date for ti in tis]) if dates else None
+        max_date = tis[-1].execution_date if tis else None
 
         session.commit()
 
@@ -2075,8 +2099,11 @@ class Airflow(AirflowBaseView):
         task = dag.get_task(task_id)
 
         try:
-            url = task.get_extra_links(dttm, link_name)
-        except ValueError as err:
+            # The host an extra link contacts is only known to the code of
+            # its operator, so pending calls are limited per operator
+            url = get_fetcher().call(
+                'extra_links.{}'.format(task.task_type), task.get_extra_links, dttm, link_name)
+        except (ValueError, ExternalFetchException) as err:
             response = jsonify({'url': None, 'error': str(err)})
             response.status_code = 404
             return response
@@ -2199,6 +2226,7 @@ class AirflowModelView(ModelView):
     page_size = PAGE_SIZE
 
     CustomSQLAInterface = wwwutils.CustomSQLAInterface
+    KeysetSQLAInterface = wwwutils.KeysetSQLAInterface
 
 
 class SlaMissModelView(AirflowModelView):
@@ -2254,11 +2282,19 @@ class XComModelView(AirflowModelView):
 
     def pre_add(self, item):
         item.execution_date = timezone.make_aware(item.execution_date)
-        item.value = XCom.serialize_value(item.value)
+        item.value = XCom.serialize_value(item.value,
+                                          key=item.key,
+                                          task_id=item.task_id,
+                                          dag_id=item.dag_id,
+                                          execution_date=item.execution_date)
 
     def pre_update(self, item):
         item.execution_date = timezone.make_aware(item.execution_date)
-        item.value = XCom.serialize_value(item.value)
+        item.value = XCom.serialize_value(item.value,
+                                          key=item.key,
+                                          task_id=item.task_id,
+                                          dag_id=item.dag_id,
+                                          execution_date=item.execution_date)
 
 
 class ConnectionModelView(AirflowModelView):
@@ -2506,7 +2542,8 @@ class JobModelView(AirflowModelView):
 class DagRunModelView(AirflowModelView):
     route_base = '/dagrun'
 
-    datamodel = AirflowModelView.CustomSQLAInterface(models.DagRun)
+    datamodel = AirflowModelView.KeysetSQLAInterface(
+        models.DagRun, keyset_columns=['execution_date', 'dag_id'])
 
     base_permissions = ['can_list', 'can_add']
 
@@ -2640,7 +2677,8 @@ class LogModelView(AirflowModelView):
 class TaskInstanceModelView(AirflowModelView):
     route_base = '/taskinstance'
 
-    datamodel = AirflowModelView.CustomSQLAInterface(models.TaskInstance)
+    datamodel = AirflowModelView.KeysetSQLAInterface(
+        models.TaskInstance, keyset_columns=['execution_date', 'dag_id', 'task_id'])
 
     base_permissions = ['can_list']
 
@@ -2654,7 +2692,7 @@ class TaskInstanceModelView(AirflowModelView):
     search_columns = ['state', 'dag_id', 'task_id', 'execution_date', 'hostname',
                       'queue', 'pool', 'operator', 'start_date', 'end_date']
 
-    base_order = ('job_id', 'asc')
+    base_order = ('execution_date', 'desc')
 
     base_filters = [['dag_id', DagFilter, lambda: []]]
 
@@ -2712,9 +2750,17 @@ class TaskInstanceModelView(AirflowModelView):
     @provide_session
     def set_task_instance_state(self, tis, target_state, session=None):
         try:
+            TI = models.TaskInstance
             count = len(tis)
-            for ti in tis:
-                ti.set_state(target_state, session=session)
+            now = timezone.utcnow()
+            for tis_chunk in query_chunks(tis):
+                filter_for_tis = [and_(TI.dag_id == ti.dag_id,
+                                       TI.task_id == ti.task_id,
+                                       TI.execution_date == ti.execution_date)
+                                  for ti in tis_chunk]
+                session.query(TI).filter(or_(*filter_for_tis)).update(
+                    {TI.state: target_state, TI.start_date: now, TI.end_date: now},
+                    synchronize_session=False)
             session.commit()
             flash("{count} task instances were set to '{target_state}'".format(
                 count=count, target_state=target_state))
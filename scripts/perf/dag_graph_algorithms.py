@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Times the graph algorithms run on every parse of a DAG file for DAGs of
+different shapes:
+
+* wide: one root task with all other tasks directly downstream of it
+* deep: a single chain of tasks
+* diamond: layers of ten tasks, each task depending on the whole previous layer
+
+To Run:
+    $ python scripts/perf/dag_graph_algorithms.py [num_tasks]
+
+The number of tasks defaults to 10000.
+"""
+from __future__ import print_function
+
+import logging
+import sys
+import time
+
+from airflow.models import DAG
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils import timezone
+
+NUM_TASKS = 10000
+DIAMOND_WIDTH = 10
+START_DATE = timezone.datetime(2020, 1, 1)
+
+
+def create_dag(shape, num_tasks):
+    """
+    Creates a DAG of ``num_tasks`` DummyOperators with the given shape.
+    """
+    dag = DAG('perf_{}'.format(shape), start_date=START_DATE, schedule_interval=None)
+    tasks = [DummyOperator(task_id='task_{}'.format(i), dag=dag) for i in range(num_tasks)]
+    if shape == 'wide':
+        tasks[0].set_downstream(tasks[1:])
+    elif shape == 'deep':
+        for upstream, downstream in zip(tasks, tasks[1:]):
+            upstream.set_downstream(downstream)
+    elif shape == 'diamond':
+        layers = [tasks[i:i + DIAMOND_WIDTH] for i in range(0, num_tasks, DIAMOND_WIDTH)]
+        for upstream_layer, downstream_layer in zip(layers, layers[1:]):
+            for task in downstream_layer:
+                task.set_upstream(upstream_layer)
+    return dag
+
+
+def timed(func):
+    """
+    Returns the number of seconds it takes to run ``func``.
+    """
+    start = time.time()
+    func()
+    return time.time() - start
+
+
+def main():
+    num_tasks = NUM_TASKS
+    if len(sys.argv) > 1:
+        try:
+            num_tasks = int(sys.argv[1])
+            if num_tasks < 1:
+                raise ValueError
+        except ValueError:
+            logging.error('Specify a positive integer for the number of tasks.')
+            sys.exit(1)
+
+    print('Graph algorithms on DAGs of {} tasks (seconds)'.format(num_tasks))
+    print('###################')
+    print('{:<10} {:>16} {:>12} {:>16} {:>10} {:>16}'.format(
+        'shape', 'topological_sort', 'test_cycle', 'flat_relatives', 'sub_dag',
+        'priority_weights'))
+    for shape in ('wide', 'deep', 'diamond'):
+        dag = create_dag(shape, num_tasks)
+        root = dag.task_dict['task_0']
+        print('{:<10} {:>16.3f} {:>12.3f} {:>16.3f} {:>10.3f} {:>16.3f}'.format(
+            shape,
+            timed(dag.topological_sort),
+            timed(dag.test_cycle),
+            timed(lambda: root.get_flat_relative_ids(upstream=False)),
+            timed(lambda: dag.sub_dag('^task_', include_downstream=True)),
+            timed(dag.get_priority_weights)))
+    print('###################')
+
+
+if __name__ == "__main__":
+    main()
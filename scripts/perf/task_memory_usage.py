@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Reports the resident memory used per task by the objects the scheduler
+keeps for every task: the operators, the SimpleDag built from them and
+the SimpleTaskInstances passed between the scheduler processes.
+
+To Run:
+    $ python scripts/perf/task_memory_usage.py [num_tasks]
+
+The number of tasks defaults to 10000.
+"""
+from __future__ import print_function
+
+import gc
+import logging
+import sys
+
+import psutil
+
+from airflow.models import DAG, TaskInstance
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.dag_processing import SimpleDag, SimpleTaskInstance
+
+NUM_TASKS = 10000
+EXECUTION_DATE = timezone.datetime(2020, 1, 1)
+
+
+def resident_bytes():
+    """
+    Returns the resident set size of this process after a full collection.
+    """
+    gc.collect()
+    return psutil.Process().memory_info().rss
+
+
+def measure(label, num_tasks, func):
+    """
+    Runs ``func`` and prints the growth of the resident memory per task.
+    The result of ``func`` is returned so it stays referenced.
+    """
+    before = resident_bytes()
+    result = func()
+    used = resident_bytes() - before
+    print('{:<24} {:>12} bytes {:>10.1f} bytes/task'.format(
+        label, used, float(used) / num_tasks))
+    return result
+
+
+def main():
+    num_tasks = NUM_TASKS
+    if len(sys.argv) > 1:
+        try:
+            num_tasks = int(sys.argv[1])
+            if num_tasks < 1:
+                raise ValueError
+        except ValueError:
+            logging.error('Specify a positive integer for the number of tasks.')
+            sys.exit(1)
+
+    dag = DAG('perf_task_memory', start_date=EXECUTION_DATE, schedule_interval=None)
+
+    def create_operators():
+        return [DummyOperator(task_id='task_{}'.format(i), dag=dag)
+                for i in range(num_tasks)]
+
+    def create_task_instances():
+        return [TaskInstance(task, EXECUTION_DATE) for task in dag.tasks]
+
+    print('Resident memory for {} tasks'.format(num_tasks))
+    print('###################')
+    operators = measure('BaseOperator', num_tasks, create_operators)
+    simple_dag = measure('SimpleDag', num_tasks, lambda: SimpleDag(dag))
+    tis = measure('TaskInstance', num_tasks, create_task_instances)
+    simple_tis = measure('SimpleTaskInstance', num_tasks,
+                         lambda: [SimpleTaskInstance(ti) for ti in tis])
+    print('###################')
+    return operators, simple_dag, simple_tis
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,7 @@ from airflow.utils.db import create_session, provide_session
 from airflow.utils.dates import days_ago
 from airflow.utils.state import State
 from airflow.models import DagRun
+from tests.test_utils.config import conf_vars
 from tests.test_utils.db import clear_db_runs
 
 DEV_NULL = "/dev/null"
@@ -202,6 +203,21 @@ class TestMarkTasks(unittest.TestCase):
         self.verify_state(self.dag1, task_ids, [self.execution_dates[0]],
                           State.SUCCESS, snapshot)
 
+    @conf_vars({('scheduler', 'max_tis_per_query'): '2'})
+    def test_mark_upstream_in_chunks(self):
+        snapshot = TestMarkTasks.snapshot_state(self.dag1, self.execution_dates)
+        task = self.dag1.get_task("run_after_loop")
+        task_ids = list(task.get_flat_relative_ids(upstream=True)) + [task.task_id]
+
+        altered = set_state(tasks=[task], execution_date=self.execution_dates[0],
+                            upstream=True, downstream=False, future=False,
+                            past=False, state=State.SUCCESS, commit=True)
+        self.assertEqual(len(altered), 4)
+        self.assertEqual({ti.task_id for ti in altered}, set(task_ids))
+        self.assertTrue(all(ti.state == State.SUCCESS for ti in altered))
+        self.verify_state(self.dag1, task_ids, [self.execution_dates[0]],
+                          State.SUCCESS, snapshot)
+
     def test_mark_tasks_future(self):
         # set one task to success towards end of scheduled dag runs
         snapshot = TestMarkTasks.snapshot_state(self.dag1, self.execution_dates)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from airflow.contrib.xcom.file_xcom_backend import FileXComBackend, XComFileReference
+from airflow.utils import timezone
+from tests.test_utils.config import conf_vars
+from tests.test_utils.db import clear_db_xcom
+
+EXECUTION_DATE = timezone.datetime(2020, 1, 1)
+
+
+class TestFileXComBackend(unittest.TestCase):
+
+    def setUp(self):
+        clear_db_xcom()
+        self.xcom_path = tempfile.mkdtemp()
+        self.conf_vars = conf_vars({
+            ('core', 'xcom_file_backend_path'): self.xcom_path,
+            ('core', 'xcom_file_backend_threshold'): '100',
+            ('core', 'enable_xcom_pickling'): 'False',
+        })
+        self.conf_vars.__enter__()
+
+    def tearDown(self):
+        self.conf_vars.__exit__(None, None, None)
+        shutil.rmtree(self.xcom_path)
+        clear_db_xcom()
+
+    def set_xcom(self, value, key='key'):
+        FileXComBackend.set(key=key, value=value, execution_date=EXECUTION_DATE,
+                            task_id='task', dag_id='dag')
+
+    def get_xcom(self, key='key'):
+        return FileXComBackend.get_one(execution_date=EXECUTION_DATE, key=key,
+                                       task_id='task', dag_id='dag')
+
+    def test_small_value_stored_in_db(self):
+        self.set_xcom({'a': 1})
+
+        self.assertEqual({'a': 1}, self.get_xcom())
+        self.assertEqual([], os.listdir(self.xcom_path))
+
+    def test_large_value_offloaded(self):
+        value = ['x' * 10] * 100
+        self.set_xcom(value, key='large/key')
+
+        reference = self.get_xcom(key='large/key')
+        self.assertIsInstance(reference, XComFileReference)
+        self.assertTrue(os.path.isfile(FileXComBackend.get_full_path(reference.path)))
+        self.assertEqual(value, reference.value)
+
+        xcom = FileXComBackend.get_many(execution_date=EXECUTION_DATE, dag_ids='dag')[0]
+        self.assertIsInstance(xcom.value, XComFileReference)
+
+    def test_stream_large_value(self):
+        value = 'y' * 1000
+        self.set_xcom(value)
+
+        reference = self.get_xcom()
+        chunks = list(reference.iter_chunks(chunk_size=64))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.dumps(value).encode('UTF-8'), b''.join(chunks))
+        self.assertEqual(reference.size, sum(len(chunk) for chunk in chunks))
+
+    def test_set_overwrites_file(self):
+        self.set_xcom('a' * 200)
+        self.set_xcom('b' * 200)
+
+        self.assertEqual('b' * 200, self.get_xcom().value)
+
+    def test_reference_outside_of_path(self):
+        with self.assertRaises(ValueError):
+            FileXComBackend.get_full_path('../outside')
+
+
+if __name__ == '__main__':
+    unittest.main()
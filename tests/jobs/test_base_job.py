@@ -23,6 +23,7 @@ import unittest
 
 from sqlalchemy.exc import OperationalError
 
+from airflow.exceptions import AirflowException
 from airflow.jobs import BaseJob
 from airflow.utils import timezone
 from airflow.utils.db import create_session
@@ -120,3 +121,21 @@ class BaseJobTest(unittest.TestCase):
             job.heartbeat()
 
             self.assertEqual(job.latest_heartbeat, when, "attriubte not updated when heartbeat fails")
+
+    def test_heartbeat_kills_job_shut_down_externally(self):
+        job = self.TestJob(None, heartrate=10, state=State.RUNNING)
+        with create_session() as session:
+            session.add(job)
+            session.commit()
+            session.expunge(job)
+            session.query(BaseJob).filter(BaseJob.id == job.id).update(
+                {BaseJob.state: State.SHUTDOWN})
+
+        with self.assertRaises(AirflowException):
+            job.heartbeat()
+
+        with create_session() as session:
+            stored_job = session.query(BaseJob).filter(BaseJob.id == job.id).one()
+            self.assertEqual(State.SHUTDOWN, stored_job.state)
+            self.assertEqual(job.latest_heartbeat, stored_job.latest_heartbeat)
+            self.assertIsNotNone(stored_job.end_date)
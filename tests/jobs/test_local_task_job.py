@@ -18,6 +18,7 @@
 # under the License.
 #
 
+import datetime
 import multiprocessing
 import time
 import unittest
@@ -33,7 +34,7 @@ from airflow.utils import timezone
 from airflow.utils.db import create_session
 from airflow.utils.net import get_hostname
 from airflow.utils.state import State
-from tests.compat import patch
+from tests.compat import MagicMock, patch
 from tests.test_core import TEST_DAG_FOLDER
 from tests.test_utils.db import clear_db_runs
 from tests.test_utils.mock_executor import MockExecutor
@@ -117,6 +118,65 @@ class LocalTaskJobTest(unittest.TestCase):
         mock_pid.return_value = 2
         self.assertRaises(AirflowException, job1.heartbeat_callback)
 
+    @patch('os.getpid')
+    def test_heartbeat_loads_ti_state(self, mock_pid):
+        mock_pid.return_value = 1
+        dag = DAG('test_heartbeat_loads_ti_state', start_date=DEFAULT_DATE)
+        with dag:
+            op1 = DummyOperator(task_id='op1')
+        dag.clear()
+        with create_session() as session:
+            dr = dag.create_dagrun(run_id="test",
+                                   state=State.RUNNING,
+                                   execution_date=DEFAULT_DATE,
+                                   start_date=DEFAULT_DATE,
+                                   session=session)
+            ti = dr.get_task_instance(task_id=op1.task_id, session=session)
+            ti.state = State.RUNNING
+            ti.hostname = get_hostname()
+            ti.pid = 1
+            session.merge(ti)
+
+        job1 = LocalTaskJob(task_instance=ti, executor=SequentialExecutor())
+        job1.task_runner = MagicMock()
+        with create_session() as session:
+            job1.state = State.RUNNING
+            session.add(job1)
+            session.commit()
+            session.expunge(job1)
+            session.query(TI).filter(TI.dag_id == ti.dag_id).update({TI.pid: 2})
+
+        with patch.object(TI, 'refresh_from_db') as mock_refresh_from_db:
+            with self.assertRaisesRegexp(AirflowException, 'PID of job runner does not match'):
+                job1.heartbeat()
+        mock_refresh_from_db.assert_not_called()
+        self.assertEqual(2, job1.task_instance.pid)
+
+    @patch('airflow.jobs.local_task_job.time.sleep')
+    @patch('airflow.jobs.local_task_job.get_task_runner')
+    def test_long_running_task_exit_is_noticed_between_heartbeats(
+            self, mock_get_task_runner, mock_sleep):
+        dag = DAG('test_long_running_task_exit', start_date=DEFAULT_DATE)
+        with dag:
+            op1 = DummyOperator(task_id='op1')
+        ti = TI(task=op1, execution_date=DEFAULT_DATE)
+        # The task exits after three polls
+        mock_get_task_runner.return_value.return_code.side_effect = [None, None, None, 0]
+
+        job = LocalTaskJob(task_instance=ti, executor=SequentialExecutor())
+        job.heartrate = 1
+        # The task has run for long enough to heartbeat as rarely as possible
+        job.start_date = timezone.utcnow() - datetime.timedelta(hours=1)
+        job.latest_heartbeat = timezone.utcnow()
+        with patch.object(TI, '_check_and_change_state_before_execution', return_value=True):
+            with patch.object(LocalTaskJob, 'heartbeat') as mock_heartbeat:
+                job._execute()
+
+        mock_heartbeat.assert_not_called()
+        self.assertEqual(3, mock_sleep.call_count)
+        for args, _ in mock_sleep.call_args_list:
+            self.assertLessEqual(args[0], 1)
+
     @patch('os.getpid')
     def test_heartbeat_failed_fast(self, mock_getpid):
         """
@@ -1979,6 +1979,61 @@ class SchedulerJobTest(unittest.TestCase):
         scheduler = SchedulerJob(dag_ids=['test_sla_miss'], log=mock_log)
         scheduler.manage_slas(dag=dag, session=session)
 
+    def test_manage_slas_skips_checks_until_next_sla_check(self):
+        test_start_date = days_ago(2)
+        dag = DAG(dag_id='test_sla_miss', default_args={'start_date': test_start_date})
+        task = DummyOperator(task_id='dummy', dag=dag, owner='airflow',
+                             sla=datetime.timedelta())
+        with create_session() as session:
+            session.merge(DagModel(dag_id=dag.dag_id))
+            session.merge(TaskInstance(task=task, execution_date=test_start_date,
+                                       state=State.SUCCESS))
+        scheduler = SchedulerJob(dag_id='test_sla_miss', num_runs=1)
+
+        def get_sla_misses():
+            with create_session() as session:
+                return [sla_miss.execution_date for sla_miss in session.query(SlaMiss)]
+
+        scheduler.manage_slas(dag=dag)
+        self.assertEqual([test_start_date + timedelta(days=1)], get_sla_misses())
+        with create_session() as session:
+            self.assertEqual(test_start_date + timedelta(days=3),
+                             session.query(DagModel).get(dag.dag_id).next_sla_check)
+
+        # Nothing can newly be late before the next SLA check
+        clear_db_sla_miss()
+        scheduler.manage_slas(dag=dag)
+        self.assertEqual([], get_sla_misses())
+
+        # unless the SLAs change
+        task.sla = datetime.timedelta(seconds=1)
+        scheduler.manage_slas(dag=dag)
+        self.assertEqual([test_start_date + timedelta(days=1)], get_sla_misses())
+
+    def test_manage_slas_notifies_before_next_sla_check(self):
+        test_start_date = days_ago(2)
+        sla_callback = mock.MagicMock(side_effect=[Exception('Could not notify'), None])
+        dag = DAG(dag_id='test_sla_miss', sla_miss_callback=sla_callback,
+                  default_args={'start_date': test_start_date})
+        task = DummyOperator(task_id='dummy', dag=dag, owner='airflow',
+                             sla=datetime.timedelta())
+        with create_session() as session:
+            session.merge(DagModel(dag_id=dag.dag_id))
+            session.merge(TaskInstance(task=task, execution_date=test_start_date,
+                                       state=State.SUCCESS))
+        scheduler = SchedulerJob(dag_id='test_sla_miss', num_runs=1)
+
+        scheduler.manage_slas(dag=dag)
+        self.assertEqual(1, sla_callback.call_count)
+
+        # The SLA miss is not detected again, but its notification is retried
+        with mock.patch.object(scheduler, '_record_sla_misses') as record_sla_misses:
+            scheduler.manage_slas(dag=dag)
+        record_sla_misses.assert_not_called()
+        self.assertEqual(2, sla_callback.call_count)
+        with create_session() as session:
+            self.assertTrue(session.query(SlaMiss).one().notification_sent)
+
     def test_scheduler_executor_overflow(self):
         """
         Test that tasks that are set back to scheduled and removed from the executor
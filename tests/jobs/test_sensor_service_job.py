@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import threading
+import unittest
+from datetime import timedelta
+from multiprocessing.pool import ThreadPool
+
+import mock
+
+from airflow.exceptions import AirflowSensorTimeout
+from airflow.jobs import SensorServiceJob
+from airflow.models import DAG, SensorInstance, TaskDuration, TaskInstance
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.sensors.base_sensor_operator import BaseSensorOperator
+from airflow.utils import timezone
+from airflow.utils.db import create_session
+from airflow.utils.state import State
+from tests.test_utils.config import conf_vars
+from tests.test_utils.db import clear_db_runs
+
+DEFAULT_DATE = timezone.datetime(2016, 1, 1)
+TEST_DAG_ID = 'test_sensor_service'
+SENSOR_SERVICE_CONFIG = {
+    ('sensor_service', 'enabled'): 'True',
+    ('sensor_service', 'sensors_enabled'): 'ServiceSensor',
+}
+
+
+class ServiceSensor(BaseSensorOperator):
+    """Sensor whose criteria is met once its target is in ``met_targets``."""
+    poke_context_fields = ('target',)
+    met_targets = set()
+    failing_targets = set()
+    hanging_targets = set()
+    release = threading.Event()
+    pokes = []
+    poke_threads = set()
+    prefetches = []
+
+    @classmethod
+    def prefetch(cls, poke_contexts):
+        ServiceSensor.prefetches.append(sorted(context['target'] for context in poke_contexts))
+
+    def __init__(self, target, **kwargs):
+        super(ServiceSensor, self).__init__(**kwargs)
+        self.target = target
+
+    def poke(self, context):
+        ServiceSensor.pokes.append((self.target, context['execution_date']))
+        ServiceSensor.poke_threads.add(threading.current_thread().name)
+        if self.target in ServiceSensor.failing_targets:
+            raise ValueError('Poke failed')
+        if self.target in ServiceSensor.hanging_targets:
+            ServiceSensor.release.wait()
+        return self.target in ServiceSensor.met_targets
+
+
+class TestSensorServiceJob(unittest.TestCase):
+
+    def setUp(self):
+        self._clear_db()
+        ServiceSensor.met_targets = set()
+        ServiceSensor.failing_targets = set()
+        ServiceSensor.hanging_targets = set()
+        ServiceSensor.release = threading.Event()
+        ServiceSensor.pokes = []
+        ServiceSensor.prefetches = []
+        ServiceSensor.poke_threads = set()
+
+    def tearDown(self):
+        self._clear_db()
+
+    @staticmethod
+    def _clear_db():
+        with create_session() as session:
+            session.query(SensorInstance).delete()
+            session.query(TaskDuration).delete()
+        clear_db_runs()
+
+    @conf_vars(SENSOR_SERVICE_CONFIG)
+    def _hand_over_sensors(self, targets, sensor_kwargs=None):
+        dag = DAG(TEST_DAG_ID, start_date=DEFAULT_DATE)
+        sensors = [
+            ServiceSensor(task_id='sensor_{}'.format(i), target=target, dag=dag,
+                          poke_interval=60, **(sensor_kwargs[i] if sensor_kwargs else {}))
+            for i, target in enumerate(targets)
+        ]
+        dag.create_dagrun(run_id='manual__', execution_date=DEFAULT_DATE,
+                          start_date=timezone.utcnow(), state=State.RUNNING)
+        for sensor in sensors:
+            sensor.run(start_date=DEFAULT_DATE, end_date=DEFAULT_DATE, ignore_ti_state=True)
+        ServiceSensor.pokes = []
+        ServiceSensor.poke_threads = set()
+        tis = [TaskInstance(sensor, DEFAULT_DATE) for sensor in sensors]
+        for ti in tis:
+            ti.refresh_from_db()
+        return tis
+
+    @staticmethod
+    def _get_states(tis):
+        for ti in tis:
+            ti.refresh_from_db()
+        return [ti.state for ti in tis]
+
+    def test_sensor_is_handed_over(self):
+        ti, = self._hand_over_sensors(['a'])
+
+        self.assertEqual(State.SENSING, ti.state)
+        with create_session() as session:
+            sensor_instance = session.query(SensorInstance).one()
+            self.assertEqual((ti.dag_id, ti.task_id, ti.execution_date),
+                             (sensor_instance.dag_id, sensor_instance.task_id,
+                              sensor_instance.execution_date))
+            self.assertEqual({'target': 'a'}, sensor_instance.get_poke_context())
+            self.assertEqual(60, sensor_instance.poke_interval)
+            self.assertEqual(
+                'tests.jobs.test_sensor_service_job.ServiceSensor', sensor_instance.operator)
+
+    def test_sensor_is_not_handed_over_when_disabled(self):
+        dag = DAG(TEST_DAG_ID, start_date=DEFAULT_DATE)
+        sensor = ServiceSensor(task_id='sensor', target='a', dag=dag, poke_interval=0, timeout=0)
+
+        with self.assertRaises(AirflowSensorTimeout):
+            sensor.run(start_date=DEFAULT_DATE, end_date=DEFAULT_DATE, ignore_ti_state=True)
+        with create_session() as session:
+            self.assertEqual(0, session.query(SensorInstance).count())
+
+    @conf_vars(SENSOR_SERVICE_CONFIG)
+    def test_sensors_with_callbacks_or_email_alerts_are_not_handed_over(self):
+        dag = DAG(TEST_DAG_ID, start_date=DEFAULT_DATE)
+
+        def callback(context):
+            pass
+
+        self.assertTrue(ServiceSensor(
+            task_id='plain', target='a', dag=dag).is_sensor_service_compatible())
+        self.assertTrue(ServiceSensor(
+            task_id='email_without_alerts', target='a', dag=dag, email='test@test.com',
+            email_on_failure=False, email_on_retry=False).is_sensor_service_compatible())
+        for task_id, kwargs in [
+            ('on_failure_callback', {'on_failure_callback': callback}),
+            ('on_retry_callback', {'on_retry_callback': callback}),
+            ('on_success_callback', {'on_success_callback': callback}),
+            ('email_on_failure', {'email': 'test@test.com', 'email_on_retry': False}),
+            ('email_on_retry', {'email': 'test@test.com', 'email_on_failure': False}),
+        ]:
+            sensor = ServiceSensor(task_id=task_id, target='a', dag=dag, **kwargs)
+            self.assertFalse(sensor.is_sensor_service_compatible(), task_id)
+
+    def test_sensors_with_same_criteria_share_a_poke(self):
+        tis = self._hand_over_sensors(['a', 'a', 'b'])
+        ServiceSensor.met_targets = {'a'}
+
+        SensorServiceJob(num_runs=1, loop_interval=0).run()
+
+        self.assertEqual([('a', DEFAULT_DATE), ('b', DEFAULT_DATE)], sorted(ServiceSensor.pokes))
+        self.assertEqual([State.SUCCESS, State.SUCCESS, State.SENSING], self._get_states(tis))
+        with create_session() as session:
+            self.assertEqual([tis[2].task_id],
+                             [si.task_id for si in session.query(SensorInstance)])
+        self.assertEqual({'sensor_0', 'sensor_1'}, set(TaskDuration.get_for_dag(TEST_DAG_ID)))
+
+    @conf_vars({('sensor_service', 'parallelism'): '4'})
+    def test_sensors_are_poked_on_threads(self):
+        tis = self._hand_over_sensors(['a', 'b', 'c', 'd'])
+        ServiceSensor.met_targets = {'a', 'c'}
+        ServiceSensor.failing_targets = {'d'}
+
+        SensorServiceJob(num_runs=1).run_sensing_loop()
+
+        self.assertEqual(4, len(ServiceSensor.pokes))
+        self.assertNotIn(threading.current_thread().name, ServiceSensor.poke_threads)
+        self.assertEqual([State.SUCCESS, State.SENSING, State.SUCCESS, State.FAILED],
+                         self._get_states(tis))
+
+    @conf_vars({('sensor_service', 'parallelism'): '4'})
+    def test_poke_threads_are_created_once_per_job(self):
+        self._hand_over_sensors(['a', 'b'])
+        job = SensorServiceJob(num_runs=1, loop_interval=0)
+
+        with mock.patch('airflow.jobs.sensor_service_job.ThreadPool',
+                        wraps=ThreadPool) as thread_pool:
+            job.run_sensing_loop()
+            job._next_poke_dates.clear()
+            job.run()
+
+        thread_pool.assert_called_once_with(4)
+        self.assertEqual(4, len(ServiceSensor.pokes))
+        self.assertIsNone(job._poke_pool)
+
+    @conf_vars({('sensor_service', 'parallelism'): '16',
+                ('core', 'sql_alchemy_pool_enabled'): 'True',
+                ('core', 'sql_alchemy_pool_size'): '3'})
+    def test_parallelism_is_limited_by_the_connection_pool(self):
+        self.assertEqual(3, SensorServiceJob().parallelism)
+
+    @conf_vars({('sensor_service', 'parallelism'): '1'})
+    def test_sensors_are_poked_one_by_one_without_parallelism(self):
+        self._hand_over_sensors(['a', 'b'])
+
+        SensorServiceJob(num_runs=1).run_sensing_loop()
+
+        self.assertEqual(2, len(ServiceSensor.pokes))
+        self.assertEqual(1, len(ServiceSensor.poke_threads))
+        self.assertNotIn(threading.current_thread().name, ServiceSensor.poke_threads)
+
+    @conf_vars({('sensor_service', 'parallelism'): '4'})
+    def test_hanging_poke_does_not_hold_up_other_sensors(self):
+        tis = self._hand_over_sensors(['hang', 'a'], sensor_kwargs=[{'timeout': 1}, {}])
+        ServiceSensor.met_targets = {'a'}
+        ServiceSensor.hanging_targets = {'hang'}
+        job = SensorServiceJob(num_runs=1)
+        try:
+            job.run_sensing_loop()
+            self.assertEqual([State.SENSING, State.SUCCESS], self._get_states(tis))
+
+            # The hanging poke is not made again, and its sensor still times out
+            job._next_poke_dates.clear()
+            with create_session() as session:
+                session.query(SensorInstance).update(
+                    {SensorInstance.start_date: timezone.utcnow() - timedelta(minutes=2)})
+            job.run_sensing_loop()
+            self.assertEqual(['hang', 'a'], [target for target, _ in ServiceSensor.pokes])
+            self.assertEqual([State.FAILED, State.SUCCESS], self._get_states(tis))
+        finally:
+            ServiceSensor.release.set()
+            job._close_poke_pool()
+
+    def test_sensors_are_prefetched_once_per_loop(self):
+        self._hand_over_sensors(['a', 'a', 'b'])
+        job = SensorServiceJob(num_runs=1, loop_interval=0)
+
+        job.run_sensing_loop()
+        job.run_sensing_loop()
+
+        self.assertEqual([['a', 'b']], ServiceSensor.prefetches)
+
+    def test_sensors_are_poked_after_poke_interval(self):
+        self._hand_over_sensors(['a'])
+        job = SensorServiceJob(num_runs=1, loop_interval=0)
+
+        job.run_sensing_loop()
+        job.run_sensing_loop()
+        self.assertEqual(1, len(ServiceSensor.pokes))
+
+        for hashcode in job._next_poke_dates:
+            job._next_poke_dates[hashcode] = timezone.utcnow() - timedelta(seconds=1)
+        job.run_sensing_loop()
+        self.assertEqual(2, len(ServiceSensor.pokes))
+
+    def test_poke_exception_fails_sensors(self):
+        tis = self._hand_over_sensors(['a', 'a'])
+        ServiceSensor.failing_targets = {'a'}
+
+        SensorServiceJob(num_runs=1).run_sensing_loop()
+
+        self.assertEqual([State.FAILED, State.FAILED], self._get_states(tis))
+
+    def test_timed_out_sensors(self):
+        tis = self._hand_over_sensors(['a', 'b', 'c'], sensor_kwargs=[
+            {'timeout': 60},
+            {'timeout': 60, 'soft_fail': True},
+            {'timeout': 60, 'retries': 1},
+        ])
+        with create_session() as session:
+            session.query(SensorInstance).update(
+                {SensorInstance.start_date: timezone.utcnow() - timedelta(minutes=2)})
+
+        SensorServiceJob(num_runs=1).run_sensing_loop()
+
+        self.assertEqual(
+            [State.FAILED, State.SKIPPED, State.UP_FOR_RETRY],
+            self._get_states(tis))
+        self.assertEqual([], ServiceSensor.pokes)
+
+    def test_timed_out_soft_fail_sensors_skip_downstream_tasks(self):
+        dag = DAG(TEST_DAG_ID, start_date=DEFAULT_DATE)
+        sensor = ServiceSensor(task_id='sensor', target='a', dag=dag,
+                               poke_interval=60, timeout=60, soft_fail=True)
+        downstream = DummyOperator(task_id='downstream', dag=dag)
+        transitive = DummyOperator(task_id='transitive', dag=dag)
+        unrelated = DummyOperator(task_id='unrelated', dag=dag)
+        sensor >> downstream >> transitive
+        dag.create_dagrun(run_id='manual__', execution_date=DEFAULT_DATE,
+                          start_date=timezone.utcnow(), state=State.RUNNING)
+        with conf_vars(SENSOR_SERVICE_CONFIG):
+            sensor.run(start_date=DEFAULT_DATE, end_date=DEFAULT_DATE, ignore_ti_state=True)
+        with create_session() as session:
+            session.query(SensorInstance).update(
+                {SensorInstance.start_date: timezone.utcnow() - timedelta(minutes=2)})
+
+        with mock.patch.object(SensorServiceJob, '_get_dag', return_value=dag):
+            SensorServiceJob(num_runs=1).run_sensing_loop()
+
+        tis = [TaskInstance(task, DEFAULT_DATE)
+               for task in (sensor, downstream, transitive, unrelated)]
+        self.assertEqual([State.SKIPPED, State.SKIPPED, State.SKIPPED, None],
+                         self._get_states(tis))
+
+    def test_sensors_exceeding_execution_timeout_fail(self):
+        tis = self._hand_over_sensors(['a', 'b'], sensor_kwargs=[
+            {'soft_fail': True, 'execution_timeout': timedelta(hours=1)},
+            {'retries': 1, 'execution_timeout': timedelta(hours=1)},
+        ])
+        with create_session() as session:
+            for sensor_instance in session.query(SensorInstance):
+                self.assertAlmostEqual(
+                    timezone.utcnow() + timedelta(hours=1), sensor_instance.execution_deadline,
+                    delta=timedelta(minutes=1))
+            session.query(SensorInstance).update(
+                {SensorInstance.execution_deadline: timezone.utcnow() - timedelta(seconds=1)})
+
+        SensorServiceJob(num_runs=1).run_sensing_loop()
+
+        self.assertEqual([State.FAILED, State.UP_FOR_RETRY], self._get_states(tis))
+        self.assertEqual([], ServiceSensor.pokes)
+
+    def test_stale_sensor_instances_are_removed(self):
+        ti, = self._hand_over_sensors(['a'])
+        ti.set_state(State.NONE)
+
+        SensorServiceJob(num_runs=1).run_sensing_loop()
+
+        self.assertEqual([], ServiceSensor.pokes)
+        with create_session() as session:
+            self.assertEqual(0, session.query(SensorInstance).count())
@@ -35,11 +35,12 @@ from mock import patch
 from airflow import models, settings
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException, AirflowDagCycleException
-from airflow.models import DAG, DagModel, TaskInstance as TI
+from airflow.models import DAG, DagModel, DagTag, TaskDuration, TaskInstance as TI
 from airflow.operators.dummy_operator import DummyOperator
 from airflow.operators.subdag_operator import SubDagOperator
 from airflow.utils import timezone
 from airflow.utils.dag_processing import list_py_file_paths
+from airflow.utils.db import create_session
 from airflow.utils.state import State
 from airflow.utils.weight_rule import WeightRule
 from tests.models import DEFAULT_DATE
@@ -207,6 +208,29 @@ class DagTest(unittest.TestCase):
 
         self.assertEqual(tuple(), dag.topological_sort())
 
+    def test_graph_algorithms_on_long_chain(self):
+        dag = DAG('dag', start_date=DEFAULT_DATE)
+        with dag:
+            tasks = [DummyOperator(task_id='task_{}'.format(i)) for i in range(3000)]
+        for upstream, downstream in zip(tasks, tasks[1:]):
+            upstream.set_downstream(downstream)
+
+        self.assertEqual(tuple(tasks), dag.topological_sort())
+        self.assertFalse(dag.test_cycle())
+        self.assertEqual({task.task_id for task in tasks[1:]},
+                         tasks[0].get_flat_relative_ids(upstream=False))
+        self.assertEqual({task.task_id for task in tasks[:-1]},
+                         tasks[-1].get_flat_relative_ids(upstream=True))
+
+        sub_dag = dag.sub_dag('task_2999$', include_upstream=True)
+        self.assertEqual(len(tasks), len(sub_dag.tasks))
+
+        tasks[-1].set_downstream(tasks[0])
+        with self.assertRaises(AirflowDagCycleException):
+            dag.test_cycle()
+        with self.assertRaises(AirflowException):
+            dag.topological_sort()
+
     def test_dag_naive_start_date_string(self):
         DAG('DAG', default_args={'start_date': '2019-06-01'})
 
@@ -332,6 +356,61 @@ class DagTest(unittest.TestCase):
             with self.assertRaises(AirflowException):
                 DummyOperator(task_id='should_fail', weight_rule='no rule')
 
+    def test_priority_weights_count_shared_relatives_once(self):
+        with DAG('dag', start_date=DEFAULT_DATE) as dag:
+            root = DummyOperator(task_id='root', priority_weight=2)
+            left = DummyOperator(task_id='left', priority_weight=3)
+            right = DummyOperator(task_id='right', priority_weight=5,
+                                  weight_rule=WeightRule.UPSTREAM)
+            leaf = DummyOperator(task_id='leaf', priority_weight=7,
+                                 weight_rule=WeightRule.UPSTREAM)
+            root >> [left, right] >> leaf
+
+        self.assertEqual({'root': 17, 'left': 10, 'right': 7, 'leaf': 17},
+                         dag.get_priority_weights())
+
+    def test_priority_weights_are_cleared_when_relations_change(self):
+        with DAG('dag', start_date=DEFAULT_DATE) as dag:
+            first = DummyOperator(task_id='first')
+            second = DummyOperator(task_id='second')
+        self.assertEqual(1, first.priority_weight_total)
+
+        first >> second
+        self.assertEqual(2, first.priority_weight_total)
+
+        DummyOperator(task_id='third', dag=dag) << second
+        self.assertEqual(3, first.priority_weight_total)
+
+        sub_dag = dag.sub_dag('second', include_upstream=False, include_downstream=False)
+        self.assertEqual(1, sub_dag.task_dict['second'].priority_weight_total)
+
+    def test_critical_path_priority_weights(self):
+        with DAG('test_critical_path_priority_weights', start_date=DEFAULT_DATE) as dag:
+            tasks = {
+                task_id: DummyOperator(task_id=task_id, weight_rule=WeightRule.CRITICAL_PATH)
+                for task_id in ('start', 'short', 'long', 'end', 'new')
+            }
+            tasks['start'] >> [tasks['short'], tasks['long']] >> tasks['end']
+            tasks['long'] >> tasks['new']
+
+        durations = {'start': [10, 20], 'short': [30], 'long': [100, 150, 200], 'end': [9]}
+        with create_session() as session:
+            session.query(TaskDuration).filter(TaskDuration.dag_id == dag.dag_id).delete()
+            for task_id, task_durations in durations.items():
+                for duration in task_durations:
+                    ti = TI(tasks[task_id], DEFAULT_DATE)
+                    ti.duration = duration
+                    TaskDuration.record(ti, session=session)
+        try:
+            # The median durations are 10, 30, 150 and 9 seconds
+            dag.clear_priority_weights()
+            self.assertEqual(
+                {'start': 170, 'short': 40, 'long': 160, 'end': 10, 'new': 1},
+                dag.get_priority_weights())
+        finally:
+            with create_session() as session:
+                session.query(TaskDuration).filter(TaskDuration.dag_id == dag.dag_id).delete()
+
     def test_get_num_task_instances(self):
         test_dag_id = 'test_get_num_task_instances_dag'
         test_task_id = 'task_1'
@@ -692,6 +771,41 @@ class DagTest(unittest.TestCase):
         self.assertEqual(orm_subdag.safe_dag_id, 'dag__dot__subtask')
         self.assertEqual(orm_subdag.fileloc, orm_dag.fileloc)
 
+    def test_bulk_sync_to_db(self):
+        session = settings.Session()
+        dags = [
+            DAG('dag-bulk-sync-{}'.format(i), start_date=DEFAULT_DATE, tags=['test-dag'])
+            for i in range(4)
+        ]
+        DAG.bulk_sync_to_db(dags[:2], session=session)
+        with mock.patch.object(session, 'commit', wraps=session.commit) as mock_commit:
+            DAG.bulk_sync_to_db(dags, session=session)
+            mock_commit.assert_called_once_with()
+
+        dag_ids = {dag.dag_id for dag in dags}
+        self.assertEqual(
+            dag_ids,
+            {row[0] for row in session.query(DagModel.dag_id).filter(
+                DagModel.dag_id.in_(dag_ids))})
+        self.assertEqual(
+            {(dag_id, 'test-dag') for dag_id in dag_ids},
+            set(session.query(DagTag.dag_id, DagTag.name).filter(
+                DagTag.dag_id.in_(dag_ids))))
+
+        dags[0].tags = ['test-dag', 'test-dag2']
+        dags[1].tags = None
+        DAG.bulk_sync_to_db(dags, session=session)
+        self.assertEqual(
+            {(dags[0].dag_id, 'test-dag'), (dags[0].dag_id, 'test-dag2'),
+             (dags[2].dag_id, 'test-dag'), (dags[3].dag_id, 'test-dag')},
+            set(session.query(DagTag.dag_id, DagTag.name).filter(
+                DagTag.dag_id.in_(dag_ids))))
+
+        session.query(DagTag).filter(DagTag.dag_id.in_(dag_ids)).delete(synchronize_session=False)
+        session.query(DagModel).filter(DagModel.dag_id.in_(dag_ids)).delete(synchronize_session=False)
+        session.commit()
+        session.close()
+
     @patch('airflow.models.dag.timezone.utcnow')
     def test_sync_to_db_default_view(self, mock_now):
         dag = DAG(
@@ -172,3 +172,37 @@ class TestDagCode(unittest.TestCase):
                     self.assertEqual(new_result.fileloc, example_dag.fileloc)
                     self.assertEqual(new_result.source_code, "# dummy code")
                     self.assertGreater(new_result.last_updated, result.last_updated)
+
+    @conf_vars({('core', 'store_dag_code'): 'True'})
+    def test_db_code_not_updated_when_content_unchanged(self):
+        """Test if DagCode is not written again when only the mtime of a DAG file changed"""
+        example_dag = make_example_dags(example_dags_module).get('example_bash_operator')
+        example_dag.sync_to_db()
+
+        with create_session() as session:
+            result = session.query(DagCode) \
+                .filter(DagCode.fileloc == example_dag.fileloc) \
+                .one()
+            self.assertEqual(DagCode.dag_source_code_hash(result.source_code),
+                             result.source_code_hash)
+
+        with patch('airflow.models.dagcode.os.path.getmtime') as mock_mtime, \
+                patch('airflow.models.dagcode.Stats') as mock_stats:
+            mock_mtime.return_value = pendulum.instance(
+                result.last_updated + timedelta(seconds=1)).timestamp()
+            DagCode.bulk_sync_to_db([example_dag.fileloc])
+
+            mock_stats.incr.assert_called_once_with('dag_code.skipped_writes')
+
+            with create_session() as session:
+                new_result = session.query(DagCode) \
+                    .filter(DagCode.fileloc == example_dag.fileloc) \
+                    .one()
+                self.assertEqual(new_result.source_code, result.source_code)
+                self.assertEqual(new_result.last_updated,
+                                 result.last_updated + timedelta(seconds=1))
+
+            # The file is not read again until it is modified again
+            with patch('airflow.models.dagcode.DagCode._get_code_from_file') as mock_code:
+                DagCode.bulk_sync_to_db([example_dag.fileloc])
+                mock_code.assert_not_called()
@@ -21,12 +21,15 @@
 
 import unittest
 
+from tests.compat import mock
+
 from airflow import example_dags as example_dags_module
 from airflow.serialization.serialized_objects import SerializedDAG
 from airflow.models import DagBag
 from airflow.models.dagcode import DagCode
 from airflow.models.serialized_dag import SerializedDagModel as SDM
 from airflow.utils import db
+from tests.test_utils.config import conf_vars
 
 
 # To move it to a shared module.
@@ -75,6 +78,43 @@ class SerializedDagModelTest(unittest.TestCase):
                 # Verifies JSON schema.
                 SerializedDAG.validate_schema(result.data)
 
+    def test_write_dag_skips_unchanged_dag(self):
+        """A DAG is only written again when its serialized form changed."""
+        example_dags = make_example_dags(example_dags_module)
+        dag = example_dags['example_bash_operator']
+
+        with mock.patch('airflow.models.serialized_dag.Stats') as mock_stats:
+            self.assertTrue(SDM.write_dag(dag))
+            self.assertFalse(SDM.write_dag(dag))
+        mock_stats.incr.assert_has_calls([
+            mock.call('serialized_dag.writes'), mock.call('serialized_dag.skipped_writes')])
+
+        dag._description = 'changed'
+        self.assertTrue(SDM.write_dag(dag))
+        self.assertEqual('changed', SDM.get(dag.dag_id).dag.description)
+
+    def test_dag_hash_is_stable(self):
+        """The hash does not depend on the iteration order of sets."""
+        example_dags = make_example_dags(example_dags_module)
+        dag = example_dags['example_bash_operator']
+        dag_hash = SDM(dag).dag_hash
+
+        for task in dag.tasks:
+            task._downstream_task_ids = set(reversed(sorted(task.downstream_task_ids)))
+        self.assertEqual(dag_hash, SDM(dag).dag_hash)
+
+    @conf_vars({('core', 'compress_serialized_dags'): 'True'})
+    def test_write_compressed_dag(self):
+        """DAGs can be written compressed and read back."""
+        example_dags = make_example_dags(example_dags_module)
+        dag = example_dags['example_bash_operator']
+        SDM.write_dag(dag)
+
+        row = SDM.get(dag.dag_id)
+        self.assertIsNone(row.data)
+        self.assertIsNotNone(row.data_compressed)
+        self.assertEqual(set(dag.task_dict), set(row.dag.task_dict))
+
     def test_read_dags(self):
         """DAGs can be read from database."""
         example_dags = self._write_example_dags()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Unit tests for TaskDuration."""
+
+import unittest
+from datetime import timedelta
+
+import mock
+from freezegun import freeze_time
+from sqlalchemy.orm import Query
+
+from airflow.models import DAG, Log, TaskDuration, TaskInstance
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.db import create_session
+from airflow.utils.state import State
+from tests.test_utils.config import conf_vars
+
+DEFAULT_DATE = timezone.datetime(2016, 1, 1)
+
+
+class TestTaskDuration(unittest.TestCase):
+
+    def setUp(self):
+        self.dag = DAG('test_task_duration', start_date=DEFAULT_DATE)
+        self.task = DummyOperator(task_id='op', dag=self.dag)
+        self._clear_db()
+
+    def tearDown(self):
+        self._clear_db()
+
+    @staticmethod
+    def _clear_db():
+        with create_session() as session:
+            session.query(TaskDuration).delete()
+
+    def _record(self, durations):
+        for duration in durations:
+            ti = TaskInstance(self.task, DEFAULT_DATE)
+            ti.duration = duration
+            with create_session() as session:
+                TaskDuration.record(ti, session=session)
+
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 21)]
+        self.assertEqual(10, TaskDuration.percentile(values, 50))
+        self.assertEqual(19, TaskDuration.percentile(values, 95))
+        self.assertEqual(7, TaskDuration.percentile([7], 95))
+        self.assertEqual(0, TaskDuration.percentile([], 50))
+
+    @conf_vars({('scheduler', 'task_duration_history_size'): '3'})
+    def test_record_keeps_latest_durations(self):
+        self._record([100, 1, 2, 3])
+
+        task_duration = TaskDuration.get_for_dag(self.dag.dag_id)['op']
+        self.assertEqual([1, 2, 3], task_duration.get_durations())
+        self.assertEqual(2, task_duration.p50)
+        self.assertEqual(3, task_duration.p95)
+
+    def test_record_when_another_task_instance_inserted_the_row(self):
+        self._record([10])
+        ti = TaskInstance(self.task, DEFAULT_DATE)
+        ti.duration = 20
+
+        with create_session() as session:
+            session.add(Log(State.SUCCESS, ti))
+            # The row was inserted after the lookup of this task instance
+            with mock.patch.object(Query, 'first', return_value=None):
+                TaskDuration.record(ti, session=session)
+
+        task_duration = TaskDuration.get_for_dag(self.dag.dag_id)['op']
+        self.assertEqual([10, 20], task_duration.get_durations())
+        with create_session() as session:
+            self.assertEqual(1, session.query(Log).filter(Log.dag_id == self.dag.dag_id).count())
+            session.query(Log).filter(Log.dag_id == self.dag.dag_id).delete()
+
+    def test_predicted_end_dates(self):
+        ti = TaskInstance(self.task, DEFAULT_DATE, state=State.RUNNING)
+        ti.start_date = DEFAULT_DATE
+        self.assertIsNone(ti.get_predicted_end_dates())
+
+        self._record([10, 20, 30])
+        with freeze_time(DEFAULT_DATE + timedelta(seconds=15)):
+            self.assertEqual(
+                (DEFAULT_DATE + timedelta(seconds=20), DEFAULT_DATE + timedelta(seconds=30)),
+                ti.get_predicted_end_dates())
+        with freeze_time(DEFAULT_DATE + timedelta(seconds=60)):
+            now = timezone.utcnow()
+            self.assertEqual((now, now), ti.get_predicted_end_dates())
+
+        ti.state = State.SUCCESS
+        ti.end_date = DEFAULT_DATE + timedelta(seconds=5)
+        self.assertEqual((ti.end_date, ti.end_date), ti.get_predicted_end_dates())
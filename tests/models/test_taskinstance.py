@@ -39,8 +39,8 @@ from airflow.operators.bash_operator import BashOperator
 from airflow.operators.dummy_operator import DummyOperator
 from airflow.operators.python_operator import PythonOperator
 from airflow.sensors.base_sensor_operator import BaseSensorOperator
-from airflow.ti_deps.dep_context import REQUEUEABLE_DEPS, RUNNABLE_STATES, RUNNING_DEPS
-from airflow.ti_deps.deps.base_ti_dep import TIDepStatus
+from airflow.ti_deps.dep_context import DepContext, REQUEUEABLE_DEPS, RUNNABLE_STATES, RUNNING_DEPS
+from airflow.ti_deps.deps.base_ti_dep import BaseTIDep, TIDepStatus
 from airflow.ti_deps.deps.trigger_rule_dep import TriggerRuleDep
 from airflow.utils import timezone
 from airflow.utils.db import create_session, provide_session
@@ -745,6 +745,61 @@ class TaskInstanceTest(unittest.TestCase):
         trs = TaskReschedule.find_for_task_instance(ti)
         self.assertFalse(trs)
 
+    def test_rescheduled_try_evaluates_task_deps(self):
+        dag = models.DAG(dag_id='test_rescheduled_try_evaluates_task_deps',
+                         start_date=DEFAULT_DATE)
+        upstream = DummyOperator(task_id='upstream', dag=dag)
+        sensor = PythonSensor(task_id='sensor', mode='reschedule',
+                              python_callable=lambda: False, dag=dag)
+        upstream >> sensor
+
+        with create_session() as session:
+            upstream_ti = TI(task=upstream, execution_date=DEFAULT_DATE)
+            upstream_ti.state = State.FAILED
+            session.merge(upstream_ti)
+        ti = TI(task=sensor, execution_date=DEFAULT_DATE)
+        self.assertFalse(ti._check_and_change_state_before_execution())
+
+        start_date = DEFAULT_DATE + datetime.timedelta(minutes=1)
+        with create_session() as session:
+            ti.state = State.UP_FOR_RESCHEDULE
+            session.merge(ti)
+            session.flush()
+            session.add(TaskReschedule(sensor, DEFAULT_DATE, ti.try_number, start_date,
+                                       start_date, start_date))
+        # The task dependencies are still evaluated when the try resumes
+        self.assertFalse(ti._check_and_change_state_before_execution())
+        self.assertEqual(State.UP_FOR_RESCHEDULE, ti.state)
+
+        upstream_ti.set_state(State.SUCCESS)
+        self.assertTrue(ti._check_and_change_state_before_execution())
+        self.assertEqual(State.RUNNING, ti.state)
+        self.assertEqual(start_date, ti.start_date)
+
+    def test_are_dependencies_met_stops_at_cheapest_failed_dep(self):
+        evaluated = []
+
+        class FailingDep(BaseTIDep):
+            def _get_dep_statuses(self, ti, session, dep_context=None):
+                evaluated.append(self.COST)
+                yield self._failing_status(reason='Failed')
+
+        class CheapDep(FailingDep):
+            COST = 0
+
+        class ExpensiveDep(FailingDep):
+            COST = 2
+
+        dag = DAG('test_dep_order', start_date=DEFAULT_DATE)
+        ti = TI(DummyOperator(task_id='op', dag=dag), DEFAULT_DATE)
+        dep_context = DepContext(deps={ExpensiveDep(), CheapDep()}, include_task_deps=False)
+
+        self.assertFalse(ti.are_dependencies_met(dep_context=dep_context))
+        self.assertEqual([0], evaluated)
+
+        self.assertEqual(2, len(list(ti.get_failed_dep_statuses(dep_context=dep_context))))
+        self.assertEqual([0, 0, 2], evaluated)
+
     def test_depends_on_past(self):
         dag = DAG(
             dag_id='test_depends_on_past',
@@ -980,6 +1035,30 @@ class TaskInstanceTest(unittest.TestCase):
             None
         )
 
+    def test_xcom_pushes_are_visible_while_task_runs(self):
+        dag = models.DAG(dag_id='test_xcom_visible_while_running')
+        pulled = {}
+
+        def push_and_pull(ti, **_):
+            ti.xcom_push(key='job_id', value='job-1')
+            pulled['execute'] = ti.xcom_pull(task_ids='push_and_pull', key='job_id')
+
+        def on_success_callback(context):
+            pulled['callback'] = context['ti'].xcom_pull(task_ids='push_and_pull', key='job_id')
+
+        task = PythonOperator(
+            task_id='push_and_pull',
+            dag=dag,
+            python_callable=push_and_pull,
+            provide_context=True,
+            on_success_callback=on_success_callback,
+            owner='airflow',
+            start_date=datetime.datetime(2017, 1, 1))
+        ti = TI(task=task, execution_date=datetime.datetime(2017, 1, 1))
+        ti.run()
+
+        self.assertEqual({'execute': 'job-1', 'callback': 'job-1'}, pulled)
+
     def test_post_execute_hook(self):
         """
         Test that post_execute hook is called with the Operator's result.
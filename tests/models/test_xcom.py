@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+
+from sqlalchemy import event
+
+from airflow import settings
+from airflow.models.xcom import BaseXCom, XCom, resolve_xcom_backend
+from airflow.utils import timezone
+from airflow.utils.db import create_session
+from tests.test_utils.config import conf_vars
+from tests.test_utils.db import clear_db_xcom
+
+
+class CustomXCom(BaseXCom):
+    @staticmethod
+    def serialize_value(value, key=None, task_id=None, dag_id=None, execution_date=None):
+        return BaseXCom.serialize_value('custom-{}'.format(value))
+
+
+class TestXCom(unittest.TestCase):
+
+    def setUp(self):
+        clear_db_xcom()
+
+    def tearDown(self):
+        clear_db_xcom()
+
+    def test_default_backend(self):
+        self.assertIs(XCom, BaseXCom)
+
+    @conf_vars({('core', 'xcom_backend'): 'tests.models.test_xcom.CustomXCom'})
+    def test_resolve_xcom_class(self):
+        self.assertIs(resolve_xcom_backend(), CustomXCom)
+
+    @conf_vars({('core', 'xcom_backend'): 'airflow.models.Variable'})
+    def test_resolve_xcom_class_not_subclass(self):
+        with self.assertRaises(TypeError):
+            resolve_xcom_backend()
+
+    def test_custom_backend_set_and_get(self):
+        execution_date = timezone.datetime(2020, 1, 1)
+        CustomXCom.set(key='key', value='value', execution_date=execution_date,
+                       task_id='task', dag_id='dag')
+
+        self.assertEqual('custom-value', CustomXCom.get_one(
+            execution_date=execution_date, key='key', task_id='task', dag_id='dag'))
+        xcoms = XCom.get_many(execution_date=execution_date, dag_ids='dag')
+        self.assertEqual(['custom-value'], [xcom.value for xcom in xcoms])
+
+    def test_set_many(self):
+        execution_date = timezone.datetime(2020, 1, 1)
+        XCom.set(key='a', value='old', execution_date=execution_date, task_id='task', dag_id='dag')
+        XCom.set(key='c', value='kept', execution_date=execution_date, task_id='task', dag_id='dag')
+
+        with create_session() as session:
+            XCom.set_many({'a': 'new', 'b': [1, 2]}, execution_date=execution_date,
+                          task_id='task', dag_id='dag', session=session)
+
+        xcoms = XCom.get_many(execution_date=execution_date, key=None, dag_ids='dag')
+        self.assertEqual({'a': 'new', 'b': [1, 2], 'c': 'kept'},
+                         {xcom.key: xcom.value for xcom in xcoms})
+
+    @conf_vars({('scheduler', 'max_tis_per_query'): '2'})
+    def test_get_latest_by_task_id(self):
+        execution_date = timezone.datetime(2020, 1, 2)
+        prior_date = timezone.datetime(2020, 1, 1)
+        for task_id in ['t1', 't2', 't3']:
+            XCom.set(key='key', value='prior-' + task_id, execution_date=prior_date,
+                     task_id=task_id, dag_id='dag')
+        for task_id in ['t1', 't2']:
+            XCom.set(key='key', value=task_id, execution_date=execution_date,
+                     task_id=task_id, dag_id='dag')
+        XCom.set(key='key', value='older-t3', execution_date=timezone.datetime(2019, 12, 31),
+                 task_id='t3', dag_id='dag')
+
+        statements = []
+
+        def count_statement(*args, **kwargs):
+            statements.append(args)
+
+        event.listen(settings.engine, 'before_cursor_execute', count_statement)
+        try:
+            values = XCom.get_latest_by_task_id(
+                execution_date=execution_date, task_ids=['t1', 't2', 't3', 't4'],
+                key='key', dag_id='dag')
+        finally:
+            event.remove(settings.engine, 'before_cursor_execute', count_statement)
+
+        self.assertEqual({'t1': 't1', 't2': 't2'}, values)
+        # Two chunks of task ids to find the XComs, one chunk of ids to load them
+        self.assertEqual(3, len(statements))
+
+        statements = []
+        event.listen(settings.engine, 'before_cursor_execute', count_statement)
+        try:
+            values = XCom.get_latest_by_task_id(
+                execution_date=execution_date, task_ids=['t1', 't3'], key='key', dag_id='dag',
+                include_prior_dates=True)
+        finally:
+            event.remove(settings.engine, 'before_cursor_execute', count_statement)
+        self.assertEqual({'t1': 't1', 't3': 'prior-t3'}, values)
+        # Only the rows at the latest execution date of each task are loaded
+        self.assertIn('max(xcom.execution_date)', statements[0][2].lower())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,8 +19,12 @@
 import unittest
 from tests.compat import mock
 
+from airflow.exceptions import AirflowException
 from airflow.models import Variable
-from airflow.secrets import ensure_secrets_loaded, get_connections, get_variable, initialize_secrets_backends
+from airflow.secrets import (
+    ensure_secrets_loaded, get_connections, get_secrets_cache, get_variable, initialize_secrets_backends,
+    invalidate_secrets_cache,
+)
 from tests.test_utils.config import conf_vars
 from tests.test_utils.db import clear_db_variables
 
@@ -120,5 +124,56 @@ class TestVariableFromSecrets(unittest.TestCase):
         self.assertEqual("new", variable_value)
 
 
+class TestSecretsCache(unittest.TestCase):
+
+    def setUp(self):
+        invalidate_secrets_cache()
+        clear_db_variables()
+
+    def tearDown(self):
+        invalidate_secrets_cache()
+        clear_db_variables()
+
+    def test_cache_disabled_by_default(self):
+        self.assertIsNone(get_secrets_cache())
+
+    def test_ensure_secrets_loaded_reuses_backends(self):
+        self.assertIs(ensure_secrets_loaded(), ensure_secrets_loaded())
+
+    @conf_vars({("secrets", "cache_ttl_seconds"): "60"})
+    @mock.patch("airflow.secrets.metastore.MetastoreBackend.get_variable")
+    @mock.patch("airflow.secrets.environment_variables.EnvironmentVariablesBackend.get_variable")
+    def test_get_variable_cached(self, mock_env_get, mock_meta_get):
+        mock_env_get.return_value = None
+        mock_meta_get.return_value = "value"
+
+        self.assertEqual("value", get_variable("fake_var_key"))
+        self.assertEqual("value", get_variable("fake_var_key"))
+
+        mock_meta_get.assert_called_once_with(key="fake_var_key")
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1}, get_secrets_cache().stats())
+
+    @conf_vars({("secrets", "cache_ttl_seconds"): "60"})
+    @mock.patch("airflow.secrets.metastore.MetastoreBackend.get_connections")
+    @mock.patch("airflow.secrets.environment_variables.EnvironmentVariablesBackend.get_connections")
+    def test_missing_connection_cached(self, mock_env_get, mock_meta_get):
+        mock_env_get.return_value = []
+        mock_meta_get.return_value = []
+
+        for _ in range(2):
+            with self.assertRaises(AirflowException):
+                get_connections("fake_conn_id")
+
+        mock_meta_get.assert_called_once_with(conn_id="fake_conn_id")
+
+    @conf_vars({("secrets", "cache_ttl_seconds"): "60"})
+    def test_variable_set_invalidates_cache(self):
+        self.assertEqual("default", Variable.get("test_var", default_var="default"))
+        Variable.set("test_var", "value")
+        self.assertEqual("value", Variable.get("test_var"))
+        Variable.delete("test_var")
+        self.assertEqual("default", Variable.get("test_var", default_var="default"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -18,6 +18,8 @@
 # under the License.
 import unittest
 from datetime import timedelta, time
+
+import mock
 import pytest
 
 from airflow import DAG, exceptions, settings
@@ -29,6 +31,7 @@ from airflow.sensors.external_task_sensor import ExternalTaskMarker, ExternalTas
 from airflow.sensors.time_sensor import TimeSensor
 from airflow.utils.state import State
 from airflow.utils.timezone import datetime
+from tests.test_utils.db import clear_db_runs
 
 DEFAULT_DATE = datetime(2015, 1, 1)
 TEST_DAG_ID = 'unit_test_dag'
@@ -316,6 +319,46 @@ exit 0
                 ignore_ti_state=True
             )
 
+    def test_prefetched_external_states_are_shared(self):
+        clear_db_runs()
+        self.addCleanup(clear_db_runs)
+        self.test_time_sensor()
+        other_dag = DAG('other_dag', default_args=self.args, schedule_interval='@once')
+        other_dag.create_dagrun(
+            run_id='test',
+            start_date=DEFAULT_DATE,
+            execution_date=DEFAULT_DATE,
+            state=State.RUNNING)
+        task_key = (TEST_DAG_ID, TEST_TASK_ID, DEFAULT_DATE)
+        dag_key = ('other_dag', None, DEFAULT_DATE)
+        missing_key = ('other_dag', None, DEFAULT_DATE + timedelta(days=1))
+        self.addCleanup(ExternalTaskSensor._external_states.invalidate)
+
+        ExternalTaskSensor.prefetch([
+            {'external_dag_id': TEST_DAG_ID, 'external_task_id': TEST_TASK_ID,
+             'execution_date': [DEFAULT_DATE]},
+            {'external_dag_id': 'other_dag', 'external_task_id': None,
+             'execution_date': [DEFAULT_DATE, DEFAULT_DATE + timedelta(days=1)]},
+        ])
+
+        with mock.patch.object(ExternalTaskSensor, '_query_external_states') as mock_query:
+            states = ExternalTaskSensor.get_external_states([task_key, dag_key, missing_key])
+        mock_query.assert_not_called()
+        self.assertEqual({task_key: State.SUCCESS, dag_key: State.RUNNING}, states)
+
+        sensors = [
+            ExternalTaskSensor(task_id='wait_for_success', external_dag_id='other_dag',
+                               external_task_id=None, dag=self.dag),
+            ExternalTaskSensor(task_id='wait_for_running', external_dag_id='other_dag',
+                               external_task_id=None, allowed_states=[State.RUNNING],
+                               dag=self.dag),
+        ]
+        with mock.patch.object(ExternalTaskSensor, '_query_external_states') as mock_query:
+            self.assertEqual(
+                [False, True],
+                [sensor.poke({'execution_date': DEFAULT_DATE}) for sensor in sensors])
+        mock_query.assert_not_called()
+
 
 @pytest.fixture
 def dag_bag_ext():
@@ -27,6 +27,7 @@ from airflow.operators.http_operator import SimpleHttpOperator
 from airflow.sensors.http_sensor import HttpSensor
 from airflow.utils.timezone import datetime
 from tests.compat import mock
+from tests.test_utils.config import conf_vars
 
 DEFAULT_DATE = datetime(2015, 1, 1)
 DEFAULT_DATE_ISO = DEFAULT_DATE.isoformat()
@@ -141,6 +142,30 @@ class HttpSensorTests(unittest.TestCase):
             ]
             mock_errors.assert_has_calls(calls)
 
+    @conf_vars({
+        ('sensor_service', 'enabled'): 'True',
+        ('sensor_service', 'sensors_enabled'): 'HttpSensor',
+    })
+    def test_sensor_service_compatible_without_response_check(self):
+        task = HttpSensor(
+            dag=self.dag,
+            task_id='http_sensor_service',
+            endpoint='/status',
+            method='HEAD',
+            headers={'Accept': 'application/json'})
+        with_response_check = HttpSensor(
+            dag=self.dag,
+            task_id='http_sensor_service_response_check',
+            endpoint='/status',
+            response_check=lambda response: True)
+
+        self.assertTrue(task.is_sensor_service_compatible())
+        self.assertFalse(with_response_check.is_sensor_service_compatible())
+        poke_context = task.get_poke_context({})
+        rebuilt_task = HttpSensor(task_id='rebuilt', **poke_context)
+        self.assertEqual('HEAD', rebuilt_task.hook.method)
+        self.assertEqual(poke_context, rebuilt_task.get_poke_context({}))
+
 
 class FakeSession(object):
     def __init__(self):
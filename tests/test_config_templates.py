@@ -42,6 +42,7 @@ DEFAULT_AIRFLOW_SECTIONS = [
     'celery_broker_transport_options',
     'dask',
     'scheduler',
+    'sensor_service',
     'ldap',
     'mesos',
     'kerberos',
@@ -18,7 +18,7 @@
 # under the License.
 from airflow.models import (
     Connection, DagModel, DagRun, DagTag, Pool, RenderedTaskInstanceFields, SlaMiss, TaskInstance, Variable,
-    errors,
+    XCom, errors,
 )
 from airflow.models.dagcode import DagCode
 from airflow.utils.db import add_default_pool_if_not_exists, create_default_connections, \
@@ -64,6 +64,11 @@ def clear_db_variables():
         session.query(Variable).delete()
 
 
+def clear_db_xcom():
+    with create_session() as session:
+        session.query(XCom).delete()
+
+
 def clear_db_dag_code():
     with create_session() as session:
         session.query(DagCode).delete()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+
+from mock import Mock
+
+from airflow.ti_deps.dep_context import DepContext
+from airflow.ti_deps.deps.dagrun_exists_dep import DagrunRunningDep
+from airflow.utils.state import State
+
+
+class DepContextTest(unittest.TestCase):
+
+    def test_memoize(self):
+        dep_context = DepContext()
+        func = Mock(return_value=None)
+
+        self.assertIsNone(dep_context.memoize('key', func))
+        self.assertIsNone(dep_context.memoize('key', func))
+        func.assert_called_once_with()
+
+    def test_dagrun_is_shared_by_task_instances_of_a_run(self):
+        dagrun = Mock(state=State.RUNNING)
+        tis = [Mock(dag_id='dag', task_id=task_id, execution_date='date',
+                    get_dagrun=Mock(return_value=dagrun))
+               for task_id in ('a', 'b')]
+        dep_context = DepContext()
+
+        for ti in tis:
+            self.assertTrue(DagrunRunningDep().is_met(ti=ti, dep_context=dep_context))
+
+        tis[0].get_dagrun.assert_called_once()
+        tis[1].get_dagrun.assert_not_called()
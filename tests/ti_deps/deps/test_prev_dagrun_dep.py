@@ -43,7 +43,7 @@ class PrevDagrunDepTest(unittest.TestCase):
         prev_ti = Mock(task=task, state=State.SUCCESS,
                        are_dependents_done=Mock(return_value=True),
                        execution_date=datetime(2016, 1, 2))
-        ti = Mock(task=task, previous_ti=prev_ti,
+        ti = Mock(task=task, previous_ti=prev_ti, get_dagrun=Mock(return_value=None),
                   execution_date=datetime(2016, 1, 3))
         dep_context = DepContext(ignore_depends_on_past=False)
 
@@ -60,7 +60,7 @@ class PrevDagrunDepTest(unittest.TestCase):
         prev_ti = Mock(task=task, state=State.SUCCESS,
                        are_dependents_done=Mock(return_value=True),
                        execution_date=datetime(2016, 1, 2))
-        ti = Mock(task=task, previous_ti=prev_ti,
+        ti = Mock(task=task, previous_ti=prev_ti, get_dagrun=Mock(return_value=None),
                   execution_date=datetime(2016, 1, 3))
         dep_context = DepContext(ignore_depends_on_past=True)
 
@@ -74,7 +74,7 @@ class PrevDagrunDepTest(unittest.TestCase):
                               start_date=datetime(2016, 1, 1),
                               wait_for_downstream=False)
         prev_ti = None
-        ti = Mock(task=task, previous_ti=prev_ti,
+        ti = Mock(task=task, previous_ti=prev_ti, get_dagrun=Mock(return_value=None),
                   execution_date=datetime(2016, 1, 1))
         dep_context = DepContext(ignore_depends_on_past=False)
 
@@ -89,7 +89,7 @@ class PrevDagrunDepTest(unittest.TestCase):
                               wait_for_downstream=False)
         prev_ti = Mock(state=State.NONE,
                        are_dependents_done=Mock(return_value=True))
-        ti = Mock(task=task, previous_ti=prev_ti,
+        ti = Mock(task=task, previous_ti=prev_ti, get_dagrun=Mock(return_value=None),
                   execution_date=datetime(2016, 1, 2))
         dep_context = DepContext(ignore_depends_on_past=False)
 
@@ -106,7 +106,7 @@ class PrevDagrunDepTest(unittest.TestCase):
                               wait_for_downstream=True)
         prev_ti = Mock(state=State.SUCCESS,
                        are_dependents_done=Mock(return_value=False))
-        ti = Mock(task=task, previous_ti=prev_ti,
+        ti = Mock(task=task, previous_ti=prev_ti, get_dagrun=Mock(return_value=None),
                   execution_date=datetime(2016, 1, 2))
         dep_context = DepContext(ignore_depends_on_past=False)
 
@@ -121,7 +121,7 @@ class PrevDagrunDepTest(unittest.TestCase):
                               wait_for_downstream=True)
         prev_ti = Mock(state=State.SUCCESS,
                        are_dependents_done=Mock(return_value=True))
-        ti = Mock(task=task, previous_ti=prev_ti,
+        ti = Mock(task=task, previous_ti=prev_ti, get_dagrun=Mock(return_value=None),
                   execution_date=datetime(2016, 1, 2))
         dep_context = DepContext(ignore_depends_on_past=False)
 
@@ -22,27 +22,26 @@ from datetime import timedelta
 from mock import Mock, patch
 
 from airflow.models import DAG, TaskInstance, TaskReschedule
+from airflow.operators.dummy_operator import DummyOperator
 from airflow.ti_deps.dep_context import DepContext
 from airflow.ti_deps.deps.ready_to_reschedule import ReadyToRescheduleDep
+from airflow.utils import timezone
+from airflow.utils.db import create_session
 from airflow.utils.state import State
 from airflow.utils.timezone import utcnow
+from tests.test_utils.db import clear_db_runs
+
+DEFAULT_DATE = timezone.datetime(2016, 1, 1)
 
 
 class NotInReschedulePeriodDepTest(unittest.TestCase):
 
     def _get_task_instance(self, state):
         dag = DAG('test_dag')
-        task = Mock(dag=dag)
+        task = Mock(dag=dag, dag_id='test_dag', task_id='test_task')
         ti = TaskInstance(task=task, state=state, execution_date=None)
         return ti
 
-    def _get_task_reschedule(self, reschedule_date):
-        task = Mock(dag_id='test_dag', task_id='test_task')
-        tr = TaskReschedule(task=task, execution_date=None, try_number=None,
-                            start_date=reschedule_date, end_date=reschedule_date,
-                            reschedule_date=reschedule_date)
-        return tr
-
     def test_should_pass_if_ignore_in_reschedule_period_is_set(self):
         ti = self._get_task_instance(State.UP_FOR_RESCHEDULE)
         dep_context = DepContext(ignore_in_reschedule_period=True)
@@ -52,43 +51,74 @@ class NotInReschedulePeriodDepTest(unittest.TestCase):
         ti = self._get_task_instance(State.UP_FOR_RETRY)
         self.assertTrue(ReadyToRescheduleDep().is_met(ti=ti))
 
-    @patch('airflow.models.taskreschedule.TaskReschedule.find_for_task_instance', return_value=[])
-    def test_should_pass_if_no_reschedule_record_exists(self, find_for_task_instance):
+    @patch('airflow.models.taskreschedule.TaskReschedule.find_latest_reschedule_dates',
+           return_value={})
+    def test_should_pass_if_no_reschedule_record_exists(self, find_latest_reschedule_dates):
         ti = self._get_task_instance(State.NONE)
         self.assertTrue(ReadyToRescheduleDep().is_met(ti=ti))
 
-    @patch('airflow.models.taskreschedule.TaskReschedule.find_for_task_instance')
-    def test_should_pass_after_reschedule_date_one(self, find_for_task_instance):
-        find_for_task_instance.return_value = [
-            self._get_task_reschedule(utcnow() - timedelta(minutes=1)),
-        ]
-        ti = self._get_task_instance(State.UP_FOR_RESCHEDULE)
-        self.assertTrue(ReadyToRescheduleDep().is_met(ti=ti))
-
-    @patch('airflow.models.taskreschedule.TaskReschedule.find_for_task_instance')
-    def test_should_pass_after_reschedule_date_multiple(self, find_for_task_instance):
-        find_for_task_instance.return_value = [
-            self._get_task_reschedule(utcnow() - timedelta(minutes=21)),
-            self._get_task_reschedule(utcnow() - timedelta(minutes=11)),
-            self._get_task_reschedule(utcnow() - timedelta(minutes=1)),
-        ]
+    @patch('airflow.models.taskreschedule.TaskReschedule.find_latest_reschedule_dates')
+    def test_should_pass_after_reschedule_date(self, find_latest_reschedule_dates):
         ti = self._get_task_instance(State.UP_FOR_RESCHEDULE)
+        find_latest_reschedule_dates.return_value = {
+            (ti.task_id, ti.try_number): utcnow() - timedelta(minutes=1),
+        }
         self.assertTrue(ReadyToRescheduleDep().is_met(ti=ti))
 
-    @patch('airflow.models.taskreschedule.TaskReschedule.find_for_task_instance')
-    def test_should_fail_before_reschedule_date_one(self, find_for_task_instance):
-        find_for_task_instance.return_value = [
-            self._get_task_reschedule(utcnow() + timedelta(minutes=1)),
-        ]
+    @patch('airflow.models.taskreschedule.TaskReschedule.find_latest_reschedule_dates')
+    def test_should_fail_before_reschedule_date(self, find_latest_reschedule_dates):
         ti = self._get_task_instance(State.UP_FOR_RESCHEDULE)
+        find_latest_reschedule_dates.return_value = {
+            (ti.task_id, ti.try_number): utcnow() + timedelta(minutes=1),
+        }
         self.assertFalse(ReadyToRescheduleDep().is_met(ti=ti))
 
-    @patch('airflow.models.taskreschedule.TaskReschedule.find_for_task_instance')
-    def test_should_fail_before_reschedule_date_multiple(self, find_for_task_instance):
-        find_for_task_instance.return_value = [
-            self._get_task_reschedule(utcnow() - timedelta(minutes=19)),
-            self._get_task_reschedule(utcnow() - timedelta(minutes=9)),
-            self._get_task_reschedule(utcnow() + timedelta(minutes=1)),
-        ]
+    @patch('airflow.models.taskreschedule.TaskReschedule.find_latest_reschedule_dates')
+    def test_should_pass_if_only_previous_try_was_rescheduled(self, find_latest_reschedule_dates):
         ti = self._get_task_instance(State.UP_FOR_RESCHEDULE)
-        self.assertFalse(ReadyToRescheduleDep().is_met(ti=ti))
+        find_latest_reschedule_dates.return_value = {
+            (ti.task_id, ti.try_number - 1): utcnow() + timedelta(minutes=1),
+        }
+        self.assertTrue(ReadyToRescheduleDep().is_met(ti=ti))
+
+    @patch('airflow.models.taskreschedule.TaskReschedule.find_latest_reschedule_dates',
+           return_value={})
+    def test_reschedule_dates_are_loaded_once_per_dag_run(self, find_latest_reschedule_dates):
+        dep_context = DepContext()
+        for _ in range(2):
+            ti = self._get_task_instance(State.UP_FOR_RESCHEDULE)
+            self.assertTrue(ReadyToRescheduleDep().is_met(ti=ti, dep_context=dep_context))
+        find_latest_reschedule_dates.assert_called_once()
+
+
+class FindLatestRescheduleDatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self._clear_db()
+
+    def tearDown(self):
+        self._clear_db()
+
+    @staticmethod
+    def _clear_db():
+        with create_session() as session:
+            session.query(TaskReschedule).delete()
+        clear_db_runs()
+
+    def test_latest_reschedule_of_each_try(self):
+        dag = DAG('test_find_latest_reschedule_dates', start_date=DEFAULT_DATE)
+        tasks = [DummyOperator(task_id=task_id, dag=dag) for task_id in ('a', 'b')]
+        dates = [DEFAULT_DATE + timedelta(minutes=i) for i in range(3)]
+        with create_session() as session:
+            for task in tasks:
+                session.merge(TaskInstance(task, DEFAULT_DATE))
+            session.flush()
+            for try_number, reschedule_date in [(1, dates[0]), (1, dates[2]), (2, dates[1])]:
+                session.add(TaskReschedule(tasks[0], DEFAULT_DATE, try_number, DEFAULT_DATE,
+                                           DEFAULT_DATE, reschedule_date))
+            session.add(TaskReschedule(tasks[1], DEFAULT_DATE, 1, DEFAULT_DATE,
+                                       DEFAULT_DATE, dates[0]))
+
+        self.assertEqual(
+            {('a', 1): dates[2], ('a', 2): dates[1], ('b', 1): dates[0]},
+            TaskReschedule.find_latest_reschedule_dates(dag.dag_id, DEFAULT_DATE))
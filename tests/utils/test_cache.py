@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+
+import mock
+
+from airflow.utils.cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_get_set(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIn('a', cache)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
+
+    @mock.patch('airflow.utils.cache.time')
+    def test_entries_expire(self, mock_time):
+        mock_time.time.return_value = 100
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set('a', 1)
+        mock_time.time.return_value = 110
+        self.assertEqual(cache.get('a'), 1)
+        mock_time.time.return_value = 111
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.get('a', 'default'), 'default')
+
+    @mock.patch('airflow.utils.cache.time')
+    def test_entries_without_ttl_never_expire(self, mock_time):
+        mock_time.time.return_value = 100
+        cache = TTLCache(maxsize=2, ttl=None)
+        cache.set('a', 1)
+        mock_time.time.return_value = 10 ** 9
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_zero_size_disables_cache(self):
+        cache = TTLCache(maxsize=0, ttl=60)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_invalidate(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.invalidate('a')
+        self.assertNotIn('a', cache)
+        self.assertIn('b', cache)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
@@ -19,6 +19,7 @@
 
 from datetime import (datetime, timedelta)
 import os
+import pickle
 import sys
 import tempfile
 import unittest
@@ -28,10 +29,12 @@ from mock import MagicMock, PropertyMock
 
 from airflow.configuration import conf, mkdir_p
 from airflow.jobs import DagFileProcessor, LocalTaskJob as LJ
-from airflow.models import DagBag, TaskInstance as TI
+from airflow.models import DAG, DagBag, DagModel, TaskInstance as TI
+from airflow.models.serialized_dag import SerializedDagModel
+from airflow.operators.dummy_operator import DummyOperator
 from airflow.utils import timezone
 from airflow.utils.dag_processing import (
-    DagFileProcessorAgent, DagFileProcessorManager, DagFileStat, SimpleTaskInstance
+    DagFileProcessorAgent, DagFileProcessorManager, DagFileStat, SimpleDag, SimpleTaskInstance
 )
 from airflow.utils.db import create_session
 from airflow.utils.file import correct_maybe_zipped, open_maybe_zipped
@@ -219,6 +222,97 @@ class TestDagFileProcessorManager(unittest.TestCase):
             session.query(TI).delete()
             session.query(LJ).delete()
 
+    def _create_zombie(self, session, task, job_id, job_state=State.SHUTDOWN,
+                       latest_heartbeat=None):
+        ti = TI(task, DEFAULT_DATE, State.RUNNING)
+        lj = LJ(ti)
+        lj.state = job_state
+        lj.id = job_id
+        if latest_heartbeat is not None:
+            lj.latest_heartbeat = latest_heartbeat
+        ti.job_id = lj.id
+        session.add(lj)
+        session.add(ti)
+        session.commit()
+        return ti
+
+    def test_find_zombies_only_looks_at_jobs_that_heartbeated_since_last_sweep(self):
+        manager = DagFileProcessorManager(
+            dag_directory='directory',
+            file_paths=['abc.txt'],
+            max_runs=1,
+            processor_factory=MagicMock().return_value,
+            processor_timeout=timedelta.max,
+            signal_conn=MagicMock(),
+            async_mode=True)
+
+        dag = DagBag(TEST_DAG_FOLDER).get_dag('example_branch_operator')
+        with create_session() as session:
+            session.query(LJ).delete()
+            manager._find_zombies()
+            self.assertEqual([], manager._zombies)
+
+            # Its job was stale before the last sweep, so it was looked at already
+            self._create_zombie(
+                session, dag.get_task('run_this_first'), job_id=1, job_state=State.RUNNING,
+                latest_heartbeat=manager._last_zombie_limit_dttm - timedelta(seconds=1))
+            ti = self._create_zombie(session, dag.get_task('branching'), job_id=2)
+
+            manager._last_zombie_query_time = timezone.utcnow() - timedelta(
+                seconds=manager._zombie_query_interval + 1)
+            with mock.patch('airflow.utils.dag_processing.Stats') as mock_stats:
+                manager._find_zombies()
+            self.assertEqual([ti.key], [zombie.key for zombie in manager._zombies])
+            mock_stats.timing.assert_called_once_with('zombies.detection_latency', mock.ANY)
+
+            session.query(TI).delete()
+            session.query(LJ).delete()
+
+    @mock.patch('airflow.utils.dag_processing.STORE_SERIALIZED_DAGS', True)
+    def test_find_zombies_kills_zombies_from_serialized_dags(self):
+        manager = DagFileProcessorManager(
+            dag_directory='directory',
+            file_paths=['abc.txt', 'def.txt'],
+            max_runs=1,
+            processor_factory=MagicMock().return_value,
+            processor_timeout=timedelta.max,
+            signal_conn=MagicMock(),
+            async_mode=True)
+
+        dag = DAG('test_serialized_zombies', start_date=DEFAULT_DATE)
+        dag.fileloc = dag.full_filepath = 'abc.txt'
+        without_callback = DummyOperator(task_id='without_callback', dag=dag)
+        with_callback = DummyOperator(task_id='with_callback', dag=dag,
+                                      on_failure_callback=lambda context: None)
+        with create_session() as session:
+            session.query(LJ).delete()
+            session.add(DagModel(dag_id=dag.dag_id, fileloc=dag.fileloc))
+            session.commit()
+            SerializedDagModel.write_dag(dag, session=session)
+            killed_ti = self._create_zombie(session, without_callback, job_id=1)
+            left_ti = self._create_zombie(session, with_callback, job_id=2)
+
+            manager._find_zombies()
+
+            killed_ti.refresh_from_db(session=session)
+            self.assertEqual(State.FAILED, killed_ti.state)
+            self.assertEqual([left_ti.key], [zombie.key for zombie in manager._zombies])
+            self.assertEqual([left_ti.key],
+                             [zombie.key for zombie in manager._get_zombies_for_file('abc.txt')])
+            self.assertEqual([], manager._get_zombies_for_file('def.txt'))
+
+            # The zombie is forgotten once the processor of its file handled it
+            left_ti.set_state(State.FAILED, session=session)
+            manager._last_zombie_query_time = None
+            manager._find_zombies()
+            self.assertEqual([], manager._zombies)
+
+            session.query(TI).delete()
+            session.query(LJ).delete()
+            session.query(SerializedDagModel).filter(
+                SerializedDagModel.dag_id == dag.dag_id).delete()
+            session.query(DagModel).filter(DagModel.dag_id == dag.dag_id).delete()
+
     def test_zombies_are_correctly_passed_to_dag_file_processor(self):
         """
         Check that the same set of zombies are passed to the dag
@@ -450,6 +544,32 @@ class TestDagFileProcessorAgent(unittest.TestCase):
         self.assertTrue(os.path.isfile(log_file_loc))
 
 
+class TestSimpleObjects(unittest.TestCase):
+    def setUp(self):
+        self.dag = DagBag(TEST_DAG_FOLDER).get_dag('example_branch_operator')
+
+    def test_simple_dag_pickle(self):
+        simple_dag = SimpleDag(self.dag, pickle_id=1)
+        self.assertFalse(hasattr(simple_dag, '__dict__'))
+
+        restored = pickle.loads(pickle.dumps(simple_dag, 0))
+        self.assertEqual(simple_dag.dag_id, restored.dag_id)
+        self.assertEqual(simple_dag.task_ids, restored.task_ids)
+        self.assertEqual(simple_dag.pickle_id, restored.pickle_id)
+        self.assertEqual(simple_dag.task_special_args, restored.task_special_args)
+
+    def test_simple_task_instance_pickle(self):
+        ti = TI(self.dag.get_task('run_this_first'), DEFAULT_DATE, State.RUNNING)
+        simple_ti = SimpleTaskInstance(ti)
+        self.assertFalse(hasattr(simple_ti, '__dict__'))
+        self.assertEqual(ti.key, simple_ti.key)
+
+        restored = pickle.loads(pickle.dumps(simple_ti, 0))
+        self.assertEqual(simple_ti.key, restored.key)
+        self.assertEqual(simple_ti.state, restored.state)
+        self.assertEqual(simple_ti.queue, restored.queue)
+
+
 class TestCorrectMaybeZipped(unittest.TestCase):
     @mock.patch("zipfile.is_zipfile")
     def test_correct_maybe_zipped_normal_file(self, mocked_is_zipfile):
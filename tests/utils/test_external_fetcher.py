@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import threading
+import unittest
+
+import requests_mock
+
+from airflow.exceptions import ExternalFetchException
+from airflow.utils.external_fetcher import ExternalFetcher
+
+
+class TestExternalFetcher(unittest.TestCase):
+
+    def test_call_returns_result(self):
+        fetcher = ExternalFetcher(deadline=5)
+        self.assertEqual(fetcher.call('host', lambda a, b=0: a + b, 1, b=2), 3)
+
+    def test_call_reraises_exception(self):
+        def fail():
+            raise ValueError('failed')
+
+        fetcher = ExternalFetcher(deadline=5)
+        with self.assertRaisesRegexp(ValueError, 'failed'):
+            fetcher.call('host', fail)
+
+    def test_call_deadline_and_host_limit(self):
+        release = threading.Event()
+        fetcher = ExternalFetcher(deadline=0.1, concurrency_per_host=1)
+
+        with self.assertRaisesRegexp(ExternalFetchException, 'did not complete'):
+            fetcher.call('stuck-host', release.wait)
+        # The stuck fetch still holds the only slot of the host
+        with self.assertRaisesRegexp(ExternalFetchException, 'Too many pending fetches'):
+            fetcher.call('stuck-host', lambda: 'ok')
+        # Other hosts are not affected
+        self.assertEqual(fetcher.call('other-host', lambda: 'ok'), 'ok')
+
+        release.set()
+        for thread in threading.enumerate():
+            if thread.name == 'external-fetch-stuck-host':
+                thread.join()
+        self.assertEqual(fetcher.call('stuck-host', lambda: 'ok'), 'ok')
+
+    @requests_mock.mock()
+    def test_get_text(self, mock_requests):
+        url = 'http://worker:8793/log/dag/task/1.log'
+        mock_requests.get(url, text='log line')
+        fetcher = ExternalFetcher(timeout=5)
+
+        self.assertEqual(fetcher.get_text(url), 'log line')
+        self.assertEqual(fetcher.get_text(url), 'log line')
+        self.assertEqual(mock_requests.call_count, 2)
+
+    @requests_mock.mock()
+    def test_get_text_cached(self, mock_requests):
+        url = 'http://worker:8793/log/dag/task/1.log'
+        mock_requests.get(url, text='log line')
+        fetcher = ExternalFetcher(timeout=5)
+
+        self.assertEqual(fetcher.get_text(url, cache=True), 'log line')
+        self.assertEqual(fetcher.get_text(url, cache=True), 'log line')
+        self.assertEqual(mock_requests.call_count, 1)
+
+    @requests_mock.mock()
+    def test_get_text_error_not_cached(self, mock_requests):
+        url = 'http://worker:8793/log/dag/task/1.log'
+        mock_requests.get(url, status_code=404)
+        fetcher = ExternalFetcher(timeout=5)
+
+        with self.assertRaises(Exception):
+            fetcher.get_text(url, cache=True)
+        self.assertNotIn(url, fetcher.cache)
@@ -25,6 +25,8 @@ import time
 import unittest
 from datetime import datetime
 
+import jinja2
+import mock
 import psutil
 import six
 
@@ -33,6 +35,7 @@ from airflow.utils import helpers
 from airflow.models import TaskInstance
 from airflow.operators.dummy_operator import DummyOperator
 from airflow.exceptions import AirflowException
+from tests.test_utils.config import conf_vars
 
 
 class TestHelpers(unittest.TestCase):
@@ -127,6 +130,16 @@ class TestHelpers(unittest.TestCase):
         self.assertEqual([i for i in helpers.chunks([1, 2, 3], 2)],
                          [[1, 2], [3]])
 
+    def test_query_chunks(self):
+        self.assertEqual([[1, 2], [3]], list(helpers.query_chunks([1, 2, 3], 2)))
+        self.assertEqual([[1, 2, 3]], list(helpers.query_chunks([1, 2, 3], 0)))
+        self.assertEqual([[1, 2, 3]], list(helpers.query_chunks([1, 2, 3], -1)))
+        self.assertEqual([], list(helpers.query_chunks([], 0)))
+        with conf_vars({('scheduler', 'max_tis_per_query'): '0'}):
+            self.assertEqual([[1, 2, 3]], list(helpers.query_chunks([1, 2, 3])))
+        with conf_vars({('scheduler', 'max_tis_per_query'): '1'}):
+            self.assertEqual([[1], [2], [3]], list(helpers.query_chunks([1, 2, 3])))
+
     def test_reduce_in_chunks(self):
         self.assertEqual(helpers.reduce_in_chunks(lambda x, y: x + [y],
                                                   [1, 2, 3, 4, 5],
@@ -160,6 +173,27 @@ class TestHelpers(unittest.TestCase):
             ("a", "list", "is", "a", "container")
         )
 
+    def test_get_template_from_string(self):
+        helpers._compiled_templates.invalidate()
+        env = jinja2.Environment()
+        env.globals['greeting'] = 'hello'
+        other_env = jinja2.Environment()
+        other_env.globals['greeting'] = 'bye'
+
+        with mock.patch.object(jinja2.Environment, 'compile', autospec=True,
+                               side_effect=jinja2.Environment.compile) as mock_compile:
+            self.assertEqual('hello world', helpers.get_template_from_string(
+                env, '{{ greeting }} {{ name }}').render(name='world'))
+            self.assertEqual('bye world', helpers.get_template_from_string(
+                other_env, '{{ greeting }} {{ name }}').render(name='world'))
+            self.assertEqual(1, mock_compile.call_count)
+
+            # Environments with different syntax do not share compiled templates
+            custom_env = jinja2.Environment(variable_start_string='[[', variable_end_string=']]')
+            self.assertEqual('{{ name }} world', helpers.get_template_from_string(
+                custom_env, '{{ name }} [[ name ]]').render(name='world'))
+            self.assertEqual(2, mock_compile.call_count)
+
 
 class HelpersTest(unittest.TestCase):
     def test_as_tuple_iter(self):
@@ -27,4 +27,5 @@ class TestWeightRule(unittest.TestCase):
         self.assertTrue(WeightRule.is_valid(WeightRule.DOWNSTREAM))
         self.assertTrue(WeightRule.is_valid(WeightRule.UPSTREAM))
         self.assertTrue(WeightRule.is_valid(WeightRule.ABSOLUTE))
-        self.assertEqual(len(WeightRule.all_weight_rules()), 3)
+        self.assertTrue(WeightRule.is_valid(WeightRule.CRITICAL_PATH))
+        self.assertEqual(len(WeightRule.all_weight_rules()), 4)
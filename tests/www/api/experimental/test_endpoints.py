@@ -23,8 +23,9 @@ import unittest
 from six.moves.urllib.parse import quote_plus
 
 from airflow.api.common.experimental.trigger_dag import trigger_dag
-from airflow.models import DagBag, DagModel, DagRun, Pool, TaskInstance
+from airflow.models import DagBag, DagModel, DagRun, Pool, TaskDuration, TaskInstance
 from airflow.settings import Session
+from airflow.utils.state import State
 from airflow.utils.timezone import datetime, utcnow, parse as parse_datetime
 from airflow.www import app as application
 from tests.test_utils.db import clear_db_pools
@@ -276,6 +277,56 @@ class TestApiExperimental(unittest.TestCase):
         self.assertEqual(400, response.status_code)
         self.assertIn('error', response.data.decode('utf-8'))
 
+    def test_task_instance_predicted_end_date(self):
+        url_template = '/api/experimental/dags/{}/dag_runs/{}/tasks/{}/predicted_end_date'
+        dag_id = 'example_bash_operator'
+        task_id = 'also_run_this'
+        execution_date = utcnow().replace(microsecond=0)
+        datetime_string = quote_plus(execution_date.isoformat())
+
+        trigger_dag(dag_id=dag_id,
+                    run_id='test_task_instance_predicted_end_date_run',
+                    execution_date=execution_date)
+
+        # Not running yet
+        response = self.app.get(
+            url_template.format(dag_id, datetime_string, task_id)
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertIsNone(json.loads(response.data.decode('utf-8'))['expected_end_date'])
+
+        session = Session()
+        ti = session.query(TaskInstance).filter(
+            TaskInstance.dag_id == dag_id,
+            TaskInstance.task_id == task_id,
+            TaskInstance.execution_date == execution_date).one()
+        ti.state = State.RUNNING
+        ti.start_date = utcnow() + timedelta(hours=1)
+        ti.duration = 3600
+        TaskDuration.record(ti, session=session)
+        session.commit()
+
+        response = self.app.get(
+            url_template.format(dag_id, datetime_string, task_id)
+        )
+        self.assertEqual(200, response.status_code)
+        data = json.loads(response.data.decode('utf-8'))
+        expected_end_date = (ti.start_date + timedelta(hours=1)).isoformat()
+        self.assertEqual(State.RUNNING, data['state'])
+        self.assertEqual(expected_end_date, data['expected_end_date'])
+        self.assertEqual(expected_end_date, data['worst_case_end_date'])
+
+        session.query(TaskDuration).delete()
+        session.commit()
+        session.close()
+
+        # Test error for bad datetime format
+        response = self.app.get(
+            url_template.format(dag_id, 'not_a_datetime', task_id)
+        )
+        self.assertEqual(400, response.status_code)
+        self.assertIn('error', response.data.decode('utf-8'))
+
     def test_dagrun_status(self):
         url_template = '/api/experimental/dags/{}/dag_runs/{}'
         dag_id = 'example_bash_operator'
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+
+import mock
+
+from airflow.www import gunicorn_config
+from tests.test_utils.config import conf_vars
+
+
+class TestGunicornConfig(unittest.TestCase):
+
+    def setUp(self):
+        gunicorn_config._dagbag_loaded_at = None
+
+    @conf_vars({('webserver', 'preload_dagbag'): 'False'})
+    @mock.patch('airflow.www.gunicorn_config.gc')
+    @mock.patch('airflow.www.gunicorn_config._reload_dagbag')
+    def test_pre_fork_without_preload(self, mock_reload, mock_gc):
+        gunicorn_config.pre_fork(mock.MagicMock(), mock.MagicMock())
+        mock_reload.assert_not_called()
+        mock_gc.freeze.assert_not_called()
+
+    @conf_vars({('webserver', 'preload_dagbag'): 'True',
+                ('webserver', 'worker_refresh_interval'): '30'})
+    @mock.patch('airflow.www.gunicorn_config.settings')
+    @mock.patch('airflow.www.gunicorn_config.time')
+    @mock.patch('airflow.www.gunicorn_config.gc')
+    @mock.patch('airflow.www.gunicorn_config._reload_dagbag')
+    def test_pre_fork_reloads_dagbag_on_refresh(self, mock_reload, mock_gc, mock_time,
+                                                mock_settings):
+        # The first workers use the DagBag loaded with the app
+        mock_time.time.return_value = 100
+        gunicorn_config.pre_fork(mock.MagicMock(), mock.MagicMock())
+        mock_time.time.return_value = 101
+        gunicorn_config.pre_fork(mock.MagicMock(), mock.MagicMock())
+        mock_reload.assert_not_called()
+        self.assertEqual(mock_gc.freeze.call_count, 2)
+        self.assertEqual(mock_settings.engine.dispose.call_count, 2)
+
+        # A refresh of the workers forks them from a freshly loaded DagBag
+        mock_time.time.return_value = 131
+        gunicorn_config.pre_fork(mock.MagicMock(), mock.MagicMock())
+        mock_gc.unfreeze.assert_called_once_with()
+        mock_reload.assert_called_once_with()
+        self.assertEqual(mock_gc.freeze.call_count, 3)
+
+        # Other workers of the same refresh share it
+        mock_time.time.return_value = 132
+        gunicorn_config.pre_fork(mock.MagicMock(), mock.MagicMock())
+        mock_reload.assert_called_once_with()
+
+    @conf_vars({('webserver', 'preload_dagbag'): 'True',
+                ('webserver', 'worker_refresh_interval'): '0'})
+    @mock.patch('airflow.www.gunicorn_config.settings')
+    @mock.patch('airflow.www.gunicorn_config.time')
+    @mock.patch('airflow.www.gunicorn_config.gc')
+    @mock.patch('airflow.www.gunicorn_config._reload_dagbag')
+    def test_pre_fork_does_not_reload_dagbag_without_refresh(self, mock_reload, mock_gc,
+                                                             mock_time, mock_settings):
+        # Workers forked later, e.g. to replace a crashed one, share the same DagBag
+        for now in (100, 101, 1000):
+            mock_time.time.return_value = now
+            gunicorn_config.pre_fork(mock.MagicMock(), mock.MagicMock())
+        mock_reload.assert_not_called()
+        mock_gc.unfreeze.assert_not_called()
+        self.assertEqual(mock_gc.freeze.call_count, 3)
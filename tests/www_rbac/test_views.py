@@ -630,6 +630,30 @@ class TestAirflowBaseViews(TestBase):
         resp = self.client.get(url, follow_redirects=True)
         self.check_content_in_response('example_bash_operator', resp)
 
+    def test_duration_includes_failed_tries(self):
+        ti = self.bash_dagrun.get_task_instance('runme_0', session=self.session)
+        ti.start_date = self.EXAMPLE_DAG_DEFAULT_DATE
+        ti.end_date = self.EXAMPLE_DAG_DEFAULT_DATE + timedelta(seconds=20)
+        ti.duration = 20
+        self.session.merge(ti)
+        for _ in range(2):
+            self.session.add(models.TaskFail(
+                self.bash_dag.get_task('runme_0'), ti.execution_date,
+                start_date=self.EXAMPLE_DAG_DEFAULT_DATE,
+                end_date=self.EXAMPLE_DAG_DEFAULT_DATE + timedelta(seconds=5)))
+        self.session.commit()
+
+        try:
+            url = 'duration?days=30&dag_id=example_bash_operator&base_date={}'.format(
+                self.percent_encode(self.EXAMPLE_DAG_DEFAULT_DATE.isoformat()))
+            resp = self.client.get(url, follow_redirects=True)
+            # 20 seconds for the last try, 30 seconds with the failed tries
+            self.check_content_in_response(
+                ['"runme_0"', '"y": 20.0', '"y": 30.0'], resp)
+        finally:
+            self.session.query(models.TaskFail).delete()
+            self.session.commit()
+
     def test_duration_missing(self):
         url = 'duration?days=30&dag_id=missing_dag'
         resp = self.client.get(url, follow_redirects=True)
@@ -1990,6 +2014,33 @@ class TestTaskInstanceView(TestBase):
         self.check_content_in_response('List Task Instance', resp)
         pass
 
+    @conf_vars({('scheduler', 'max_tis_per_query'): '2'})
+    def test_action_set_success(self):
+        dag = models.DagBag().get_dag('example_bash_operator')
+        execution_date = timezone.datetime(2018, 7, 1)
+        task_ids = ['runme_0', 'runme_1', 'runme_2']
+        for task_id in task_ids:
+            self.session.add(TaskInstance(dag.get_task(task_id), execution_date))
+        self.session.commit()
+        try:
+            rowids = [json.dumps([task_id, dag.dag_id,
+                                  {'_type': 'datetime', 'value': execution_date.isoformat()}])
+                      for task_id in task_ids]
+            resp = self.client.post('/taskinstance/action_post',
+                                    data={'action': 'set_success', 'rowid': rowids},
+                                    follow_redirects=True)
+            self.assertEqual(resp.status_code, 200)
+
+            tis = self.session.query(TaskInstance).filter(
+                TaskInstance.dag_id == dag.dag_id,
+                TaskInstance.execution_date == execution_date).all()
+            self.assertEqual(
+                {ti.task_id for ti in tis if ti.state == State.SUCCESS}, set(task_ids))
+            self.assertTrue(all(ti.end_date for ti in tis if ti.task_id in task_ids))
+        finally:
+            self.clear_table(TaskInstance)
+            self.clear_table(DagRun)
+
 
 class TestRenderedView(TestBase):
 
@@ -2273,6 +2324,24 @@ class TestExtraLinks(TestBase):
             'error': None
         })
 
+    @mock.patch('airflow.www_rbac.views.get_fetcher')
+    @mock.patch('airflow.www_rbac.views.dagbag.get_dag')
+    def test_extra_links_pending_calls_are_limited_per_operator(self, get_dag_function,
+                                                                get_fetcher):
+        get_dag_function.return_value = self.dag
+        get_fetcher.return_value.call.return_value = 'https://airflow.apache.org'
+
+        for link_name in ('foo-bar', 'airflow'):
+            self.client.get(
+                "{0}?dag_id={1}&task_id={2}&execution_date={3}&link_name={4}"
+                .format(self.ENDPOINT, self.dag.dag_id, self.task.task_id,
+                        self.DEFAULT_DATE, link_name),
+                follow_redirects=True)
+
+        self.assertEqual(
+            ['extra_links.DummyTestOperator'] * 2,
+            [call[0][0] for call in get_fetcher.return_value.call.call_args_list])
+
     @mock.patch('airflow.www_rbac.views.dagbag.get_dag')
     def test_global_extra_links_works(self, get_dag_function):
         get_dag_function.return_value = self.dag
@@ -2506,6 +2575,69 @@ class TestDagRunModelView(TestBase):
         dr = self.session.query(models.DagRun).all()
         self.assertFalse(dr)
 
+    def test_list_dagruns_keyset_pagination(self):
+        dag = models.DagBag().get_dag("example_bash_operator")
+        for day in range(1, 6):
+            dag.create_dagrun(
+                run_id='test_list_dagruns_{}'.format(day),
+                execution_date=timezone.datetime(2018, 7, day),
+                state=State.SUCCESS)
+
+        resp = self.client.get(
+            '/dagrun/list/?page_DagRunModelView=1&psize_DagRunModelView=2')
+        self.check_content_in_response(
+            ['test_list_dagruns_3', 'test_list_dagruns_2'], resp)
+        self.check_content_not_in_response(
+            ['test_list_dagruns_5', 'test_list_dagruns_4', 'test_list_dagruns_1'], resp)
+
+        resp = self.client.get(
+            '/dagrun/list/?page_DagRunModelView=2&psize_DagRunModelView=2')
+        self.check_content_in_response('test_list_dagruns_1', resp)
+        self.check_content_not_in_response('test_list_dagruns_2', resp)
+
+    def test_list_dagruns_next_page_seeks_after_last_key(self):
+        dag = models.DagBag().get_dag("example_bash_operator")
+        for day in range(1, 6):
+            dag.create_dagrun(
+                run_id='test_list_dagruns_{}'.format(day),
+                execution_date=timezone.datetime(2018, 7, day),
+                state=State.SUCCESS)
+
+        resp = self.client.get('/dagrun/list/?psize_DagRunModelView=2')
+        self.check_content_in_response(
+            ['test_list_dagruns_5', 'test_list_dagruns_4'], resp)
+        next_page_links = re.findall(
+            r'href="([^"]*page_DagRunModelView=1[^"]*)"', resp.data.decode('utf-8'))
+        self.assertTrue(next_page_links)
+        self.assertTrue(all('seek_dag_run' in link for link in next_page_links))
+
+        # The next page starts after the last row shown, not at an offset
+        dag.create_dagrun(
+            run_id='test_list_dagruns_6',
+            execution_date=timezone.datetime(2018, 7, 6),
+            state=State.SUCCESS)
+        resp = self.client.get(next_page_links[0].replace('&amp;', '&'))
+        self.check_content_in_response(
+            ['test_list_dagruns_3', 'test_list_dagruns_2'], resp)
+        self.check_content_not_in_response('test_list_dagruns_4', resp)
+
+    def test_list_dagruns_count_limit(self):
+        dag = models.DagBag().get_dag("example_bash_operator")
+        for day in range(1, 6):
+            dag.create_dagrun(
+                run_id='test_list_dagruns_{}'.format(day),
+                execution_date=timezone.datetime(2018, 7, day),
+                state=State.SUCCESS)
+
+        from airflow.www_rbac.views import DagRunModelView
+        datamodel = DagRunModelView.datamodel
+        with mock.patch.object(datamodel, 'count_limit', 3):
+            count, items = datamodel.query(
+                order_column='execution_date', order_direction='desc',
+                page=0, page_size=1)
+        self.assertEqual(count, 3)
+        self.assertEqual([dr.run_id for dr in items], ['test_list_dagruns_5'])
+
 
 class TestDecorators(TestBase):
     EXAMPLE_DAG_DEFAULT_DATE = dates.days_ago(2)